@@ -0,0 +1,215 @@
+# app/admission.py
+
+import asyncio
+import json
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, FrozenSet, List, Optional, Tuple
+from starlette.types import ASGIApp, Receive, Scope, Send
+from .metrics import metrics
+
+ADMISSION_REJECTIONS = metrics.counter(
+    "admission_rejections_total",
+    "Requests turned away before reaching the app, by reason "
+    "(rate_limited or overloaded) and priority (high or low).",
+    ("reason", "priority"),
+)
+
+# Paths never limited, so that the service stays observable under overload
+EXEMPT_PATHS = frozenset({"/metrics"})
+
+HIGH, LOW = 0, 1
+PRIORITY_NAMES = ("high", "low")
+
+API_KEY_HEADER = b"x-api-key"
+
+# Catalog reads: the survey list, a survey's details and its questions.
+# Aggregates under /v1/surveys, such as stats and trends, are not among them
+CATALOG_PATH = re.compile(r"/v1/surveys/?(?:\d+(?:/questions)?/?)?")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request may not be admitted now."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    Token bucket per client: each client may make burst requests at once and
+    rate requests per second on average. Buckets of the least recently seen
+    clients are dropped beyond max_clients, which only ever forgives them.
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 100_000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        # Client key -> [tokens, time of last refill]
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def acquire(self, client: str, now: Optional[float] = None) -> None:
+        """Take a token for the client or raise AdmissionRejected (429)."""
+        now = time.monotonic() if now is None else now
+        buckets = self._buckets
+        bucket = buckets.get(client)
+        if bucket is None:
+            bucket = buckets[client] = [float(self.burst), now]
+            if len(buckets) > self.max_clients:
+                buckets.popitem(last=False)
+        else:
+            buckets.move_to_end(client)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] < 1:
+            raise AdmissionRejected(429, "rate_limited", (1 - bucket[0]) / self.rate)
+        bucket[0] -= 1
+
+
+class ConcurrencyLimiter:
+    """
+    Cap on the requests in progress at once, with a bounded wait queue per
+    priority. A freed slot goes to the oldest high-priority waiter first.
+    Requests finding their priority's queue full, or still waiting after
+    queue_timeout seconds, are rejected (503).
+    """
+
+    def __init__(
+        self, max_concurrent: int, queue_size: int = 100, queue_timeout: float = 1.0
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Tuple[Deque["asyncio.Future[None]"], ...] = (deque(), deque())
+        # Waiters given up on stay queued until reached; counted out here
+        self._abandoned = [0, 0]
+
+    def waiting(self, priority: int) -> int:
+        return len(self._waiters[priority]) - self._abandoned[priority]
+
+    async def acquire(self, priority: int) -> None:
+        if self.active < self.max_concurrent and not any(
+            self.waiting(p) for p in (HIGH, LOW)
+        ):
+            self.active += 1
+            return
+        if self.waiting(priority) >= self.queue_size:
+            raise AdmissionRejected(503, "overloaded", self.queue_timeout)
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except BaseException as exc:
+            if waiter.done():
+                # The slot was handed over just as the wait ended
+                if isinstance(exc, asyncio.TimeoutError):
+                    return
+                self.release()
+            else:
+                waiter.cancel()
+                self._abandoned[priority] += 1
+            if isinstance(exc, asyncio.TimeoutError):
+                raise AdmissionRejected(503, "overloaded", self.queue_timeout)
+            raise
+
+    def release(self) -> None:
+        for priority in (HIGH, LOW):
+            waiters = self._waiters[priority]
+            while waiters:
+                waiter = waiters.popleft()
+                if waiter.cancelled():
+                    self._abandoned[priority] -= 1
+                    continue
+                # Hand the slot straight over, keeping active unchanged
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware shedding load before it reaches the app: a token bucket
+    rate limit per client (429), and a global cap on concurrent requests with
+    a bounded wait queue (503). Both answer at once with a Retry-After
+    header. Clients are keyed on their X-API-Key header when it is one of
+    api_keys, and on their host otherwise, so that made-up keys cannot buy
+    fresh buckets. Catalog reads (the survey list, details and questions)
+    are high priority and get freed slots before everything else, such as
+    response submissions and aggregates. Paths in EXEMPT_PATHS are never
+    limited. All state is in-process and updated in O(1).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+        api_keys: FrozenSet[str] = frozenset(),
+    ) -> None:
+        self.app = app
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.api_keys = api_keys
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        priority = _priority(scope)
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(_client_key(scope, self.api_keys))
+            if self.concurrency_limiter is not None:
+                await self.concurrency_limiter.acquire(priority)
+        except AdmissionRejected as exc:
+            ADMISSION_REJECTIONS.inc(exc.reason, PRIORITY_NAMES[priority])
+            await _reject(exc, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if self.concurrency_limiter is not None:
+                self.concurrency_limiter.release()
+
+
+def _priority(scope: Scope) -> int:
+    if scope["method"] in ("GET", "HEAD") and CATALOG_PATH.fullmatch(scope["path"]):
+        return HIGH
+    return LOW
+
+
+def _client_key(scope: Scope, api_keys: FrozenSet[str]) -> str:
+    headers: Dict[bytes, bytes] = dict(scope["headers"])
+    api_key = headers.get(API_KEY_HEADER)
+    if api_key:
+        key = api_key.decode("latin-1")
+        if key in api_keys:
+            return "key:" + key
+    client = scope.get("client")
+    return "host:" + (client[0] if client else "unknown")
+
+
+async def _reject(exc: AdmissionRejected, send: Send) -> None:
+    if exc.status_code == 429:
+        detail = "Too many requests."
+    else:
+        detail = "Server is overloaded."
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": exc.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(exc.retry_after))).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
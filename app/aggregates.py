@@ -0,0 +1,127 @@
+# app/aggregates.py
+
+import math
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from .models import AssessmentResultBase
+from .quantiles import KLLSketch
+
+if TYPE_CHECKING:
+    from .rollups import RollupBucket
+
+# count, mean, sum of squared deviations, minimum, maximum
+StatsState = Tuple[int, float, float, float, float]
+
+
+class RunningStats:
+    """
+    Running count, mean, variance, min and max of a stream of values,
+    maintained with Welford's online algorithm.
+
+    Attributes:
+        count (int): Number of values seen.
+        mean (float): Mean of the values seen.
+        minimum (float): Smallest value seen.
+        maximum (float): Largest value seen.
+    """
+
+    __slots__ = ("count", "mean", "_m2", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: "RunningStats") -> None:
+        """Fold another accumulator into this one (Chan et al. parallel update)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def state(self) -> StatsState:
+        """The accumulator's state, e.g. to store it."""
+        return (self.count, self.mean, self._m2, self.minimum, self.maximum)
+
+    @classmethod
+    def from_state(cls, state: StatsState) -> "RunningStats":
+        stats = cls()
+        stats.count, stats.mean, stats._m2, stats.minimum, stats.maximum = state
+        return stats
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1 denominator); 0.0 for fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class SurveyStatistics:
+    """
+    Running statistics and quantile sketches per survey and per score key,
+    updated as assessments are saved so that reads never touch stored
+    assessments.
+    """
+
+    def __init__(self) -> None:
+        self._counts: Dict[int, int] = {}
+        self._scores: Dict[int, Dict[str, RunningStats]] = {}
+        self._sketches: Dict[int, Dict[str, KLLSketch]] = {}
+
+    def add(self, assessment: AssessmentResultBase) -> None:
+        survey_id = assessment.survey_id
+        self._counts[survey_id] = self._counts.get(survey_id, 0) + 1
+        survey_scores = self._scores.setdefault(survey_id, {})
+        survey_sketches = self._sketches.setdefault(survey_id, {})
+        for key, value in assessment.scores.items():
+            stats = survey_scores.get(key)
+            if stats is None:
+                stats = survey_scores[key] = RunningStats()
+                survey_sketches[key] = KLLSketch()
+            stats.add(value)
+            survey_sketches[key].add(value)
+
+    def add_period(self, survey_id: int, bucket: "RollupBucket") -> None:
+        """Fold in the aggregates of one period, rather than each assessment."""
+        self._counts[survey_id] = self._counts.get(survey_id, 0) + bucket.count
+        survey_scores = self._scores.setdefault(survey_id, {})
+        survey_sketches = self._sketches.setdefault(survey_id, {})
+        for key, stats in bucket.stats.items():
+            survey_scores.setdefault(key, RunningStats()).merge(stats)
+            survey_sketches.setdefault(key, KLLSketch()).merge(bucket.sketches[key])
+
+    def count(self, survey_id: int) -> int:
+        return self._counts.get(survey_id, 0)
+
+    def scores(self, survey_id: int) -> Dict[str, RunningStats]:
+        return dict(self._scores.get(survey_id, {}))
+
+    def get(self, survey_id: int, key: str) -> Optional[RunningStats]:
+        return self._scores.get(survey_id, {}).get(key)
+
+    def sketches(self, survey_id: int) -> Dict[str, KLLSketch]:
+        """Quantile sketches of every score key of a survey."""
+        return dict(self._sketches.get(survey_id, {}))
@@ -0,0 +1,112 @@
+# app/assessment_cache.py
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+from .metrics import metrics
+from .models import AssessmentResultBase
+
+ASSESSMENT_CACHE_LOOKUPS = metrics.counter(
+    "assessment_cache_lookups_total",
+    "Assessment read cache lookups, by result: hit or miss.",
+    ("result",),
+)
+
+
+def serialize_assessment(assessment: AssessmentResultBase) -> bytes:
+    """The JSON body served for an assessment."""
+    return AssessmentResultBase.__pydantic_serializer__.to_json(assessment)
+
+
+class AssessmentCache:
+    """
+    LRU cache of serialized assessments, bounded by the total size of the
+    cached bodies, so reads of a recent assessment skip both the repository
+    and serialization.
+
+    Assessments are put in the cache as they are saved, because results are
+    usually polled right after they are submitted. Saving an assessment again
+    replaces its cached body. Safe to use from several threads.
+
+    Attributes:
+        max_bytes (int): Most bytes of bodies held; 0 disables the cache.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache so far."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, assessment_id: int) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(assessment_id)
+            if body is not None:
+                self._entries.move_to_end(assessment_id)
+                self.hits += 1
+            else:
+                self.misses += 1
+        ASSESSMENT_CACHE_LOOKUPS.inc("hit" if body is not None else "miss")
+        return body
+
+    def get_many(self, assessment_ids: Iterable[int]) -> Dict[int, bytes]:
+        """Return the cached bodies among the given IDs, by ID."""
+        found: Dict[int, bytes] = {}
+        missed = 0
+        with self._lock:
+            entries = self._entries
+            for assessment_id in assessment_ids:
+                body = entries.get(assessment_id)
+                if body is None:
+                    missed += 1
+                    continue
+                entries.move_to_end(assessment_id)
+                found[assessment_id] = body
+            self.hits += len(found)
+            self.misses += missed
+        if found:
+            ASSESSMENT_CACHE_LOOKUPS.inc("hit", amount=len(found))
+        if missed:
+            ASSESSMENT_CACHE_LOOKUPS.inc("miss", amount=missed)
+        return found
+
+    def put(self, assessment_id: int, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            entries = self._entries
+            previous = entries.pop(assessment_id, None)
+            if previous is not None:
+                self.size -= len(previous)
+            entries[assessment_id] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def put_assessments(self, assessments: List[AssessmentResultBase]) -> None:
+        """Cache the bodies of saved assessments; a repository save listener."""
+        if self.max_bytes:
+            for assessment in assessments:
+                self.put(assessment.id, serialize_assessment(assessment))
+
+    def invalidate(self, assessment_id: int) -> None:
+        self.invalidate_many([assessment_id])
+
+    def invalidate_many(self, assessment_ids: List[int]) -> None:
+        """Drop the bodies of removed assessments; a repository removal listener."""
+        with self._lock:
+            for assessment_id in assessment_ids:
+                body = self._entries.pop(assessment_id, None)
+                if body is not None:
+                    self.size -= len(body)
@@ -4,3 +4,24 @@
 class InvalidAnswerException(Exception):
     def __init__(self, message: str):
         self.message = message
+
+
+class IdempotencyKeyReusedException(Exception):
+    """An Idempotency-Key was reused with a different request payload."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+class WriteQueueFullException(Exception):
+    """The write-behind queue had no room for another assessment."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+class SurveyDefinitionException(Exception):
+    """A declarative survey definition could not be loaded."""
+
+    def __init__(self, message: str):
+        self.message = message
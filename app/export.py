@@ -0,0 +1,49 @@
+# app/export.py
+
+import csv
+import io
+from typing import Iterable, Iterator, List
+from .models import AssessmentResultBase
+
+CSV_HEADER = ("id", "survey_id", "team_id", "timestamp", "score_name", "score_value")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def ndjson_chunks(pages: Iterable[List[AssessmentResultBase]]) -> Iterator[str]:
+    """Render pages of assessments as newline-delimited JSON, one chunk per page."""
+    for page in pages:
+        yield "".join(assessment.model_dump_json() + "\n" for assessment in page)
+
+
+def csv_chunks(pages: Iterable[List[AssessmentResultBase]]) -> Iterator[str]:
+    """
+    Render pages of assessments as CSV in long format: one row per score, so
+    the header is the same for every survey.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_HEADER)
+    for page in pages:
+        for assessment in page:
+            timestamp = assessment.timestamp.isoformat()
+            for name, value in assessment.scores.items():
+                writer.writerow(
+                    (
+                        assessment.id,
+                        assessment.survey_id,
+                        assessment.team_id,
+                        timestamp,
+                        name,
+                        value,
+                    )
+                )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Emit the header even when there is nothing to export
+    if buffer.tell():
+        yield buffer.getvalue()
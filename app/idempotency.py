@@ -0,0 +1,131 @@
+# app/idempotency.py
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from .exceptions import IdempotencyKeyReusedException
+from .metrics import metrics
+from .repositories import IdempotentRecord
+
+IDEMPOTENT_REQUESTS = metrics.counter(
+    "idempotent_requests_total",
+    "Requests carrying an Idempotency-Key, by outcome: "
+    "executed, replayed, coalesced or conflict.",
+    ("outcome",),
+)
+
+
+def request_fingerprint(survey_id: int, body: str) -> str:
+    """Hash of what a request asks for, to detect a key reused for another."""
+    return hashlib.sha256(f"{survey_id}:{body}".encode()).hexdigest()
+
+
+class IdempotencyCache:
+    """
+    Bounded LRU cache, with a TTL, of the records saved under idempotency keys.
+
+    A request whose key is cached is answered from the cache. Concurrent
+    requests with the same key are coalesced: the first executes, the others
+    wait for its record. A key reused with a different fingerprint raises
+    IdempotencyKeyReusedException. Failures are not cached, so a retry after
+    an error executes again.
+
+    Attributes:
+        max_entries (int): Most keys kept; the least recently used go first.
+        ttl_seconds (float): How long a key is honoured after it was saved.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 86_400) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, IdempotentRecord]]" = (
+            OrderedDict()
+        )
+        self._in_flight: Dict[str, "asyncio.Future[IdempotentRecord]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def expires_at(self) -> float:
+        """Expiry, in epoch seconds, of a key saved now."""
+        return time.time() + self.ttl_seconds
+
+    def _lookup(self, key: str) -> Optional[IdempotentRecord]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, record = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return record
+
+    def _store(self, key: str, record: IdempotentRecord) -> None:
+        self._entries[key] = (self.expires_at(), record._replace(replayed=False))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _check(key: str, fingerprint: str, record: IdempotentRecord) -> None:
+        if record.fingerprint != fingerprint:
+            IDEMPOTENT_REQUESTS.inc("conflict")
+            raise IdempotencyKeyReusedException(
+                f"Idempotency-Key {key!r} was already used with a different request."
+            )
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        execute: Callable[[], Awaitable[IdempotentRecord]],
+    ) -> IdempotentRecord:
+        """
+        Return the record saved under key, executing the request only if no
+        record exists and no other request with the key is in flight.
+        """
+        while True:
+            record = self._lookup(key)
+            if record is not None:
+                self._check(key, fingerprint, record)
+                IDEMPOTENT_REQUESTS.inc("replayed")
+                return record._replace(replayed=True)
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+            try:
+                record = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # The executing request was cancelled, not this one: retry
+                if in_flight.cancelled():
+                    continue
+                raise
+            self._check(key, fingerprint, record)
+            IDEMPOTENT_REQUESTS.inc("coalesced")
+            return record._replace(replayed=True)
+
+        future: "asyncio.Future[IdempotentRecord]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        # Mark the outcome as retrieved even when no request is waiting on it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        try:
+            record = await execute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(record)
+        finally:
+            del self._in_flight[key]
+        self._store(key, record)
+        self._check(key, fingerprint, record)
+        IDEMPOTENT_REQUESTS.inc("replayed" if record.replayed else "executed")
+        return record
@@ -0,0 +1,50 @@
+# app/interpretation.py
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Sequence, Tuple
+import numpy as np
+
+
+@dataclass(frozen=True)
+class InterpretationTable:
+    """
+    Score interpretation bands resolved by binary search.
+
+    Attributes:
+        bounds (Tuple[float, ...]): Ascending lower bounds of the bands.
+        labels (Tuple[str, ...]): One label more than there are bounds:
+            labels[0] applies below bounds[0] and labels[i] applies from
+            bounds[i - 1] up to, but excluding, bounds[i].
+    """
+
+    bounds: Tuple[float, ...]
+    labels: Tuple[str, ...]
+    _bounds_array: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if len(self.labels) != len(self.bounds) + 1:
+            raise ValueError("An interpretation table needs one label per band.")
+        if any(low >= high for low, high in zip(self.bounds, self.bounds[1:])):
+            raise ValueError("Interpretation band bounds must be strictly ascending.")
+        object.__setattr__(self, "_bounds_array", np.asarray(self.bounds, dtype=float))
+
+    @classmethod
+    def from_bands(
+        cls, bands: Sequence[Tuple[float, str]], below: str
+    ) -> "InterpretationTable":
+        """
+        Build a table from (lower_bound, label) bands sorted by bound, with the
+        label used for scores below the first band.
+        """
+        return cls(
+            bounds=tuple(bound for bound, _ in bands),
+            labels=(below,) + tuple(label for _, label in bands),
+        )
+
+    def resolve(self, score: float) -> str:
+        return self.labels[bisect_right(self.bounds, score)]
+
+    def resolve_many(self, scores: Sequence[float]) -> List[str]:
+        positions = np.searchsorted(self._bounds_array, scores, side="right")
+        return [self.labels[position] for position in positions.tolist()]
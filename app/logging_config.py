@@ -0,0 +1,156 @@
+# app/logging_config.py
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Mapping, Optional, TextIO
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "taskName"}
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line, with the fields passed via
+    `extra` as top-level keys.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a random fraction of records below WARNING; warnings and errors are
+    always kept.
+    """
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate  # nosec
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket that lets through at most `per_second` records below WARNING
+    per second on average, with bursts of up to `burst` records.
+    """
+
+    def __init__(self, per_second: float, burst: Optional[float] = None) -> None:
+        super().__init__()
+        self.per_second = per_second
+        self.burst = burst if burst is not None else max(per_second, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.per_second
+            )
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+def configure_logging(
+    level: str = "INFO",
+    log_format: str = "json",
+    sampling: Optional[Mapping[str, float]] = None,
+    rate_limits: Optional[Mapping[str, float]] = None,
+    stream: Optional[TextIO] = None,
+) -> QueueListener:
+    """
+    Route all logging through a queue so that request handlers only enqueue
+    records, while a background thread formats and writes them.
+
+    - **level**: Root log level.
+    - **log_format**: "json" for one JSON object per line, "text" otherwise.
+    - **sampling**: Fraction of sub-WARNING records to keep, per logger name.
+    - **rate_limits**: Maximum sub-WARNING records per second, per logger name.
+    - **stream**: Output stream; defaults to stderr.
+
+    Calling it again replaces the previous configuration.
+    """
+    global _listener, _queue_handler
+    stop_logging()
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(
+        JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+    )
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    _queue_handler = QueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    for name, rate in (sampling or {}).items():
+        _replace_filter(logging.getLogger(name), SamplingFilter, SamplingFilter(rate))
+    for name, per_second in (rate_limits or {}).items():
+        _replace_filter(
+            logging.getLogger(name), RateLimitFilter, RateLimitFilter(per_second)
+        )
+
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background writer, if running."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _replace_filter(
+    logger: logging.Logger, kind: type, new_filter: logging.Filter
+) -> None:
+    for existing in [f for f in logger.filters if isinstance(f, kind)]:
+        logger.removeFilter(existing)
+    logger.addFilter(new_filter)
+
+
+atexit.register(stop_logging)
@@ -1,60 +1,127 @@
 # app/main.py
 
+import hmac
+import json
 import logging
-from fastapi import FastAPI, HTTPException, Request, APIRouter
-from fastapi.responses import JSONResponse
+import math
+import time
+from fastapi import FastAPI, Header, HTTPException, Query, Request, APIRouter
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, AsyncIterator
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.concurrency import run_in_threadpool
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    TypeVar,
+    Union,
+)
 from contextlib import asynccontextmanager
+from datetime import date
 from .models import (
+    AssessmentBatch,
     ResponseBase,
+    SurveyBase,
     AssessmentResultBase,
+    BatchItemResult,
+    BatchSubmissionResult,
+    InterpretationBatch,
+    InterpretationRequest,
+    MAX_BATCH_SIZE,
+    PeriodPercentiles,
     QuestionBase,
+    ScorePercentiles,
+    ScoreStats,
     SurveyModel,
+    SurveyPercentiles,
+    SurveyStats,
     SurveySummary,
+    SurveyTrend,
+    TrendBucket,
+)
+from .survey_registry import CachedPayload, RegistrySnapshot, survey_registry
+from .survey_definitions import SurveyDefinitionWatcher, reload_surveys
+from .survey_plan import SurveyPlan
+from .repositories import (
+    Aggregates,
+    IdempotentRecord,
+    RetentionPolicy,
+    create_assessment_repository,
+)
+from .settings import settings
+from .exceptions import (
+    IdempotencyKeyReusedException,
+    InvalidAnswerException,
+    SurveyDefinitionException,
+    WriteQueueFullException,
+)
+from .idempotency import IdempotencyCache, request_fingerprint
+from .assessment_cache import AssessmentCache, serialize_assessment
+from .responses import FastJSONResponse
+from .write_behind import WriteBehindQueue
+from .quantiles import DEFAULT_RANK_ERROR, KLLSketch
+from .aggregates import SurveyStatistics
+from .rollups import RollupIndex
+from .export import MEDIA_TYPES, csv_chunks, ndjson_chunks
+from .version import project_version
+from .logging_config import configure_logging, stop_logging
+from .admission import AdmissionMiddleware, ConcurrencyLimiter, RateLimiter
+from .metrics import (
+    ERRORS,
+    REQUEST_START,
+    SUBMISSION_STAGES,
+    MetricsMiddleware,
+    metrics,
 )
-from .survey_registry import survey_registry
-from .repositories.assessment_repository import AssessmentRepository
-from .exceptions import InvalidAnswerException
-
-
-# Function to get the latest tag from Git
-def get_git_version() -> str:
-    try:
-        from git import Repo
-        from git.exc import InvalidGitRepositoryError, GitCommandError
-
-        repo = Repo(search_parent_directories=True)
-        tags = sorted(repo.tags, key=lambda t: t.commit.committed_datetime)
-        return str(tags[-1]) if tags else "No tags found"
-    except (ImportError, InvalidGitRepositoryError, GitCommandError):
-        return "Unable to determine version from Git"
-
-
-# Project version from Git tags or fallback
-PROJECT_VERSION: str = get_git_version()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Configure queue-based logging; records are written by a background thread
+configure_logging(
+    level=settings.log_level,
+    log_format=settings.log_format,
+    sampling=settings.log_sampling,
+    rate_limits=settings.log_rate_limits,
 )
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    # Startup
-    logger.info(f"Starting Agile Team Health Check API, version: {PROJECT_VERSION}")
+    # Startup; the version is resolved here rather than at import, as its Git
+    # fallback is slow
+    app.version = project_version()
+    logger.info(f"Starting Agile Team Health Check API, version: {app.version}")
+    if write_behind is not None:
+        write_behind.start()
+    if survey_watcher is not None:
+        survey_watcher.start()
     yield
     # Shutdown
     logger.info("Shutting down Agile Team Health Check API")
+    if survey_watcher is not None:
+        await survey_watcher.stop()
+    if write_behind is not None:
+        # Save what is still queued before the repository closes
+        await write_behind.stop()
+    assessment_repository.close()
+    stop_logging()
 
 
 # Create the FastAPI app with metadata and lifespan
 app: FastAPI = FastAPI(
     title="Agile Team Health Check API",
     description="An API for measuring and visualizing the health of Agile teams.",
-    version=PROJECT_VERSION,
     contact={
         "name": "Peiman Khorramshahi",
         "url": "https://peiman.se",
@@ -63,6 +130,31 @@ app: FastAPI = FastAPI(
     lifespan=lifespan,
 )
 
+# Shed load past the configured rate and concurrency limits, innermost so
+# that rejections still carry CORS headers and are counted in the metrics
+if settings.rate_limit is not None or settings.max_concurrent_requests is not None:
+    app.add_middleware(
+        AdmissionMiddleware,
+        rate_limiter=(
+            RateLimiter(
+                settings.rate_limit,
+                settings.rate_limit_burst or max(1, math.ceil(settings.rate_limit)),
+            )
+            if settings.rate_limit is not None
+            else None
+        ),
+        concurrency_limiter=(
+            ConcurrencyLimiter(
+                settings.max_concurrent_requests,
+                queue_size=settings.admission_queue_size,
+                queue_timeout=settings.admission_queue_timeout,
+            )
+            if settings.max_concurrent_requests is not None
+            else None
+        ),
+        api_keys=settings.api_keys,
+    )
+
 # Add CORS middleware with type annotations
 app.add_middleware(
     CORSMiddleware,
@@ -72,8 +164,124 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record per-route request counts and latency
+app.add_middleware(MetricsMiddleware)
+
 
-assessment_repository = AssessmentRepository()
+# Declarative surveys join the built-in ones before anything reads the registry
+if settings.survey_definitions_dir:
+    reload_surveys(settings.survey_definitions_dir)
+
+assessment_repository = create_assessment_repository(
+    settings.assessment_db_path,
+    pool_size=settings.assessment_db_pool_size,
+    node_id=settings.node_id,
+    columnar=settings.assessment_store == "columnar",
+    retention=RetentionPolicy(
+        max_records=settings.assessment_max_records,
+        ttl_seconds=settings.assessment_ttl_seconds,
+        spill_dir=settings.assessment_spill_dir,
+    ),
+    cadences={
+        survey.id: survey.survey_type for survey in survey_registry.list_surveys()
+    },
+)
+
+# Serialized assessments for the read endpoints, filled as assessments are saved
+assessment_cache = AssessmentCache(max_bytes=settings.assessment_cache_bytes)
+assessment_repository.add_save_listener(assessment_cache.put_assessments)
+assessment_repository.add_removal_listener(assessment_cache.invalidate_many)
+
+# Recently used idempotency keys and the assessments saved under them
+idempotency_cache = IdempotencyCache(
+    max_entries=settings.idempotency_max_keys,
+    ttl_seconds=settings.idempotency_ttl_seconds,
+)
+
+# Queue saving single submissions in batches, when write-behind is enabled
+write_behind: Optional[WriteBehindQueue] = (
+    WriteBehindQueue(
+        assessment_repository,
+        max_size=settings.write_behind_queue_size,
+        batch_size=settings.write_behind_batch_size,
+        flush_interval=settings.write_behind_flush_interval,
+        backpressure=settings.write_behind_backpressure,
+        block_timeout=settings.write_behind_block_timeout,
+        spill_path=settings.write_behind_spill_path,
+    )
+    if settings.write_behind
+    else None
+)
+
+
+def _reload_surveys() -> RegistrySnapshot:
+    """Reload the survey definitions and bucket new surveys by their cadence."""
+    assert settings.survey_definitions_dir is not None  # nosec B101
+    snapshot = reload_surveys(settings.survey_definitions_dir)
+    for survey in snapshot.list_surveys():
+        assessment_repository.rollups.set_cadence(survey.id, survey.survey_type)
+    return snapshot
+
+
+# Polls the definitions directory and swaps in a new registry on changes
+survey_watcher: Optional[SurveyDefinitionWatcher] = (
+    SurveyDefinitionWatcher(
+        settings.survey_definitions_dir,
+        settings.survey_reload_interval,
+        _reload_surveys,
+    )
+    if settings.survey_definitions_dir and settings.survey_reload_interval > 0
+    else None
+)
+
+T = TypeVar("T")
+
+
+async def _run_repository(func: Callable[..., T], *args: Any) -> T:
+    """Call a repository method, off the event loop if the backend blocks."""
+    if assessment_repository.blocking:
+        return await run_in_threadpool(func, *args)
+    return func(*args)
+
+
+def _model_response(content: T) -> Union[T, Response]:
+    """
+    In fast response mode, serialize trusted handler output straight to JSON,
+    skipping FastAPI's response_model validation; otherwise return it as is.
+    The route's response_model still documents the schema either way.
+    """
+    if settings.fast_responses:
+        return FastJSONResponse(content)
+    return content
+
+
+INTERPRETATION_NOT_AVAILABLE = "Interpretation not available for this survey."
+
+metrics.gauge(
+    "assessment_repository_size",
+    "Number of stored assessments.",
+    lambda: assessment_repository.count(),
+)
+metrics.gauge(
+    "assessment_cache_hit_ratio",
+    "Fraction of assessment reads served from the cache since start.",
+    lambda: assessment_cache.hit_rate(),
+)
+metrics.gauge(
+    "assessment_cache_bytes",
+    "Bytes of serialized assessments held in the read cache.",
+    lambda: assessment_cache.size,
+)
+metrics.gauge(
+    "write_behind_queue_depth",
+    "Assessments waiting in the write-behind queue.",
+    lambda: write_behind.depth() if write_behind is not None else 0,
+)
+metrics.gauge(
+    "assessment_teams",
+    "Number of teams with saved assessments.",
+    lambda: assessment_repository.team_count(),
+)
 
 # Create versioned router
 v1_router = APIRouter(prefix="/v1")
@@ -83,13 +291,61 @@ v1_router = APIRouter(prefix="/v1")
 async def invalid_answer_exception_handler(
     request: Request, exc: InvalidAnswerException
 ) -> JSONResponse:
-    logger.error(f"InvalidAnswerException: {exc.message}")
+    logger.error("InvalidAnswerException: %s", exc.message)
+    ERRORS.inc("InvalidAnswerException")
     return JSONResponse(
         status_code=400,
         content={"detail": exc.message},
     )
 
 
+@app.exception_handler(IdempotencyKeyReusedException)
+async def idempotency_key_reused_exception_handler(
+    request: Request, exc: IdempotencyKeyReusedException
+) -> JSONResponse:
+    logger.error("IdempotencyKeyReusedException: %s", exc.message)
+    ERRORS.inc("IdempotencyKeyReusedException")
+    return JSONResponse(status_code=422, content={"detail": exc.message})
+
+
+@app.exception_handler(WriteQueueFullException)
+async def write_queue_full_exception_handler(
+    request: Request, exc: WriteQueueFullException
+) -> JSONResponse:
+    logger.warning("WriteQueueFullException: %s", exc.message)
+    ERRORS.inc("WriteQueueFullException")
+    return JSONResponse(
+        status_code=503, content={"detail": exc.message}, headers={"Retry-After": "1"}
+    )
+
+
+@app.exception_handler(StarletteHTTPException)
+async def counting_http_exception_handler(
+    request: Request, exc: StarletteHTTPException
+) -> Response:
+    ERRORS.inc("HTTPException")
+    return await http_exception_handler(request, exc)
+
+
+@app.get(
+    "/metrics",
+    summary="Prometheus Metrics",
+    tags=["General"],
+    response_class=PlainTextResponse,
+)
+def get_metrics() -> PlainTextResponse:
+    """
+    Expose in-process metrics in the Prometheus text exposition format:
+    request counts and latency per route, per-stage submission timings,
+    error counts by exception type and the repository size.
+
+    - **Returns**: The metrics as plain text.
+    """
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/", summary="Root Greeting", tags=["General"])
 async def root() -> Dict[str, str]:
     """
@@ -99,12 +355,72 @@ async def root() -> Dict[str, str]:
     """
     return {
         "message": "Welcome to the Agile Team Health Check API",
-        "version": PROJECT_VERSION,
+        "version": project_version(),
         "api_version": "v1",
         "docs_url": "/docs",
     }
 
 
+def _validate_response(plan: SurveyPlan, response: ResponseBase) -> None:
+    """
+    Check that a response answers every question of the survey within its scale.
+
+    Raises HTTPException for an incomplete set of answers and
+    InvalidAnswerException for unknown questions or out-of-range scores.
+    """
+    # Validate that all required questions have been answered
+    answered_question_ids = {a.question_id for a in response.answers}
+    if answered_question_ids != plan.required_ids:
+        missing_questions = {
+            qid for qid in plan.question_ids if qid not in answered_question_ids
+        }
+        logger.error(
+            "Incomplete set of answers. Missing questions: %s", missing_questions
+        )
+        raise HTTPException(
+            status_code=400,
+            detail=f"Incomplete set of answers. Missing questions: {missing_questions}",
+        )
+
+    # Validate answers
+    for answer in response.answers:
+        position = plan.index.get(answer.question_id)
+        if position is None:
+            logger.error("Invalid question ID %s in response.", answer.question_id)
+            raise InvalidAnswerException(f"Invalid question ID {answer.question_id}.")
+        scale_min = plan.scale_min[position]
+        scale_max = plan.scale_max[position]
+        if not (scale_min <= answer.score <= scale_max):
+            logger.error(
+                "Score for question ID %s must be between %s and %s.",
+                answer.question_id,
+                scale_min,
+                scale_max,
+            )
+            raise InvalidAnswerException(
+                f"Score for question ID {answer.question_id} must be between "
+                f"{scale_min} and {scale_max}."
+            )
+
+
+def _cached_response(payload: CachedPayload, request: Request) -> Response:
+    """
+    Serve a pre-serialized payload, or 304 Not Modified when the client's
+    If-None-Match already names its ETag.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match uses weak comparison, so a W/ prefix still matches
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if payload.etag in tags or "*" in tags:
+            return Response(status_code=304, headers={"ETag": payload.etag})
+    return Response(
+        content=payload.body,
+        media_type="application/json",
+        headers={"ETag": payload.etag},
+    )
+
+
 # V1 Endpoints
 @v1_router.get(
     "/surveys/",
@@ -112,18 +428,17 @@ async def root() -> Dict[str, str]:
     summary="Get List of Surveys",
     tags=["Surveys"],
 )
-async def list_surveys() -> List[SurveySummary]:
+async def list_surveys(request: Request) -> Response:
     """
     Retrieve a list of all available surveys.
 
+    The response carries a strong ETag; send it back in If-None-Match to get
+    a 304 Not Modified while the catalog is unchanged.
+
     - **Returns**: A list of surveys with their IDs, names, and types.
     """
     logger.info("Fetching list of all surveys")
-    survey_summaries = [
-        SurveySummary(id=survey.id, name=survey.name, survey_type=survey.survey_type)
-        for survey in survey_registry.list_surveys()
-    ]
-    return survey_summaries
+    return _cached_response(survey_registry.catalog_payload(), request)
 
 
 @v1_router.get(
@@ -132,25 +447,21 @@ async def list_surveys() -> List[SurveySummary]:
     summary="Get Survey Details",
     tags=["Surveys"],
 )
-async def get_survey_details(survey_id: int) -> SurveyModel:
+async def get_survey_details(survey_id: int, request: Request) -> Response:
     """
     Retrieve the details of a given survey, including its questions.
 
+    Supports conditional requests with If-None-Match.
+
     - **survey_id**: The ID of the survey.
     - **Returns**: The survey details.
     """
     logger.info(f"Fetching details for survey_id: {survey_id}")
-    survey = survey_registry.get_survey(survey_id)
-    if not survey:
+    payload = survey_registry.details_payload(survey_id)
+    if not payload:
         logger.error(f"Survey with ID {survey_id} not found.")
         raise HTTPException(status_code=404, detail="Survey not found")
-    survey_model = SurveyModel(
-        id=survey.id,
-        name=survey.name,
-        survey_type=survey.survey_type,
-        questions=survey.questions,
-    )
-    return survey_model
+    return _cached_response(payload, request)
 
 
 @v1_router.get(
@@ -159,19 +470,44 @@ async def get_survey_details(survey_id: int) -> SurveyModel:
     summary="Get Survey Questions",
     tags=["Surveys"],
 )
-async def get_survey_questions(survey_id: int) -> List[QuestionBase]:
+async def get_survey_questions(survey_id: int, request: Request) -> Response:
     """
     Retrieve the list of questions for a given survey.
 
+    Supports conditional requests with If-None-Match.
+
     - **survey_id**: The ID of the survey.
     - **Returns**: A list of questions with their details.
     """
     logger.info(f"Fetching questions for survey_id: {survey_id}")
-    survey = survey_registry.get_survey(survey_id)
-    if not survey:
+    payload = survey_registry.questions_payload(survey_id)
+    if not payload:
         logger.error(f"Survey with ID {survey_id} not found.")
         raise HTTPException(status_code=404, detail="Survey not found")
-    return survey.questions
+    return _cached_response(payload, request)
+
+
+def _score_response(
+    survey: SurveyBase, plan: SurveyPlan, response: ResponseBase
+) -> AssessmentResultBase:
+    """Validate and score a response into an assessment that is not saved yet."""
+    with SUBMISSION_STAGES.time("validate"):
+        _validate_response(plan, response)
+
+    # Calculate scores
+    with SUBMISSION_STAGES.time("score"):
+        scores = survey.scoring_mechanism.calculate_score(
+            response.answers, survey.questions, plan
+        )
+    logger.debug("Calculated scores: %s", scores)
+
+    return AssessmentResultBase(
+        id=0,  # ID will be set by repository
+        survey_id=survey.id,
+        scores=scores,
+        timestamp=response.timestamp,
+        team_id=response.team_id,
+    )
 
 
 @v1_router.post(
@@ -181,69 +517,566 @@ async def get_survey_questions(survey_id: int) -> List[QuestionBase]:
     tags=["Surveys"],
 )
 async def submit_survey_response(
-    survey_id: int, response: ResponseBase, request: Request
-) -> AssessmentResultBase:
+    survey_id: int,
+    response: ResponseBase,
+    request: Request,
+    http_response: Response,
+    idempotency_key: Annotated[
+        Optional[str],
+        Header(
+            alias="Idempotency-Key",
+            description="Client-chosen key that makes retries of this request safe",
+        ),
+    ] = None,
+) -> Union[AssessmentResultBase, Response]:
     """
     Submit responses for a survey and receive the calculated assessment result.
 
+    A request repeated with the same Idempotency-Key returns the assessment
+    saved by the first one, with an Idempotent-Replayed header, instead of
+    saving a new one. Reusing a key for a different response is rejected with
+    a 422 error.
+
+    With write-behind enabled, a submission without a key is queued and saved
+    shortly after the response is sent; a full queue answers 503 with a
+    Retry-After header. Submissions with a key are always saved before the
+    response, so that the key and its assessment are stored together.
+
     - **survey_id**: The ID of the survey.
     - **response**: The survey responses submitted by the user.
+    - **Idempotency-Key**: Optional key identifying this submission.
     - **Returns**: The assessment result including calculated scores.
     """
+    # Time from the request reaching the app to the handler: routing and parsing
+    request_start = request.scope.get("state", {}).get(REQUEST_START)
+    if request_start is not None:
+        SUBMISSION_STAGES.observe(time.perf_counter() - request_start, "parse")
+
     client_host = request.client.host if request.client else "Unknown"
-    logger.info(f"Submitting response for survey_id: {survey_id} from {client_host}")
-    survey = survey_registry.get_survey(survey_id)
-    if not survey:
-        logger.error(f"Survey with ID {survey_id} not found.")
+    logger.info(
+        "Submitting response for survey_id: %s from %s",
+        survey_id,
+        client_host,
+        extra={"survey_id": survey_id, "client_host": client_host},
+    )
+    # One snapshot, so that a concurrent reload cannot pair a survey with
+    # another version's plan
+    surveys = survey_registry.snapshot()
+    survey = surveys.get_survey(survey_id)
+    plan = surveys.get_plan(survey_id)
+    if not survey or not plan:
+        logger.error("Survey with ID %s not found.", survey_id)
         raise HTTPException(status_code=404, detail="Survey not found")
 
-    # Validate that all required questions have been answered
-    required_question_ids = {q.id for q in survey.questions}
-    answered_question_ids = {a.question_id for a in response.answers}
-    if required_question_ids != answered_question_ids:
-        missing_questions = required_question_ids - answered_question_ids
+    queued = False
+    if idempotency_key is None:
+        assessment = _score_response(survey, plan, response)
+        if write_behind is not None and write_behind.running:
+            with SUBMISSION_STAGES.time("enqueue"):
+                saved_assessment = await write_behind.enqueue(assessment)
+            queued = True
+        else:
+            with SUBMISSION_STAGES.time("save"):
+                saved_assessment = await _run_repository(
+                    assessment_repository.save, assessment
+                )
+        replayed = False
+    else:
+        key = idempotency_key
+        fingerprint = request_fingerprint(survey_id, response.model_dump_json())
+
+        async def execute() -> IdempotentRecord:
+            # A durable repository may hold the key from another worker
+            stored = await _run_repository(assessment_repository.find_idempotent, key)
+            if stored is not None:
+                return stored
+            assessment = _score_response(survey, plan, response)
+            with SUBMISSION_STAGES.time("save"):
+                return await _run_repository(
+                    assessment_repository.save_idempotent,
+                    assessment,
+                    key,
+                    fingerprint,
+                    idempotency_cache.expires_at(),
+                )
+
+        record = await idempotency_cache.run(key, fingerprint, execute)
+        saved_assessment, replayed = record.assessment, record.replayed
+
+    if replayed:
+        logger.info(
+            "Replaying assessment %s for Idempotency-Key %s.",
+            saved_assessment.id,
+            idempotency_key,
+            extra={"assessment_id": saved_assessment.id, "survey_id": survey_id},
+        )
+    else:
+        logger.info(
+            "Assessment %s %s successfully.",
+            saved_assessment.id,
+            "queued" if queued else "saved",
+            extra={"assessment_id": saved_assessment.id, "survey_id": survey_id},
+        )
+    result = _model_response(saved_assessment)
+    if replayed:
+        target = result if isinstance(result, Response) else http_response
+        target.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+@v1_router.post(
+    "/surveys/{survey_id}/responses:batch",
+    response_model=BatchSubmissionResult,
+    summary="Submit Survey Responses in Batch",
+    tags=["Surveys"],
+)
+async def submit_survey_responses_batch(
+    survey_id: int, responses: List[ResponseBase], request: Request
+) -> Union[BatchSubmissionResult, Response]:
+    """
+    Submit many responses for a survey in one request.
+
+    Every response is validated independently; valid responses are scored
+    together and saved in a single repository operation, while invalid ones
+    are reported with their error and do not affect the rest of the batch.
+
+    - **survey_id**: The ID of the survey.
+    - **responses**: The survey responses to submit.
+    - **Returns**: Per-response assessment results or errors, in submission order.
+    """
+    client_host = request.client.host if request.client else "Unknown"
+    logger.info(
+        "Submitting batch of %s responses for survey_id: %s from %s",
+        len(responses),
+        survey_id,
+        client_host,
+        extra={"survey_id": survey_id, "client_host": client_host},
+    )
+    # One snapshot, so that a concurrent reload cannot pair a survey with
+    # another version's plan
+    surveys = survey_registry.snapshot()
+    survey = surveys.get_survey(survey_id)
+    plan = surveys.get_plan(survey_id)
+    if not survey or not plan:
+        logger.error("Survey with ID %s not found.", survey_id)
+        raise HTTPException(status_code=404, detail="Survey not found")
+    if len(responses) > MAX_BATCH_SIZE:
         logger.error(
-            f"Incomplete set of answers. Missing questions: {missing_questions}"
+            "Batch of %s responses exceeds %s.", len(responses), MAX_BATCH_SIZE
         )
         raise HTTPException(
-            status_code=400,
-            detail=f"Incomplete set of answers. Missing questions: {missing_questions}",
+            status_code=413,
+            detail=f"Batch size must not exceed {MAX_BATCH_SIZE} responses.",
         )
 
-    # Validate answers
-    for answer in response.answers:
-        question = next(
-            (q for q in survey.questions if q.id == answer.question_id), None
-        )
-        if not question:
-            logger.error(f"Invalid question ID {answer.question_id} in response.")
-            raise InvalidAnswerException(f"Invalid question ID {answer.question_id}.")
-        if not (question.scale_min <= answer.score <= question.scale_max):
-            logger.error(
-                f"Score for question ID {answer.question_id} must be between "
-                f"{question.scale_min} and {question.scale_max}."
+    results: List[BatchItemResult] = []
+    accepted: List[ResponseBase] = []
+    accepted_results: List[BatchItemResult] = []
+    for index, response in enumerate(responses):
+        item = BatchItemResult(index=index, assessment=None, error=None)
+        try:
+            _validate_response(plan, response)
+        except HTTPException as exc:
+            item.error = str(exc.detail)
+        except InvalidAnswerException as exc:
+            item.error = exc.message
+        else:
+            accepted.append(response)
+            accepted_results.append(item)
+        results.append(item)
+
+    # Score and save all valid responses in one pass
+    scores = survey.scoring_mechanism.calculate_scores(
+        [response.answers for response in accepted], survey.questions, plan
+    )
+    assessments = await _run_repository(
+        assessment_repository.save_many,
+        [
+            AssessmentResultBase(
+                id=0,  # ID will be set by repository
+                survey_id=survey_id,
+                scores=response_scores,
+                timestamp=response.timestamp,
+                team_id=response.team_id,
             )
-            raise InvalidAnswerException(
-                f"Score for question ID {answer.question_id} must be between "
-                f"{question.scale_min} and {question.scale_max}."
+            for response, response_scores in zip(accepted, scores)
+        ],
+    )
+    for item, assessment in zip(accepted_results, assessments):
+        item.assessment = assessment
+
+    rejected = len(responses) - len(accepted)
+    logger.info(
+        "Batch for survey_id %s saved: %s accepted, %s rejected.",
+        survey_id,
+        len(accepted),
+        rejected,
+        extra={"survey_id": survey_id, "accepted": len(accepted), "rejected": rejected},
+    )
+    return _model_response(
+        BatchSubmissionResult(
+            accepted=len(accepted), rejected=rejected, results=results
+        )
+    )
+
+
+# Range and quantile parameters shared by the survey and team routes
+FromDate = Annotated[
+    Optional[date],
+    Query(alias="from", description="First day of the range (inclusive)"),
+]
+ToDate = Annotated[
+    Optional[date],
+    Query(alias="to", description="Last day of the range (inclusive)"),
+]
+Quantiles = Annotated[
+    Optional[List[float]],
+    Query(description="Quantiles between 0 and 1; repeat for several"),
+]
+
+# Percentiles served when none are requested
+DEFAULT_PERCENTILES = [0.5, 0.9, 0.99]
+
+
+def _require_survey(survey_id: int) -> None:
+    if not survey_registry.get_survey(survey_id):
+        logger.error(f"Survey with ID {survey_id} not found.")
+        raise HTTPException(status_code=404, detail="Survey not found")
+
+
+async def _require_team(team_id: str) -> None:
+    if not await _run_repository(assessment_repository.has_team, team_id):
+        logger.error(f"Team with ID {team_id} not found.")
+        raise HTTPException(status_code=404, detail="Team not found")
+
+
+async def _aggregates(survey_id: int, team_id: Optional[str] = None) -> Aggregates:
+    return await _run_repository(assessment_repository.aggregates, survey_id, team_id)
+
+
+def _check_range(from_date: Optional[date], to_date: Optional[date]) -> None:
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(
+            status_code=400, detail="'from' must not be later than 'to'"
+        )
+
+
+def _survey_stats(survey_id: int, stats: SurveyStatistics) -> SurveyStats:
+    return SurveyStats(
+        survey_id=survey_id,
+        count=stats.count(survey_id),
+        scores={
+            key: ScoreStats(
+                count=score_stats.count,
+                mean=score_stats.mean,
+                variance=score_stats.variance,
+                stddev=score_stats.stddev,
+                min=score_stats.minimum,
+                max=score_stats.maximum,
             )
+            for key, score_stats in stats.scores(survey_id).items()
+        },
+    )
 
-    # Calculate scores
-    scores = survey.scoring_mechanism.calculate_score(
-        response.answers, survey.questions
+
+def _survey_trend(
+    survey_id: int,
+    rollups: RollupIndex,
+    from_date: Optional[date],
+    to_date: Optional[date],
+) -> SurveyTrend:
+    return SurveyTrend(
+        survey_id=survey_id,
+        survey_type=rollups.cadence(survey_id),
+        buckets=[
+            TrendBucket(
+                period_start=start,
+                count=bucket.count,
+                sums=dict(bucket.sums),
+                means=bucket.means(),
+                distributions={
+                    key: dict(distribution)
+                    for key, distribution in bucket.distributions.items()
+                },
+            )
+            for start, bucket in rollups.buckets(survey_id, from_date, to_date)
+        ],
     )
-    logger.debug(f"Calculated scores: {scores}")
 
-    # Create assessment result
-    assessment = AssessmentResultBase(
-        id=0,  # ID will be set by repository
+
+def _score_percentiles(
+    sketches: Dict[str, KLLSketch], qs: List[float]
+) -> Dict[str, ScorePercentiles]:
+    labels = [f"p{q * 100:g}" for q in qs]
+    return {
+        key: ScorePercentiles(
+            count=sketch.count,
+            percentiles={
+                label: value
+                for label, value in zip(labels, sketch.quantiles(qs))
+                if value is not None
+            },
+        )
+        for key, sketch in sketches.items()
+    }
+
+
+def _survey_percentiles(
+    survey_id: int,
+    stats: SurveyStatistics,
+    rollups: RollupIndex,
+    q: Optional[List[float]],
+    from_date: Optional[date],
+    to_date: Optional[date],
+) -> SurveyPercentiles:
+    qs = q or DEFAULT_PERCENTILES
+    if not all(0 <= value <= 1 for value in qs):
+        raise HTTPException(status_code=400, detail="'q' must be between 0 and 1")
+    _check_range(from_date, to_date)
+    buckets = rollups.buckets(survey_id, from_date, to_date)
+    if from_date is None and to_date is None:
+        sketches = stats.sketches(survey_id)
+    else:
+        sketches = {}
+        for _, bucket in buckets:
+            for key, sketch in list(bucket.sketches.items()):
+                sketches.setdefault(key, KLLSketch()).merge(sketch)
+    return SurveyPercentiles(
         survey_id=survey_id,
-        scores=scores,
-        timestamp=response.timestamp,
+        survey_type=rollups.cadence(survey_id),
+        rank_error=DEFAULT_RANK_ERROR,
+        scores=_score_percentiles(sketches, qs),
+        periods=[
+            PeriodPercentiles(
+                period_start=start,
+                scores=_score_percentiles(dict(bucket.sketches), qs),
+            )
+            for start, bucket in buckets
+        ],
+    )
+
+
+@v1_router.get(
+    "/surveys/{survey_id}/stats",
+    response_model=SurveyStats,
+    summary="Get Survey Statistics",
+    tags=["Surveys"],
+)
+async def get_survey_stats(survey_id: int) -> Union[SurveyStats, Response]:
+    """
+    Retrieve running statistics of all assessments saved for a survey.
+
+    The statistics are maintained incrementally as assessments are saved, so
+    this call does not depend on the number of stored assessments.
+
+    - **survey_id**: The ID of the survey.
+    - **Returns**: The assessment count and per-score count, mean, variance,
+      standard deviation, minimum and maximum.
+    """
+    logger.info(f"Fetching statistics for survey_id: {survey_id}")
+    _require_survey(survey_id)
+    aggregates = await _aggregates(survey_id)
+    return _model_response(_survey_stats(survey_id, aggregates.stats))
+
+
+@v1_router.get(
+    "/surveys/{survey_id}/trend",
+    response_model=SurveyTrend,
+    summary="Get Survey Trend",
+    tags=["Surveys"],
+)
+async def get_survey_trend(
+    survey_id: int, from_date: FromDate = None, to_date: ToDate = None
+) -> Union[SurveyTrend, Response]:
+    """
+    Retrieve per-period aggregates of a survey's assessments.
+
+    Periods are ISO weeks for weekly surveys and calendar months for monthly
+    surveys. Only the precomputed buckets in the requested range are read.
+
+    - **survey_id**: The ID of the survey.
+    - **from**: Optional first day of the range; the period containing it is
+      included.
+    - **to**: Optional last day of the range.
+    - **Returns**: The count, sums, means and score distributions per period.
+    """
+    logger.info(
+        f"Fetching trend for survey_id: {survey_id} from {from_date} to {to_date}"
+    )
+    _require_survey(survey_id)
+    _check_range(from_date, to_date)
+    aggregates = await _aggregates(survey_id)
+    trend = _survey_trend(survey_id, aggregates.rollups, from_date, to_date)
+    return _model_response(trend)
+
+
+@v1_router.get(
+    "/surveys/{survey_id}/percentiles",
+    response_model=SurveyPercentiles,
+    summary="Get Survey Percentiles",
+    tags=["Surveys"],
+)
+async def get_survey_percentiles(
+    survey_id: int,
+    q: Quantiles = None,
+    from_date: FromDate = None,
+    to_date: ToDate = None,
+) -> Union[SurveyPercentiles, Response]:
+    """
+    Retrieve estimated percentiles of a survey's scores, overall and per
+    period.
+
+    Each score key is summarized by a KLL quantile sketch kept up to date as
+    assessments are saved, so this call does not sort stored assessments.
+    Estimates are exact up to 200 scores; beyond that, the true rank of an
+    estimate for quantile q is within rank_error * count of q * count, with
+    99% probability. Range percentiles merge the sketches of the periods.
+
+    - **survey_id**: The ID of the survey.
+    - **q**: Quantiles to estimate; defaults to 0.5, 0.9 and 0.99.
+    - **from**: Optional first day of the range; the period containing it is
+      included.
+    - **to**: Optional last day of the range.
+    - **Returns**: Percentiles per score key over the range and per period.
+    """
+    logger.info(
+        f"Fetching percentiles for survey_id: {survey_id} "
+        f"from {from_date} to {to_date}"
+    )
+    _require_survey(survey_id)
+    aggregates = await _aggregates(survey_id)
+    result = _survey_percentiles(
+        survey_id, aggregates.stats, aggregates.rollups, q, from_date, to_date
+    )
+    return _model_response(result)
+
+
+@v1_router.get(
+    "/teams/{team_id}/assessments",
+    response_model=List[AssessmentResultBase],
+    summary="List Team Assessments",
+    tags=["Teams"],
+)
+async def list_team_assessments(
+    team_id: str,
+    since_id: Annotated[
+        int, Query(ge=0, description="Only list assessments with a higher ID")
+    ] = 0,
+    limit: Annotated[
+        int, Query(ge=1, le=MAX_BATCH_SIZE, description="Most assessments listed")
+    ] = 100,
+) -> Union[List[AssessmentResultBase], Response]:
+    """
+    List a team's assessments in ID order, a page at a time.
+
+    Only the team's partition is read, so the cost does not grow with the
+    number of teams. To get the next page, pass the last received ID as
+    since_id.
+
+    - **team_id**: The ID of the team.
+    - **since_id**: The ID after which to start listing.
+    - **limit**: The page size, up to MAX_BATCH_SIZE.
+    - **Returns**: The team's assessments; an empty list past the last one,
+      and 404 for a team without any.
+    """
+    logger.info(f"Listing assessments of team_id: {team_id} after id {since_id}")
+    await _require_team(team_id)
+    page = await _run_repository(
+        assessment_repository.list_team_after, team_id, since_id, limit
+    )
+    return _model_response(page)
+
+
+@v1_router.get(
+    "/teams/{team_id}/surveys/{survey_id}/stats",
+    response_model=SurveyStats,
+    summary="Get Team Survey Statistics",
+    tags=["Teams"],
+)
+async def get_team_survey_stats(
+    team_id: str, survey_id: int
+) -> Union[SurveyStats, Response]:
+    """
+    Retrieve running statistics of a team's assessments for a survey.
+
+    - **team_id**: The ID of the team.
+    - **survey_id**: The ID of the survey.
+    - **Returns**: As for the survey statistics, over the team's assessments.
+    """
+    logger.info(f"Fetching statistics for team_id: {team_id}, survey_id: {survey_id}")
+    _require_survey(survey_id)
+    await _require_team(team_id)
+    aggregates = await _aggregates(survey_id, team_id)
+    return _model_response(_survey_stats(survey_id, aggregates.stats))
+
+
+@v1_router.get(
+    "/teams/{team_id}/surveys/{survey_id}/trend",
+    response_model=SurveyTrend,
+    summary="Get Team Survey Trend",
+    tags=["Teams"],
+)
+async def get_team_survey_trend(
+    team_id: str,
+    survey_id: int,
+    from_date: FromDate = None,
+    to_date: ToDate = None,
+) -> Union[SurveyTrend, Response]:
+    """
+    Retrieve per-period aggregates of a team's assessments for a survey.
+
+    - **team_id**: The ID of the team.
+    - **survey_id**: The ID of the survey.
+    - **from**: Optional first day of the range.
+    - **to**: Optional last day of the range.
+    - **Returns**: As for the survey trend, over the team's assessments.
+    """
+    logger.info(
+        f"Fetching trend for team_id: {team_id}, survey_id: {survey_id} "
+        f"from {from_date} to {to_date}"
+    )
+    _require_survey(survey_id)
+    await _require_team(team_id)
+    _check_range(from_date, to_date)
+    aggregates = await _aggregates(survey_id, team_id)
+    trend = _survey_trend(survey_id, aggregates.rollups, from_date, to_date)
+    return _model_response(trend)
+
+
+@v1_router.get(
+    "/teams/{team_id}/surveys/{survey_id}/percentiles",
+    response_model=SurveyPercentiles,
+    summary="Get Team Survey Percentiles",
+    tags=["Teams"],
+)
+async def get_team_survey_percentiles(
+    team_id: str,
+    survey_id: int,
+    q: Quantiles = None,
+    from_date: FromDate = None,
+    to_date: ToDate = None,
+) -> Union[SurveyPercentiles, Response]:
+    """
+    Retrieve estimated percentiles of a team's scores for a survey.
+
+    - **team_id**: The ID of the team.
+    - **survey_id**: The ID of the survey.
+    - **q**: Quantiles to estimate; defaults to 0.5, 0.9 and 0.99.
+    - **from**: Optional first day of the range.
+    - **to**: Optional last day of the range.
+    - **Returns**: As for the survey percentiles, over the team's assessments.
+    """
+    logger.info(
+        f"Fetching percentiles for team_id: {team_id}, survey_id: {survey_id} "
+        f"from {from_date} to {to_date}"
+    )
+    _require_survey(survey_id)
+    await _require_team(team_id)
+    aggregates = await _aggregates(survey_id, team_id)
+    result = _survey_percentiles(
+        survey_id, aggregates.stats, aggregates.rollups, q, from_date, to_date
     )
-    saved_assessment = assessment_repository.save(assessment)
-    logger.info(f"Assessment {saved_assessment.id} saved successfully.")
-    return saved_assessment
+    return _model_response(result)
 
 
 @v1_router.get(
@@ -252,7 +1085,9 @@ async def submit_survey_response(
     summary="Get Score Interpretation",
     tags=["Surveys"],
 )
-async def get_score_interpretation(survey_id: int, score: float) -> Dict[str, str]:
+async def get_score_interpretation(
+    survey_id: int, score: float
+) -> Union[Dict[str, str], Response]:
     """
     Retrieve the interpretation for a given score of a specific survey.
 
@@ -266,14 +1101,213 @@ async def get_score_interpretation(survey_id: int, score: float) -> Dict[str, st
         logger.error(f"Survey with ID {survey_id} not found.")
         raise HTTPException(status_code=404, detail="Survey not found")
 
-    if hasattr(survey, "get_interpretation"):
-        interpretation = survey.get_interpretation(score)
-        return {"interpretation": interpretation}
-    else:
+    table = survey.interpretation_table
+    if table is None:
+        logger.warning(
+            f"Survey with ID {survey_id} does not have an interpretation table."
+        )
+        return _model_response({"interpretation": INTERPRETATION_NOT_AVAILABLE})
+    return _model_response({"interpretation": table.resolve(score)})
+
+
+@v1_router.post(
+    "/surveys/{survey_id}/interpretations",
+    response_model=InterpretationBatch,
+    summary="Get Score Interpretations in Batch",
+    tags=["Surveys"],
+)
+async def get_score_interpretations(
+    survey_id: int, request: InterpretationRequest
+) -> Union[InterpretationBatch, Response]:
+    """
+    Retrieve the interpretations of many scores of a specific survey at once.
+
+    - **survey_id**: The ID of the survey.
+    - **scores**: Up to MAX_BATCH_SIZE scores to interpret.
+    - **Returns**: The interpretation of each score, in request order.
+    """
+    logger.info(
+        f"Fetching {len(request.scores)} interpretations for survey_id: {survey_id}"
+    )
+    survey = survey_registry.get_survey(survey_id)
+    if not survey:
+        logger.error(f"Survey with ID {survey_id} not found.")
+        raise HTTPException(status_code=404, detail="Survey not found")
+
+    table = survey.interpretation_table
+    if table is None:
         logger.warning(
-            f"Survey with ID {survey_id} does not have an interpretation method."
+            f"Survey with ID {survey_id} does not have an interpretation table."
+        )
+        return _model_response(
+            InterpretationBatch(
+                interpretations=[INTERPRETATION_NOT_AVAILABLE] * len(request.scores)
+            )
+        )
+    return _model_response(
+        InterpretationBatch(interpretations=table.resolve_many(request.scores))
+    )
+
+
+@app.post(
+    "/admin/surveys:reload",
+    response_model=List[SurveySummary],
+    summary="Reload Survey Definitions",
+    tags=["Admin"],
+)
+async def reload_survey_definitions(
+    admin_token: Annotated[
+        Optional[str],
+        Header(alias="X-Admin-Token", description="The configured ADMIN_TOKEN"),
+    ] = None,
+) -> Response:
+    """
+    Rebuild the survey registry from the built-in surveys and the definition
+    files in SURVEY_DEFINITIONS_DIR, and swap it in atomically. Requests in
+    progress finish with the registry they started with. An invalid
+    definition is reported with a 422 error and leaves the registry as it was.
+
+    - **X-Admin-Token**: The configured admin token.
+    - **Returns**: The reloaded survey catalog.
+    """
+    if settings.admin_token is None:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if admin_token is None or not hmac.compare_digest(
+        admin_token.encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    if not settings.survey_definitions_dir:
+        raise HTTPException(
+            status_code=409, detail="No survey definitions directory is configured"
+        )
+    try:
+        snapshot = await run_in_threadpool(_reload_surveys)
+    except SurveyDefinitionException as exc:
+        logger.error("Survey definitions not reloaded: %s", exc.message)
+        raise HTTPException(status_code=422, detail=exc.message) from exc
+    payload = snapshot.catalog_payload()
+    return Response(
+        content=payload.body,
+        media_type="application/json",
+        headers={"ETag": payload.etag},
+    )
+
+
+@v1_router.get(
+    "/assessments/export",
+    summary="Export Assessments",
+    tags=["Assessments"],
+    response_class=StreamingResponse,
+)
+async def export_assessments(
+    export_format: Annotated[
+        Literal["ndjson", "csv"],
+        Query(alias="format", description="Output format: ndjson or csv"),
+    ] = "ndjson",
+    since_id: Annotated[
+        int, Query(ge=0, description="Only export assessments with a higher ID")
+    ] = 0,
+) -> StreamingResponse:
+    """
+    Stream all stored assessments in ID order.
+
+    Rows are read page by page with a keyset cursor and written as they are
+    produced, so memory use does not grow with the number of assessments and
+    a slow client simply slows down reading. To resume an interrupted export,
+    pass the last received ID as since_id.
+
+    - **format**: ndjson (one assessment per line) or csv (one score per row).
+    - **since_id**: The ID after which to start exporting.
+    - **Returns**: The streamed assessments.
+    """
+    logger.info(f"Exporting assessments as {export_format} after id {since_id}")
+    pages = assessment_repository.iter_assessments(after_id=since_id)
+    chunks = csv_chunks(pages) if export_format == "csv" else ndjson_chunks(pages)
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[export_format])
+
+
+# Declared after the export route, which the {assessment_id} path would shadow
+@v1_router.get(
+    "/assessments/{assessment_id}",
+    response_model=AssessmentResultBase,
+    summary="Get Assessment",
+    tags=["Assessments"],
+)
+async def get_assessment(assessment_id: int) -> Response:
+    """
+    Retrieve a saved assessment by its ID.
+
+    Recently saved and recently read assessments are served from an
+    in-memory cache of their serialized form.
+
+    - **assessment_id**: The ID returned when the response was submitted.
+    - **Returns**: The assessment.
+    """
+    body = assessment_cache.get(assessment_id)
+    if body is None:
+        assessment = await _run_repository(assessment_repository.get, assessment_id)
+        if assessment is None:
+            raise HTTPException(status_code=404, detail="Assessment not found")
+        body = serialize_assessment(assessment)
+        assessment_cache.put(assessment_id, body)
+    return Response(content=body, media_type="application/json")
+
+
+@v1_router.get(
+    "/assessments",
+    response_model=AssessmentBatch,
+    summary="Get Assessments",
+    tags=["Assessments"],
+)
+async def get_assessments(
+    ids: Annotated[
+        List[str],
+        Query(description="Assessment IDs, comma-separated or repeated"),
+    ],
+) -> Response:
+    """
+    Retrieve many saved assessments by ID in one request.
+
+    Cached assessments are served from memory; the rest are read from the
+    repository in one lookup and cached.
+
+    - **ids**: Up to MAX_BATCH_SIZE assessment IDs, e.g. ids=1,2,3 or
+      ids=1&ids=2.
+    - **Returns**: The assessments found, in request order, and the IDs that
+      were not found.
+    """
+    try:
+        requested = [int(i) for value in ids for i in value.split(",") if i.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Assessment IDs must be integers"
+        ) from None
+    if len(requested) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BATCH_SIZE} assessments can be fetched at once.",
         )
-        return {"interpretation": "Interpretation not available for this survey."}
+    bodies = assessment_cache.get_many(requested)
+    unknown = [i for i in dict.fromkeys(requested) if i not in bodies]
+    if unknown:
+        stored = await _run_repository(assessment_repository.get_many, unknown)
+        for assessment_id, assessment in stored.items():
+            body = serialize_assessment(assessment)
+            assessment_cache.put(assessment_id, body)
+            bodies[assessment_id] = body
+    found = [bodies[i] for i in requested if i in bodies]
+    missing = [i for i in requested if i not in bodies]
+    # The cached bodies are spliced in as they are, without re-serializing
+    content = b"".join(
+        [
+            b'{"assessments":[',
+            b",".join(found),
+            b'],"missing":',
+            json.dumps(missing).encode(),
+            b"}",
+        ]
+    )
+    return Response(content=content, media_type="application/json")
 
 
 # Include the v1 router
@@ -0,0 +1,278 @@
+# app/metrics.py
+
+import math
+import time
+from bisect import bisect_left
+from types import TracebackType
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels.
+
+    Updates are plain integer increments without a lock: the metrics are
+    recorded from the event loop thread, and a rare lost increment from a
+    worker thread is an acceptable trade for keeping recording cheap.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        values = self._values
+        values[labels] = values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}"
+            for labels, v in sorted(self._values.items())
+        ]
+
+
+class Gauge:
+    """Value read from a callback when the metrics are rendered."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, read: Callable[[], float]) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames: Tuple[str, ...] = ()
+        self.read = read
+
+    def render(self) -> List[str]:
+        return [f"{self.name} {_format_value(self.read())}"]
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, buckets: int) -> None:
+        # One slot per bucket plus the implicit +Inf bucket
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+
+
+class Histogram:
+    """
+    Histogram with fixed bucket bounds. Observing a value is a binary search
+    and two additions; cumulative bucket counts are only built when rendered.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _HistogramSeries(len(self.buckets))
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series.counts) if series else 0
+
+    def time(self, *labels: str) -> "Timer":
+        return Timer(self, labels)
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            bounds = self.buckets + (math.inf,)
+            for bound, count in zip(bounds, series.counts):
+                cumulative += count
+                le = _format_labels(
+                    self.labelnames + ("le",), labels + (_format_value(bound),)
+                )
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(series.sum)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Timer:
+    """Context manager observing its elapsed time into a histogram."""
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: LabelValues) -> None:
+        self.histogram = histogram
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+class MetricsRegistry:
+    """In-process registry of metrics, rendered in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Union[Counter, Gauge, Histogram]] = {}
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics[name] = metric
+        return metric
+
+    def gauge(self, name: str, help: str, read: Callable[[], float]) -> Gauge:
+        metric = Gauge(name, help, read)
+        self._metrics[name] = metric
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics[name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+REQUESTS = metrics.counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+)
+REQUEST_LATENCY = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds.",
+    ("method", "route"),
+)
+SUBMISSION_STAGES = metrics.histogram(
+    "submission_stage_duration_seconds",
+    "Time spent in each stage of a survey response submission.",
+    ("stage",),
+)
+ERRORS = metrics.counter(
+    "errors_total", "Errors returned to clients, by exception type.", ("type",)
+)
+ASSESSMENT_LOOKUPS = metrics.counter(
+    "assessment_lookups_total",
+    "Assessment lookups by the tier that served them: hot, cold or miss.",
+    ("tier",),
+)
+ASSESSMENT_EVICTIONS = metrics.counter(
+    "assessment_evictions_total",
+    "Assessments evicted from memory, by reason: capacity or ttl.",
+    ("reason",),
+)
+
+# Key under which the middleware stores the request start time in scope state
+REQUEST_START = "metrics_request_start"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and latency per route template,
+    so that path parameters do not multiply the number of series.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        scope.setdefault("state", {})[REQUEST_START] = start
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            REQUEST_LATENCY.observe(time.perf_counter() - start, method, template)
+            REQUESTS.inc(method, template, str(status))
@@ -1,11 +1,12 @@
 # app/models.py
 
-from typing import List, Dict, TYPE_CHECKING
+from typing import List, Dict, Optional, TYPE_CHECKING
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 
 if TYPE_CHECKING:
+    from .interpretation import InterpretationTable
     from .scoring import ScoringMechanism
 
 
@@ -40,6 +41,8 @@ class SurveyBase:
         name (str): Name of the survey.
         survey_type (SurveyType): Type of the survey (e.g., weekly, monthly).
         questions (List[QuestionBase]): List of questions included in the survey.
+        interpretation_table (Optional[InterpretationTable]): Score bands used to
+            interpret results, if the survey defines any.
     """
 
     def __init__(
@@ -49,12 +52,19 @@ class SurveyBase:
         survey_type: SurveyType,
         questions: List[QuestionBase],
         scoring_mechanism: "ScoringMechanism",
+        interpretation_table: Optional["InterpretationTable"] = None,
     ):
         self.id = id
         self.name = name
         self.survey_type = survey_type
         self.questions = questions
         self.scoring_mechanism = scoring_mechanism
+        self.interpretation_table = interpretation_table
+
+    def get_interpretation(self, score: float) -> Optional[str]:
+        if self.interpretation_table is None:
+            return None
+        return self.interpretation_table.resolve(score)
 
 
 class SurveyModel(BaseModel):
@@ -91,12 +101,24 @@ class SurveySummary(BaseModel):
     survey_type: SurveyType = Field(..., description="Type of the survey")
 
 
+# Team IDs are short names or keys chosen by the client, safe in URL paths
+TEAM_ID_PATTERN = r"^[A-Za-z0-9_.-]{1,64}$"
+
+# Upper bound on the number of items accepted or returned in one batch request
+MAX_BATCH_SIZE: int = 1000
+
+
 class ResponseBase(BaseModel):
     survey_id: int = Field(..., description="ID of the survey being responded to")
     answers: List[AnswerBase] = Field(..., description="List of answers")
     timestamp: datetime = Field(
         ..., description="Timestamp of when the response was submitted"
     )
+    team_id: Optional[str] = Field(
+        default=None,
+        pattern=TEAM_ID_PATTERN,
+        description="ID of the responding team, for team-scoped queries",
+    )
 
 
 class AssessmentResultBase(BaseModel):
@@ -108,3 +130,206 @@ class AssessmentResultBase(BaseModel):
     timestamp: datetime = Field(
         ..., description="Timestamp of when the assessment was created"
     )
+    team_id: Optional[str] = Field(
+        default=None, pattern=TEAM_ID_PATTERN, description="ID of the assessed team"
+    )
+
+
+class BatchItemResult(BaseModel):
+    """
+    Outcome of a single response within a batch submission.
+
+    Attributes:
+        index (int): Position of the response in the submitted batch.
+        assessment (Optional[AssessmentResultBase]): The saved assessment, if accepted.
+        error (Optional[str]): The validation error, if rejected.
+    """
+
+    index: int = Field(..., description="Position of the response in the batch")
+    assessment: Optional[AssessmentResultBase] = Field(
+        None, description="The saved assessment if the response was accepted"
+    )
+    error: Optional[str] = Field(
+        None, description="The validation error if the response was rejected"
+    )
+
+
+class BatchSubmissionResult(BaseModel):
+    """
+    Pydantic model representing the outcome of a batch submission.
+
+    Attributes:
+        accepted (int): Number of responses that were scored and saved.
+        rejected (int): Number of responses that failed validation.
+        results (List[BatchItemResult]): Per-response outcomes, in submission order.
+    """
+
+    accepted: int = Field(..., description="Number of responses saved")
+    rejected: int = Field(..., description="Number of responses rejected")
+    results: List[BatchItemResult] = Field(
+        ..., description="Per-response outcomes in submission order"
+    )
+
+
+class ScoreStats(BaseModel):
+    """
+    Pydantic model representing running statistics of one score key.
+
+    Attributes:
+        count (int): Number of assessments contributing to the statistics.
+        mean (float): Mean score.
+        variance (float): Sample variance of the score.
+        stddev (float): Sample standard deviation of the score.
+        min (float): Lowest score.
+        max (float): Highest score.
+    """
+
+    count: int = Field(..., description="Number of scores")
+    mean: float = Field(..., description="Mean score")
+    variance: float = Field(..., description="Sample variance (n - 1)")
+    stddev: float = Field(..., description="Sample standard deviation")
+    min: float = Field(..., description="Lowest score")
+    max: float = Field(..., description="Highest score")
+
+
+class SurveyStats(BaseModel):
+    """
+    Pydantic model representing aggregate statistics of a survey's assessments.
+
+    Attributes:
+        survey_id (int): ID of the survey.
+        count (int): Number of stored assessments for the survey.
+        scores (Dict[str, ScoreStats]): Statistics per score key.
+    """
+
+    survey_id: int = Field(..., description="ID of the survey")
+    count: int = Field(..., description="Number of stored assessments")
+    scores: Dict[str, ScoreStats] = Field(..., description="Statistics per score key")
+
+
+class TrendBucket(BaseModel):
+    """
+    Pydantic model representing the aggregates of one survey period.
+
+    Attributes:
+        period_start (date): First day of the ISO week or calendar month.
+        count (int): Number of assessments in the period.
+        sums (Dict[str, float]): Sum of each score key.
+        means (Dict[str, float]): Mean of each score key.
+        distributions (Dict[str, Dict[float, int]]): Occurrences of each score
+            value per key.
+    """
+
+    period_start: date = Field(..., description="First day of the period")
+    count: int = Field(..., description="Number of assessments in the period")
+    sums: Dict[str, float] = Field(..., description="Sum of each score key")
+    means: Dict[str, float] = Field(..., description="Mean of each score key")
+    distributions: Dict[str, Dict[float, int]] = Field(
+        ..., description="Occurrences of each score value per key"
+    )
+
+
+class SurveyTrend(BaseModel):
+    """
+    Pydantic model representing a survey's per-period trend.
+
+    Attributes:
+        survey_id (int): ID of the survey.
+        survey_type (SurveyType): Cadence used for the periods.
+        buckets (List[TrendBucket]): Periods in chronological order.
+    """
+
+    survey_id: int = Field(..., description="ID of the survey")
+    survey_type: SurveyType = Field(..., description="Cadence of the periods")
+    buckets: List[TrendBucket] = Field(
+        ..., description="Periods in chronological order"
+    )
+
+
+class ScorePercentiles(BaseModel):
+    """
+    Pydantic model representing estimated percentiles of one score key.
+
+    Attributes:
+        count (int): Number of scores summarized.
+        percentiles (Dict[str, float]): Estimated score per percentile, keyed
+            like "p50" or "p99.9".
+    """
+
+    count: int = Field(..., description="Number of scores")
+    percentiles: Dict[str, float] = Field(
+        ..., description="Estimated score per percentile, e.g. p50"
+    )
+
+
+class PeriodPercentiles(BaseModel):
+    """
+    Pydantic model representing the percentiles of one survey period.
+
+    Attributes:
+        period_start (date): First day of the ISO week or calendar month.
+        scores (Dict[str, ScorePercentiles]): Percentiles per score key.
+    """
+
+    period_start: date = Field(..., description="First day of the period")
+    scores: Dict[str, ScorePercentiles] = Field(
+        ..., description="Percentiles per score key"
+    )
+
+
+class SurveyPercentiles(BaseModel):
+    """
+    Pydantic model representing estimated percentiles of a survey's scores.
+
+    Attributes:
+        survey_id (int): ID of the survey.
+        survey_type (SurveyType): Cadence used for the periods.
+        rank_error (float): Typical bound on the normalized rank error of the
+            estimates.
+        scores (Dict[str, ScorePercentiles]): Percentiles per score key over
+            the whole requested range.
+        periods (List[PeriodPercentiles]): Percentiles per period in
+            chronological order.
+    """
+
+    survey_id: int = Field(..., description="ID of the survey")
+    survey_type: SurveyType = Field(..., description="Cadence of the periods")
+    rank_error: float = Field(
+        ..., description="Normalized rank error bound (99% confidence)"
+    )
+    scores: Dict[str, ScorePercentiles] = Field(
+        ..., description="Percentiles per score key over the range"
+    )
+    periods: List[PeriodPercentiles] = Field(
+        ..., description="Percentiles per period in chronological order"
+    )
+
+
+class InterpretationRequest(BaseModel):
+    scores: List[float] = Field(
+        ..., max_length=MAX_BATCH_SIZE, description="Scores to interpret"
+    )
+
+
+class InterpretationBatch(BaseModel):
+    interpretations: List[str] = Field(
+        ..., description="Interpretation of each score, in request order"
+    )
+
+
+class AssessmentBatch(BaseModel):
+    """
+    Pydantic model representing assessments fetched by ID.
+
+    Attributes:
+        assessments (List[AssessmentResultBase]): The assessments found, in
+            request order.
+        missing (List[int]): Requested IDs with no stored assessment.
+    """
+
+    assessments: List[AssessmentResultBase] = Field(
+        ..., description="The assessments found, in request order"
+    )
+    missing: List[int] = Field(
+        ..., description="Requested IDs with no stored assessment"
+    )
@@ -0,0 +1,49 @@
+# app/repositories/__init__.py
+
+from typing import Mapping, Optional
+from ..models import SurveyType
+from .base import Aggregates, AssessmentRepositoryBase, IdempotentRecord
+from .assessment_repository import AssessmentRepository, RetentionPolicy
+from .columnar_repository import ColumnarAssessmentRepository
+from .sqlite_repository import SQLiteAssessmentRepository
+from .id_allocator import IdAllocator, SequentialIdAllocator, SnowflakeIdAllocator
+
+__all__ = [
+    "Aggregates",
+    "AssessmentRepositoryBase",
+    "IdempotentRecord",
+    "AssessmentRepository",
+    "RetentionPolicy",
+    "ColumnarAssessmentRepository",
+    "SQLiteAssessmentRepository",
+    "IdAllocator",
+    "SequentialIdAllocator",
+    "SnowflakeIdAllocator",
+    "create_assessment_repository",
+]
+
+
+def create_assessment_repository(
+    db_path: Optional[str] = None,
+    pool_size: int = 4,
+    cadences: Optional[Mapping[int, SurveyType]] = None,
+    node_id: Optional[int] = None,
+    columnar: bool = False,
+    retention: Optional[RetentionPolicy] = None,
+) -> AssessmentRepositoryBase:
+    """
+    Build the configured repository: SQLite when a database path is given,
+    otherwise the in-memory store, columnar when requested. Cadences map
+    survey IDs to the survey type used to bucket their rollups, and node_id
+    fixes the node part of the snowflake IDs (leased in the database, or
+    derived from the host and process, when not given). The retention
+    policy bounds the dict store.
+    """
+    id_allocator = SnowflakeIdAllocator(node_id)
+    if db_path:
+        return SQLiteAssessmentRepository(
+            db_path, pool_size=pool_size, cadences=cadences, id_allocator=id_allocator
+        )
+    if columnar:
+        return ColumnarAssessmentRepository(cadences, id_allocator)
+    return AssessmentRepository(cadences, id_allocator, retention)
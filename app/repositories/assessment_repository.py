@@ -1,19 +1,174 @@
 # app/repositories/assessment_repository.py
 
-from typing import Dict, Optional
-from ..models import AssessmentResultBase
+import heapq
+import threading
+import time
+from bisect import bisect_right, insort
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Dict, List, Mapping, Optional, Tuple
+from ..metrics import ASSESSMENT_EVICTIONS, ASSESSMENT_LOOKUPS
+from ..models import AssessmentResultBase, SurveyType
+from .base import AssessmentRepositoryBase
+from .id_allocator import IdAllocator
+from .segment_store import SegmentStore
 
 
-class AssessmentRepository:
-    def __init__(self) -> None:
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    Limits on the assessments held in memory.
+
+    Attributes:
+        max_records (Optional[int]): Most assessments kept in memory. When
+            exceeded, the oldest IDs are evicted down to 90% of the limit, so
+            that eviction runs once per batch of saves rather than per save.
+        ttl_seconds (Optional[float]): Assessments whose timestamp is older
+            than this are evicted. Checked at most once per sweep_interval.
+        spill_dir (Optional[str]): Directory for the on-disk segments evicted
+            assessments spill to. Evicted assessments are dropped when unset.
+        sweep_interval (float): Seconds between TTL sweeps.
+    """
+
+    max_records: Optional[int] = None
+    ttl_seconds: Optional[float] = None
+    spill_dir: Optional[str] = None
+    sweep_interval: float = 1.0
+
+
+class AssessmentRepository(AssessmentRepositoryBase):
+    """
+    In-process assessment store backed by a dict. Contents are lost on restart.
+
+    With a retention policy, assessments beyond the record limit or older
+    than the TTL are evicted from the dict and, when a spill directory is
+    set, appended to on-disk segments that get, list_after and count still
+    read through. Lookups are counted by the tier that served them. The
+    running statistics and rollups keep covering evicted assessments.
+    """
+
+    def __init__(
+        self,
+        cadences: Optional[Mapping[int, SurveyType]] = None,
+        id_allocator: Optional[IdAllocator] = None,
+        retention: Optional[RetentionPolicy] = None,
+    ) -> None:
+        super().__init__(cadences, id_allocator)
         self.assessments: Dict[int, AssessmentResultBase] = {}
-        self.next_id: int = 1
+        # IDs in ascending order, for keyset pagination
+        self._ids: List[int] = []
+        self.retention = retention or RetentionPolicy()
+        self.cold: Optional[SegmentStore] = None
+        if self.retention.spill_dir:
+            self.cold = SegmentStore(self.retention.spill_dir)
+            # Cold reads hit the disk, so async callers must use a thread
+            self.blocking = True
+        # (epoch seconds, ID) of held assessments, oldest first, for the TTL
+        self._expiry: List[Tuple[float, int]] = []
+        self._next_sweep = 0.0
+        # Distinct IDs held in memory or spilled
+        self._count = 0
+        self._lock = threading.RLock()
+
+    def _insert_many(
+        self, assessments: List[AssessmentResultBase]
+    ) -> List[AssessmentResultBase]:
+        new = []
+        with self._lock:
+            ids = self._ids
+            track_expiry = self.retention.ttl_seconds is not None
+            for assessment in assessments:
+                assessment_id = assessment.id
+                if assessment_id not in self.assessments:
+                    # An assessment saved again after being spilled is
+                    # already counted
+                    if self.cold is None or assessment_id not in self.cold:
+                        self._count += 1
+                        new.append(assessment)
+                    # IDs usually arrive in ascending order; IDs minted
+                    # elsewhere earlier, but saved late, are inserted in place
+                    if not ids or assessment_id > ids[-1]:
+                        ids.append(assessment_id)
+                    else:
+                        insort(ids, assessment_id)
+                self.assessments[assessment_id] = assessment
+                if track_expiry:
+                    heapq.heappush(
+                        self._expiry, (_epoch_seconds(assessment), assessment_id)
+                    )
+            self._enforce_retention()
+        return new
 
-    def save(self, assessment: AssessmentResultBase) -> AssessmentResultBase:
-        assessment.id = self.next_id
-        self.assessments[self.next_id] = assessment
-        self.next_id += 1
-        return assessment
+    def _enforce_retention(self) -> None:
+        retention = self.retention
+        if retention.ttl_seconds is not None:
+            now = time.time()
+            if now >= self._next_sweep:
+                self._next_sweep = now + retention.sweep_interval
+                self._evict_expired(now - retention.ttl_seconds)
+        max_records = retention.max_records
+        if max_records is not None and len(self._ids) > max_records:
+            keep = max_records - max_records // 10
+            excess = len(self._ids) - keep
+            self._evict(self._ids[:excess], "capacity")
+            del self._ids[:excess]
+
+    def _evict_expired(self, cutoff: float) -> None:
+        expired = set()
+        while self._expiry and self._expiry[0][0] < cutoff:
+            _, assessment_id = heapq.heappop(self._expiry)
+            # Entries of assessments already evicted for capacity are stale
+            if assessment_id in self.assessments:
+                expired.add(assessment_id)
+        if expired:
+            self._evict(sorted(expired), "ttl")
+            self._ids = [i for i in self._ids if i not in expired]
+
+    def _evict(self, assessment_ids: List[int], reason: str) -> None:
+        """Remove assessments from memory, spilling them to the cold tier."""
+        evicted = [self.assessments.pop(i) for i in assessment_ids]
+        if self.cold is not None:
+            self.cold.spill(evicted)
+        else:
+            self._count -= len(evicted)
+            self._removed(assessment_ids)
+        ASSESSMENT_EVICTIONS.inc(reason, amount=len(evicted))
 
     def get(self, assessment_id: int) -> Optional[AssessmentResultBase]:
-        return self.assessments.get(assessment_id)
+        assessment = self.assessments.get(assessment_id)
+        if assessment is not None:
+            ASSESSMENT_LOOKUPS.inc("hot")
+            return assessment
+        if self.cold is not None:
+            assessment = self.cold.get(assessment_id)
+            if assessment is not None:
+                ASSESSMENT_LOOKUPS.inc("cold")
+                return assessment
+        ASSESSMENT_LOOKUPS.inc("miss")
+        return None
+
+    def list_after(self, after_id: int, limit: int) -> List[AssessmentResultBase]:
+        with self._lock:
+            start = bisect_right(self._ids, after_id)
+            end = start + limit
+            page = [self.assessments[i] for i in self._ids[start:end]]
+        if self.cold is not None:
+            # The hot copy of an assessment saved again after eviction wins
+            merged = {a.id: a for a in self.cold.list_after(after_id, limit)}
+            merged.update((a.id, a) for a in page)
+            page = [merged[i] for i in sorted(merged)[:limit]]
+        return page
+
+    def count(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        if self.cold is not None:
+            self.cold.close()
+
+
+def _epoch_seconds(assessment: AssessmentResultBase) -> float:
+    timestamp = assessment.timestamp
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
@@ -0,0 +1,271 @@
+# app/repositories/base.py
+
+import threading
+from abc import ABC, abstractmethod
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+)
+from ..aggregates import SurveyStatistics
+from ..models import AssessmentResultBase, SurveyType
+from ..rollups import RollupIndex
+from ..teams import TeamIndex
+from .id_allocator import IdAllocator, SnowflakeIdAllocator
+
+
+class IdempotentRecord(NamedTuple):
+    """
+    An assessment saved under an idempotency key, with the fingerprint of the
+    request that created it. replayed is True when the assessment was already
+    stored under the key rather than saved by this call.
+    """
+
+    fingerprint: str
+    assessment: AssessmentResultBase
+    replayed: bool
+
+
+class Aggregates(NamedTuple):
+    """
+    Running statistics and per-period rollups of a set of assessments: all
+    of them, or one team's.
+    """
+
+    stats: SurveyStatistics
+    rollups: RollupIndex
+
+
+SaveListener = Callable[[List[AssessmentResultBase]], None]
+RemovalListener = Callable[[List[int]], None]
+
+
+class AssessmentRepositoryBase(ABC):
+    """
+    Interface implemented by every assessment storage backend.
+
+    Saving goes through save_many, which gives every assessment without an ID
+    one from the ID allocator, stores the batch with the backend's
+    _insert_many and then folds it into the running per-survey statistics,
+    the time-bucketed rollups and the partition of each assessment's team.
+
+    Attributes:
+        blocking (bool): True when calls perform blocking I/O and must be run
+            off the event loop by async callers.
+        durable (bool): True when saved assessments, and the idempotency
+            keys they were saved under, survive a restart and are shared by
+            every worker using the same storage.
+        stats (SurveyStatistics): Running aggregates of every saved assessment,
+            kept in memory; read them through aggregates.
+        rollups (RollupIndex): Per-period aggregates, bucketed by survey
+            cadence, which it also holds for backends keeping them elsewhere.
+        teams (TeamIndex): Per-team assessment IDs, statistics and rollups.
+        id_allocator (IdAllocator): Source of new assessment IDs; time-ordered
+            snowflake IDs unless another allocator is given.
+    """
+
+    blocking: bool = False
+    durable: bool = False
+
+    def __init__(
+        self,
+        cadences: Optional[Mapping[int, SurveyType]] = None,
+        id_allocator: Optional[IdAllocator] = None,
+    ) -> None:
+        self.id_allocator = id_allocator or SnowflakeIdAllocator()
+        self.stats = SurveyStatistics()
+        self.rollups = RollupIndex(cadences)
+        self.teams = TeamIndex(self.rollups)
+        self._index_lock = threading.Lock()
+        self._save_listeners: List[SaveListener] = []
+        self._removal_listeners: List[RemovalListener] = []
+
+    def add_save_listener(self, listener: "SaveListener") -> None:
+        """
+        Call listener with every batch of assessments once it is saved, from
+        whichever thread saved it.
+        """
+        self._save_listeners.append(listener)
+
+    def add_removal_listener(self, listener: "RemovalListener") -> None:
+        """
+        Call listener with the IDs of assessments the backend stops storing,
+        e.g. when a retention policy evicts them with nowhere to spill them,
+        from whichever thread removed them.
+        """
+        self._removal_listeners.append(listener)
+
+    def _removed(self, assessment_ids: List[int]) -> None:
+        for listener in self._removal_listeners:
+            listener(assessment_ids)
+
+    def save(self, assessment: AssessmentResultBase) -> AssessmentResultBase:
+        return self.save_many([assessment])[0]
+
+    def save_many(
+        self, assessments: List[AssessmentResultBase]
+    ) -> List[AssessmentResultBase]:
+        """
+        Save a batch of assessments in a single operation. Assessments with an
+        ID of 0 are assigned one; IDs that are already set are kept. Saving an
+        ID that is already stored replaces the stored assessment, while the
+        statistics and rollups keep counting it once, as first saved.
+        """
+        self.assign_ids(assessments)
+        new = self._insert_many(assessments)
+        self._index(assessments, new)
+        return assessments
+
+    def assign_ids(self, assessments: List[AssessmentResultBase]) -> None:
+        unassigned = [a for a in assessments if a.id == 0]
+        if unassigned:
+            new_ids = self.id_allocator.allocate(len(unassigned))
+            for assessment, assessment_id in zip(unassigned, new_ids):
+                assessment.id = assessment_id
+
+    def save_idempotent(
+        self,
+        assessment: AssessmentResultBase,
+        key: str,
+        fingerprint: str,
+        expires_at: float,
+    ) -> IdempotentRecord:
+        """
+        Save an assessment together with the idempotency key it was submitted
+        under, until expires_at (epoch seconds). Durable backends store the key
+        in the same transaction and, if another worker stored it first, return
+        that worker's record instead; others only save the assessment.
+        """
+        return IdempotentRecord(fingerprint, self.save(assessment), False)
+
+    def find_idempotent(self, key: str) -> Optional[IdempotentRecord]:
+        """Return the unexpired record saved under an idempotency key, if any."""
+        return None
+
+    def _index(
+        self, saved: List[AssessmentResultBase], new: List[AssessmentResultBase]
+    ) -> None:
+        self._aggregate(saved, new)
+        for listener in self._save_listeners:
+            listener(saved)
+
+    def _aggregate(
+        self, saved: List[AssessmentResultBase], new: List[AssessmentResultBase]
+    ) -> None:
+        """
+        Fold saved assessments into the in-memory aggregates. Only the new
+        ones, which were not stored before, are counted; the others are only
+        indexed under their team.
+        """
+        new_ids = None if len(new) == len(saved) else {a.id for a in new}
+        with self._index_lock:
+            for assessment in new:
+                self.stats.add(assessment)
+                self.rollups.add(assessment)
+            for assessment in saved:
+                counted = new_ids is None or assessment.id in new_ids
+                self.teams.add(assessment, counted)
+
+    def aggregates(self, survey_id: int, team_id: Optional[str] = None) -> Aggregates:
+        """
+        Statistics and rollups of a survey's assessments, or of one team's
+        when team_id is given; empty for a team without any. Backends shared
+        by several workers read them from the shared storage, so that every
+        worker sees every worker's assessments.
+        """
+        if team_id is None:
+            return Aggregates(self.stats, self.rollups)
+        partition = self.teams.get(team_id)
+        if partition is None:
+            return Aggregates(SurveyStatistics(), self.rollups.partition())
+        return Aggregates(partition.stats, partition.rollups)
+
+    def has_team(self, team_id: str) -> bool:
+        """Whether any assessment was saved for the team."""
+        return self.teams.get(team_id) is not None
+
+    def team_count(self) -> int:
+        return len(self.teams)
+
+    @abstractmethod
+    def _insert_many(
+        self, assessments: List[AssessmentResultBase]
+    ) -> List[AssessmentResultBase]:
+        """
+        Persist a batch of assessments, which all have their IDs set, and
+        return those whose ID was not stored before.
+        """
+
+    @abstractmethod
+    def get(self, assessment_id: int) -> Optional[AssessmentResultBase]:
+        pass
+
+    def get_many(
+        self, assessment_ids: Iterable[int]
+    ) -> Dict[int, AssessmentResultBase]:
+        """Return the stored assessments among the given IDs, by ID."""
+        found = {}
+        for assessment_id in assessment_ids:
+            assessment = self.get(assessment_id)
+            if assessment is not None:
+                found[assessment_id] = assessment
+        return found
+
+    @abstractmethod
+    def list_after(self, after_id: int, limit: int) -> List[AssessmentResultBase]:
+        """Return up to limit assessments with an ID above after_id, in ID order."""
+
+    def list_team_after(
+        self, team_id: str, after_id: int, limit: int
+    ) -> List[AssessmentResultBase]:
+        """
+        Return up to limit assessments of a team with an ID above after_id, in
+        ID order. Only the team's partition is read, whatever the number of
+        teams.
+        """
+        partition = self.teams.get(team_id)
+        if partition is None:
+            return []
+        page: List[AssessmentResultBase] = []
+        while len(page) < limit:
+            ids = partition.ids_after(after_id, limit - len(page))
+            if not ids:
+                break
+            found = self.get_many(ids)
+            for assessment_id in ids:
+                assessment = found.get(assessment_id)
+                # Evicted assessments are skipped, as are ones saved again
+                # under another team
+                if assessment is not None and assessment.team_id == team_id:
+                    page.append(assessment)
+            after_id = ids[-1]
+        return page
+
+    def iter_assessments(
+        self, after_id: int = 0, page_size: int = 1000
+    ) -> Iterator[List[AssessmentResultBase]]:
+        """
+        Yield pages of assessments in ID order, starting after after_id.
+
+        Pages are fetched lazily with a keyset cursor, so memory stays bounded
+        by the page size however many assessments are stored.
+        """
+        while True:
+            page = self.list_after(after_id, page_size)
+            if not page:
+                return
+            yield page
+            after_id = page[-1].id
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+        return None
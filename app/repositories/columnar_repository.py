@@ -0,0 +1,182 @@
+# app/repositories/columnar_repository.py
+
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Mapping, Optional, Tuple
+import numpy as np
+from ..models import AssessmentResultBase, SurveyType
+from .base import AssessmentRepositoryBase
+from .id_allocator import IdAllocator
+
+CHUNK_SIZE = 65_536
+NO_TEAM = -1
+UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _to_microseconds(timestamp: datetime) -> int:
+    # Naive timestamps are taken as UTC, as the rollups do
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (timestamp - UNIX_EPOCH) // timedelta(microseconds=1)
+
+
+class _Chunk:
+    """A fixed-capacity block of rows, one typed array per column."""
+
+    __slots__ = ("ids", "survey_ids", "team_codes", "timestamps", "scores", "size")
+
+    def __init__(self) -> None:
+        self.ids = np.empty(CHUNK_SIZE, dtype=np.int64)
+        self.survey_ids = np.empty(CHUNK_SIZE, dtype=np.int32)
+        # Index into the repository's team IDs; NO_TEAM when unset
+        self.team_codes = np.empty(CHUNK_SIZE, dtype=np.int32)
+        # Microseconds since the Unix epoch, UTC
+        self.timestamps = np.empty(CHUNK_SIZE, dtype=np.int64)
+        # One column per score key seen in this chunk; NaN where absent
+        self.scores: Dict[str, np.ndarray] = {}
+        self.size = 0
+
+    def score_column(self, key: str) -> np.ndarray:
+        column = self.scores.get(key)
+        if column is None:
+            column = self.scores[key] = np.full(CHUNK_SIZE, np.nan)
+        return column
+
+
+class ColumnarAssessmentRepository(AssessmentRepositoryBase):
+    """
+    In-process assessment store that keeps each field in typed NumPy columns
+    instead of one model object per assessment, taking a few dozen bytes per
+    record instead of several hundred. Contents are lost on restart.
+
+    Columns grow in chunks of CHUNK_SIZE rows, so appending never copies
+    existing data. Rows are appended in ID order and found by binary search;
+    models are only built when read. Timestamps are stored in UTC with
+    microsecond precision and read back as aware UTC datetimes. Team IDs are
+    stored as codes into a table of the distinct team IDs.
+
+    IDs saved out of order (minted earlier, saved later) are rare and kept as
+    models in a small overflow map, which reads merge in.
+    """
+
+    def __init__(
+        self,
+        cadences: Optional[Mapping[int, SurveyType]] = None,
+        id_allocator: Optional[IdAllocator] = None,
+    ) -> None:
+        super().__init__(cadences, id_allocator)
+        self._chunks: List[_Chunk] = []
+        # First ID of each chunk, to pick the chunk holding an ID
+        self._chunk_first_ids: List[int] = []
+        self._last_id = 0
+        self._rows = 0
+        self._overflow: Dict[int, AssessmentResultBase] = {}
+        self._team_ids: List[str] = []
+        self._team_codes: Dict[str, int] = {}
+
+    def _insert_many(
+        self, assessments: List[AssessmentResultBase]
+    ) -> List[AssessmentResultBase]:
+        new = []
+        for assessment in assessments:
+            if assessment.id > self._last_id:
+                self._append(assessment)
+                new.append(assessment)
+            else:
+                location = self._locate(assessment.id)
+                if location is None:
+                    if assessment.id not in self._overflow:
+                        new.append(assessment)
+                    self._overflow[assessment.id] = assessment
+                else:
+                    chunk, row = location
+                    self._write(chunk, row, assessment)
+                    for key, column in list(chunk.scores.items()):
+                        if key not in assessment.scores:
+                            column[row] = np.nan
+        return new
+
+    def _append(self, assessment: AssessmentResultBase) -> None:
+        if not self._chunks or self._chunks[-1].size == CHUNK_SIZE:
+            self._chunks.append(_Chunk())
+            self._chunk_first_ids.append(assessment.id)
+        chunk = self._chunks[-1]
+        # Readers (exports run in worker threads) see the row once it is
+        # complete, as they only read up to the size
+        self._write(chunk, chunk.size, assessment)
+        chunk.size += 1
+        self._last_id = assessment.id
+        self._rows += 1
+
+    def _team_code(self, team_id: Optional[str]) -> int:
+        if team_id is None:
+            return NO_TEAM
+        code = self._team_codes.get(team_id)
+        if code is None:
+            code = self._team_codes[team_id] = len(self._team_ids)
+            self._team_ids.append(team_id)
+        return code
+
+    def _write(self, chunk: _Chunk, row: int, assessment: AssessmentResultBase) -> None:
+        chunk.ids[row] = assessment.id
+        chunk.survey_ids[row] = assessment.survey_id
+        chunk.team_codes[row] = self._team_code(assessment.team_id)
+        chunk.timestamps[row] = _to_microseconds(assessment.timestamp)
+        for key, value in assessment.scores.items():
+            chunk.score_column(key)[row] = value
+
+    def _locate(self, assessment_id: int) -> Optional[Tuple[_Chunk, int]]:
+        chunk_index = bisect_right(self._chunk_first_ids, assessment_id) - 1
+        if chunk_index < 0:
+            return None
+        chunk = self._chunks[chunk_index]
+        size = chunk.size
+        row = int(np.searchsorted(chunk.ids[:size], assessment_id))
+        if row < size and chunk.ids[row] == assessment_id:
+            return chunk, row
+        return None
+
+    def _materialize(self, chunk: _Chunk, row: int) -> AssessmentResultBase:
+        scores = {}
+        # Copied, as a save may add a column meanwhile
+        for key, column in list(chunk.scores.items()):
+            value = column[row]
+            if not np.isnan(value):
+                scores[key] = float(value)
+        timestamp = UNIX_EPOCH + timedelta(microseconds=int(chunk.timestamps[row]))
+        team_code = int(chunk.team_codes[row])
+        # The values were validated when saved, so validation is skipped here
+        return AssessmentResultBase.model_construct(
+            id=int(chunk.ids[row]),
+            survey_id=int(chunk.survey_ids[row]),
+            scores=scores,
+            timestamp=timestamp,
+            team_id=self._team_ids[team_code] if team_code != NO_TEAM else None,
+        )
+
+    def get(self, assessment_id: int) -> Optional[AssessmentResultBase]:
+        location = self._locate(assessment_id)
+        if location is None:
+            return self._overflow.get(assessment_id)
+        return self._materialize(*location)
+
+    def list_after(self, after_id: int, limit: int) -> List[AssessmentResultBase]:
+        page: List[AssessmentResultBase] = []
+        chunk_index = max(0, bisect_right(self._chunk_first_ids, after_id) - 1)
+        for chunk in self._chunks[chunk_index:]:
+            size = chunk.size
+            row = int(np.searchsorted(chunk.ids[:size], after_id, "right"))
+            while row < size and len(page) < limit:
+                page.append(self._materialize(chunk, row))
+                row += 1
+            if len(page) == limit:
+                break
+        if self._overflow:
+            late = sorted(i for i in self._overflow if i > after_id)[:limit]
+            page.extend(self._overflow[i] for i in late)
+            page.sort(key=lambda assessment: assessment.id)
+            del page[limit:]
+        return page
+
+    def count(self) -> int:
+        return self._rows + len(self._overflow)
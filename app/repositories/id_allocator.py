@@ -0,0 +1,162 @@
+# app/repositories/id_allocator.py
+
+import logging
+import os
+import socket
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Custom epoch (2024-01-01T00:00:00Z) in milliseconds; 40 bits of
+# milliseconds from here last until 2058. The three parts add up to 53 bits,
+# so that IDs stay exact as JavaScript numbers.
+EPOCH_MS = 1_704_067_200_000
+TIMESTAMP_BITS = 40
+NODE_BITS = 8
+SEQUENCE_BITS = 5
+MAX_NODE_ID = (1 << NODE_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+
+class IdAllocator(ABC):
+    """Hands out unique, positive assessment IDs."""
+
+    @abstractmethod
+    def allocate(self, count: int = 1) -> List[int]:
+        """Return count new IDs in ascending order."""
+
+
+class SequentialIdAllocator(IdAllocator):
+    """
+    Consecutive IDs from a per-process counter. Only unique within a single
+    process, so it suits tests and single-worker deployments.
+    """
+
+    def __init__(self, start: int = 1) -> None:
+        self.next_id = start
+        self._lock = threading.Lock()
+
+    def allocate(self, count: int = 1) -> List[int]:
+        with self._lock:
+            first_id = self.next_id
+            self.next_id += count
+        return list(range(first_id, first_id + count))
+
+
+# Claims a node ID for this process, the given one if not None; see
+# SnowflakeIdAllocator.use_node_source
+NodeSource = Callable[[Optional[int]], int]
+
+
+def default_node_id() -> int:
+    """
+    Derive a node ID from the host name and process ID. This is a hash, not
+    a guarantee: processes collide with a probability that grows quickly
+    with their number (about even odds at 20). It is only meant for stores
+    that are not shared between processes, where a collision is harmless;
+    shared stores claim their node with use_node_source.
+    """
+    host_hash = zlib.crc32(socket.gethostname().encode())
+    return (host_hash + os.getpid()) & MAX_NODE_ID
+
+
+class SnowflakeIdAllocator(IdAllocator):
+    """
+    Time-ordered IDs that need no coordination between workers or nodes.
+
+    Each ID packs, from the most significant bit: 40 bits of milliseconds
+    since EPOCH_MS, an 8-bit node ID and a 5-bit per-millisecond sequence,
+    53 bits in all, so JSON clients that parse numbers as doubles, such as
+    JavaScript, read them exactly. IDs minted by one allocator strictly
+    increase, and IDs from different nodes are ordered by mint time to the
+    millisecond, which keeps them usable as a keyset cursor.
+
+    Up to 32 IDs are minted per millisecond per node; beyond that, e.g. for a
+    large batch, and when the clock steps backwards, the allocator keeps
+    counting on from its last timestamp instead of waiting for the clock.
+
+    Args:
+        node_id (Optional[int]): 0-255, unique per process across the
+            deployment. Derived with default_node_id when not given, and
+            re-derived in processes forked after construction, with a
+            warning when several workers may be deriving theirs. A node
+            source set with use_node_source takes over both.
+    """
+
+    def __init__(self, node_id: Optional[int] = None) -> None:
+        if node_id is not None and not 0 <= node_id <= MAX_NODE_ID:
+            raise ValueError(f"node_id must be between 0 and {MAX_NODE_ID}")
+        self._fixed_node_id = node_id
+        self._node_source: Optional[NodeSource] = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    @property
+    def fixed_node_id(self) -> Optional[int]:
+        return self._fixed_node_id
+
+    def use_node_source(self, source: NodeSource) -> None:
+        """
+        Take node IDs from source, which claims one guaranteed unique among
+        the processes sharing a store, e.g. a lease in a shared database. It
+        is called with the fixed node ID, if any, now and again in processes
+        forked later, and must raise if that node is taken.
+        """
+        with self._lock:
+            self._node_source = source
+            self._reset()
+
+    def _reset(self, forked: bool = False) -> None:
+        self._pid = os.getpid()
+        node_id = self._fixed_node_id
+        if self._node_source is not None:
+            self.node_id = self._node_source(node_id)
+        elif node_id is not None:
+            self.node_id = node_id
+        else:
+            self.node_id = default_node_id()
+            workers = int(os.environ.get("WEB_CONCURRENCY") or "1")
+            if forked or workers > 1:
+                logger.warning(
+                    "Node %d of the assessment IDs is derived from the host and "
+                    "process ID while several workers run, so their IDs may "
+                    "collide; set a distinct NODE_ID per worker, or "
+                    "ASSESSMENT_DB_PATH to lease one each",
+                    self.node_id,
+                )
+        self._last_ms = -1
+        self._sequence = 0
+
+    def allocate(self, count: int = 1) -> List[int]:
+        ids = []
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset(forked=True)
+            now_ms = int(time.time() * 1000) - EPOCH_MS
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = -1
+            node_bits = self.node_id << SEQUENCE_BITS
+            for _ in range(count):
+                self._sequence += 1
+                if self._sequence > MAX_SEQUENCE:
+                    self._last_ms += 1
+                    self._sequence = 0
+                ids.append(
+                    (self._last_ms << (NODE_BITS + SEQUENCE_BITS))
+                    | node_bits
+                    | self._sequence
+                )
+        return ids
+
+    @staticmethod
+    def decode(assessment_id: int) -> Tuple[int, int, int]:
+        """Split an ID into its Unix timestamp in ms, node ID and sequence."""
+        sequence = assessment_id & MAX_SEQUENCE
+        node_id = (assessment_id >> SEQUENCE_BITS) & MAX_NODE_ID
+        timestamp_ms = (assessment_id >> (NODE_BITS + SEQUENCE_BITS)) + EPOCH_MS
+        return timestamp_ms, node_id, sequence
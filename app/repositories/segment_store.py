@@ -0,0 +1,159 @@
+# app/repositories/segment_store.py
+
+import os
+import shutil
+import tempfile
+import threading
+from typing import BinaryIO, Dict, List, Optional
+import numpy as np
+from ..models import AssessmentResultBase
+
+SEGMENT_RECORDS = 100_000
+
+
+class _Segment:
+    """
+    One append-only NDJSON file and its index: the ID of every record and the
+    byte offset of its line, sorted by ID on first lookup after a write.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.ids = np.empty(0, dtype=np.int64)
+        self.offsets = np.empty(0, dtype=np.int64)
+        self._pending_ids: List[int] = []
+        self._pending_offsets: List[int] = []
+        self._reader: Optional[BinaryIO] = None
+
+    def __len__(self) -> int:
+        return len(self.ids) + len(self._pending_ids)
+
+    def add(self, assessment_id: int, offset: int) -> None:
+        self._pending_ids.append(assessment_id)
+        self._pending_offsets.append(offset)
+
+    def index(self) -> "_Segment":
+        if self._pending_ids:
+            ids = np.concatenate([self.ids, np.asarray(self._pending_ids, np.int64)])
+            offsets = np.concatenate(
+                [self.offsets, np.asarray(self._pending_offsets, np.int64)]
+            )
+            order = np.argsort(ids, kind="stable")
+            self.ids, self.offsets = ids[order], offsets[order]
+            self._pending_ids.clear()
+            self._pending_offsets.clear()
+        return self
+
+    def position(self, assessment_id: int) -> Optional[int]:
+        """Index of the latest record with this ID, if any."""
+        position = int(np.searchsorted(self.ids, assessment_id, "right")) - 1
+        if position >= 0 and self.ids[position] == assessment_id:
+            return position
+        return None
+
+    def read(self, offset: int) -> AssessmentResultBase:
+        if self._reader is None:
+            self._reader = open(self.path, "rb")
+        self._reader.seek(offset)
+        return AssessmentResultBase.model_validate_json(self._reader.readline())
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
+class SegmentStore:
+    """
+    Cold tier for assessments evicted from memory: records are appended as
+    JSON lines to segment files of up to SEGMENT_RECORDS records each, and
+    only their IDs and file offsets are kept in memory (16 bytes a record).
+    Records are parsed back from disk when read.
+
+    Segments live in a private directory created under the given one and
+    removed on close, since the in-memory store they back does not survive a
+    restart either.
+    """
+
+    def __init__(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix="assessments-", dir=directory)
+        self._segments: List[_Segment] = []
+        self._writer: Optional[BinaryIO] = None
+        self._max_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of records, counting an assessment spilled twice twice."""
+        return sum(len(segment) for segment in self._segments)
+
+    def __contains__(self, assessment_id: object) -> bool:
+        if not isinstance(assessment_id, int):
+            return False
+        with self._lock:
+            # Assessments are usually spilled oldest first, so most IDs
+            # checked are above every spilled one
+            if assessment_id > self._max_id:
+                return False
+            return any(
+                segment.index().position(assessment_id) is not None
+                for segment in self._segments
+            )
+
+    def spill(self, assessments: List[AssessmentResultBase]) -> None:
+        with self._lock:
+            for assessment in assessments:
+                segment = self._active_segment()
+                assert self._writer is not None  # nosec B101
+                segment.add(assessment.id, self._writer.tell())
+                self._max_id = max(self._max_id, assessment.id)
+                self._writer.write(assessment.model_dump_json().encode() + b"\n")
+            if self._writer is not None:
+                self._writer.flush()
+
+    def _active_segment(self) -> _Segment:
+        if not self._segments or len(self._segments[-1]) >= SEGMENT_RECORDS:
+            if self._writer is not None:
+                self._writer.close()
+            path = os.path.join(self.directory, f"{len(self._segments):06d}.ndjson")
+            self._segments.append(_Segment(path))
+            self._writer = open(path, "ab")
+        return self._segments[-1]
+
+    def get(self, assessment_id: int) -> Optional[AssessmentResultBase]:
+        with self._lock:
+            # A record evicted again after being saved anew is spilled twice;
+            # the latest copy wins
+            for segment in reversed(self._segments):
+                position = segment.index().position(assessment_id)
+                if position is not None:
+                    return segment.read(int(segment.offsets[position]))
+        return None
+
+    def list_after(self, after_id: int, limit: int) -> List[AssessmentResultBase]:
+        """Return up to limit records with an ID above after_id, in ID order."""
+        with self._lock:
+            candidates: Dict[int, _Segment] = {}
+            for segment in self._segments:
+                ids = segment.index().ids
+                start = int(np.searchsorted(ids, after_id, "right"))
+                end = start + limit
+                for assessment_id in ids[start:end].tolist():
+                    candidates[assessment_id] = segment
+            page = []
+            for assessment_id in sorted(candidates)[:limit]:
+                segment = candidates[assessment_id]
+                position = segment.position(assessment_id)
+                assert position is not None  # nosec B101
+                page.append(segment.read(int(segment.offsets[position])))
+            return page
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._segments:
+                segment.close()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._segments = []
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,521 @@
+# app/repositories/sqlite_repository.py
+
+import json
+import os
+import queue
+import secrets
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+from ..aggregates import RunningStats, SurveyStatistics
+from ..models import AssessmentResultBase, SurveyType
+from ..quantiles import KLLSketch
+from ..rollups import RollupBucket, period_start
+from .base import Aggregates, AssessmentRepositoryBase, IdempotentRecord
+from .id_allocator import MAX_NODE_ID, IdAllocator, SnowflakeIdAllocator
+
+# Statements are kept as module constants so that every pooled connection's
+# statement cache reuses the same prepared statement for each query.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    survey_id INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    scores TEXT NOT NULL,
+    team_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_survey_id ON assessments (survey_id);
+CREATE INDEX IF NOT EXISTS idx_assessments_timestamp ON assessments (timestamp);
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    assessment_id INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at
+    ON idempotency_keys (expires_at);
+CREATE TABLE IF NOT EXISTS node_leases (
+    node_id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+# Aggregates shared by every worker, updated in the transaction saving the
+# assessments. The scope is a team ID, or '' for all assessments.
+_AGGREGATE_TABLES = (
+    "CREATE TABLE teams (team_id TEXT PRIMARY KEY) WITHOUT ROWID",
+    """CREATE TABLE period_rollups (
+        scope TEXT NOT NULL,
+        survey_id INTEGER NOT NULL,
+        period_start TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (scope, survey_id, period_start)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE score_rollups (
+        scope TEXT NOT NULL,
+        survey_id INTEGER NOT NULL,
+        period_start TEXT NOT NULL,
+        key TEXT NOT NULL,
+        total REAL NOT NULL,
+        count INTEGER NOT NULL,
+        mean REAL NOT NULL,
+        m2 REAL NOT NULL,
+        minimum REAL NOT NULL,
+        maximum REAL NOT NULL,
+        distribution TEXT NOT NULL,
+        sketch BLOB NOT NULL,
+        PRIMARY KEY (scope, survey_id, period_start, key)
+    )""",
+)
+_HAS_AGGREGATES = (
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'score_rollups'"
+)
+# Databases created before assessments had a team gain the column on open
+_ADD_TEAM_COLUMN = "ALTER TABLE assessments ADD COLUMN team_id TEXT"
+_TEAM_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_assessments_team_id ON assessments (team_id, id)"
+)
+_TABLE_INFO = "PRAGMA table_info(assessments)"
+_COLUMNS = "id, survey_id, timestamp, scores, team_id"
+_INSERT = f"INSERT INTO assessments ({_COLUMNS}) VALUES (?, ?, ?, ?, ?)"
+_SELECT_BY_ID = f"SELECT {_COLUMNS} FROM assessments WHERE id = ?"
+# The IDs are bound as one JSON array, so every batch size shares one statement
+_SELECT_BY_IDS = (
+    f"SELECT {_COLUMNS} FROM assessments "
+    "WHERE id IN (SELECT value FROM json_each(?))"
+)
+_SELECT_AFTER = f"SELECT {_COLUMNS} FROM assessments WHERE id > ? ORDER BY id LIMIT ?"
+# Served by the (team_id, id) index, reading only the team's rows
+_SELECT_TEAM_AFTER = (
+    f"SELECT {_COLUMNS} FROM assessments "
+    "WHERE team_id = ? AND id > ? ORDER BY id LIMIT ?"
+)
+_COUNT = "SELECT COUNT(*) FROM assessments"
+_INSERT_TEAM = "INSERT OR IGNORE INTO teams (team_id) VALUES (?)"
+_SELECT_TEAM = "SELECT 1 FROM teams WHERE team_id = ?"
+_COUNT_TEAMS = "SELECT COUNT(*) FROM teams"
+_SELECT_PERIODS = (
+    "SELECT period_start, count FROM period_rollups "
+    "WHERE scope = ? AND survey_id = ?"
+)
+_SELECT_PERIOD = _SELECT_PERIODS + " AND period_start = ?"
+_SCORE_COLUMNS = (
+    "period_start, key, total, count, mean, m2, minimum, maximum, "
+    "distribution, sketch"
+)
+_SELECT_SCORES = (
+    f"SELECT {_SCORE_COLUMNS} FROM score_rollups WHERE scope = ? AND survey_id = ?"
+)
+_SELECT_PERIOD_SCORES = _SELECT_SCORES + " AND period_start = ?"
+_UPSERT_PERIOD = (
+    "INSERT OR REPLACE INTO period_rollups (scope, survey_id, period_start, count) "
+    "VALUES (?, ?, ?, ?)"
+)
+_UPSERT_SCORE = (
+    f"INSERT OR REPLACE INTO score_rollups (scope, survey_id, {_SCORE_COLUMNS}) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_DELETE_EXPIRED_KEYS = "DELETE FROM idempotency_keys WHERE expires_at <= ?"
+_INSERT_KEY = (
+    "INSERT INTO idempotency_keys (key, fingerprint, assessment_id, expires_at) "
+    "VALUES (?, ?, ?, ?) ON CONFLICT (key) DO NOTHING"
+)
+_SELECT_BY_KEY = (
+    "SELECT k.fingerprint, a.id, a.survey_id, a.timestamp, a.scores, a.team_id "
+    "FROM idempotency_keys k JOIN assessments a ON a.id = k.assessment_id "
+    "WHERE k.key = ? AND k.expires_at > ?"
+)
+_DELETE_EXPIRED_LEASES = "DELETE FROM node_leases WHERE expires_at <= ?"
+_SELECT_LEASES = "SELECT node_id, owner FROM node_leases"
+_INSERT_LEASE = "INSERT INTO node_leases (node_id, owner, expires_at) VALUES (?, ?, ?)"
+_RENEW_LEASE = "UPDATE node_leases SET expires_at = ? WHERE node_id = ? AND owner = ?"
+_RELEASE_LEASE = "DELETE FROM node_leases WHERE node_id = ? AND owner = ?"
+
+# Node leases of workers that stop without closing the repository expire
+# after this long; live workers renew theirs before half of it has passed.
+NODE_LEASE_SECONDS = 600.0
+
+AssessmentRow = Tuple[int, int, str, str, Optional[str]]
+
+
+def _to_row(assessment: AssessmentResultBase) -> AssessmentRow:
+    return (
+        assessment.id,
+        assessment.survey_id,
+        assessment.timestamp.isoformat(),
+        json.dumps(assessment.scores),
+        assessment.team_id,
+    )
+
+
+def _read_buckets(
+    connection: sqlite3.Connection,
+    scope: str,
+    survey_id: int,
+    start: Optional[date] = None,
+) -> Dict[date, RollupBucket]:
+    """Load the stored rollups of a scope's survey, or of one of its periods."""
+    if start is None:
+        params: Tuple[object, ...] = (scope, survey_id)
+        periods, scores = _SELECT_PERIODS, _SELECT_SCORES
+    else:
+        params = (scope, survey_id, start.isoformat())
+        periods, scores = _SELECT_PERIOD, _SELECT_PERIOD_SCORES
+    buckets: Dict[date, RollupBucket] = {}
+    for day, count in connection.execute(periods, params):
+        bucket = buckets[date.fromisoformat(day)] = RollupBucket()
+        bucket.count = count
+    for row in connection.execute(scores, params):
+        day, key, total, count, mean, m2, minimum, maximum, distribution, sketch = row
+        bucket = buckets[date.fromisoformat(day)]
+        bucket.sums[key] = total
+        bucket.stats[key] = RunningStats.from_state((count, mean, m2, minimum, maximum))
+        bucket.distributions[key] = {
+            value: occurrences for value, occurrences in json.loads(distribution)
+        }
+        bucket.sketches[key] = KLLSketch.from_bytes(sketch)
+    return buckets
+
+
+def _write_bucket(
+    connection: sqlite3.Connection,
+    scope: str,
+    survey_id: int,
+    start: date,
+    bucket: RollupBucket,
+) -> None:
+    day = start.isoformat()
+    connection.execute(_UPSERT_PERIOD, (scope, survey_id, day, bucket.count))
+    connection.executemany(
+        _UPSERT_SCORE,
+        [
+            (
+                scope,
+                survey_id,
+                day,
+                key,
+                total,
+                *bucket.stats[key].state(),
+                json.dumps(list(bucket.distributions[key].items())),
+                bucket.sketches[key].to_bytes(),
+            )
+            for key, total in bucket.sums.items()
+        ],
+    )
+
+
+def _to_assessment(row: AssessmentRow) -> AssessmentResultBase:
+    assessment_id, survey_id, timestamp, scores, team_id = row
+    return AssessmentResultBase(
+        id=assessment_id,
+        survey_id=survey_id,
+        scores=json.loads(scores),
+        timestamp=datetime.fromisoformat(timestamp),
+        team_id=team_id,
+    )
+
+
+class SQLiteAssessmentRepository(AssessmentRepositoryBase):
+    """
+    Durable assessment store backed by a local SQLite database file.
+
+    The database runs in WAL mode so readers never block the single writer,
+    and connections are drawn from a small pool shared across threads. Calls
+    block on disk I/O, so async callers must run them in a worker thread.
+
+    Statistics, rollups and team lists live in the database too, updated in
+    the transaction saving the assessments, so every worker sharing the file
+    reads the same numbers. Opening the file does not replay its rows, except
+    once to build the aggregate tables of a database created before them.
+
+    Every process sharing the file mints IDs with its own snowflake node,
+    leased in the node_leases table: a free node when none is configured,
+    or the configured one, which fails if another process holds it.
+
+    Attributes:
+        path (str): Path to the database file.
+        pool_size (int): Maximum number of open connections.
+    """
+
+    blocking = True
+    durable = True
+
+    def __init__(
+        self,
+        path: str,
+        pool_size: int = 4,
+        timeout: float = 5.0,
+        cadences: Optional[Mapping[int, SurveyType]] = None,
+        id_allocator: Optional[IdAllocator] = None,
+    ) -> None:
+        super().__init__(cadences, id_allocator)
+        self.path = path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._pool_lock = threading.Lock()
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+            columns = {row[1] for row in connection.execute(_TABLE_INFO)}
+            if "team_id" not in columns:
+                connection.execute(_ADD_TEAM_COLUMN)
+            connection.execute(_TEAM_INDEX)
+            self._create_aggregates(connection)
+        self._lease: Optional[Tuple[int, str]] = None
+        self._renew_at = 0.0
+        if isinstance(self.id_allocator, SnowflakeIdAllocator):
+            self.id_allocator.use_node_source(self._lease_node)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,  # transactions are managed explicitly
+            check_same_thread=False,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        try:
+            connection = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._opened < self.pool_size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                connection = self._connect()
+            else:
+                connection = self._pool.get(timeout=self.timeout)
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    def _create_aggregates(self, connection: sqlite3.Connection) -> None:
+        # Immediate, so that one worker builds them while the others wait
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if connection.execute(_HAS_AGGREGATES).fetchone() is None:
+                for statement in _AGGREGATE_TABLES:
+                    connection.execute(statement)
+                after_id = 0
+                while True:
+                    rows = connection.execute(_SELECT_AFTER, (after_id, 1000))
+                    page = [_to_assessment(row) for row in rows.fetchall()]
+                    if not page:
+                        break
+                    self._write_aggregates(connection, page)
+                    after_id = page[-1].id
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _write_aggregates(
+        self, connection: sqlite3.Connection, assessments: List[AssessmentResultBase]
+    ) -> None:
+        """Fold assessments into the stored aggregates, within a transaction."""
+        deltas: Dict[Tuple[str, int, date], RollupBucket] = {}
+        teams: Set[str] = set()
+        for assessment in assessments:
+            survey_id = assessment.survey_id
+            start = period_start(assessment.timestamp, self.rollups.cadence(survey_id))
+            scopes = [""]
+            if assessment.team_id is not None:
+                scopes.append(assessment.team_id)
+                teams.add(assessment.team_id)
+            for scope in scopes:
+                delta = deltas.get((scope, survey_id, start))
+                if delta is None:
+                    delta = deltas[(scope, survey_id, start)] = RollupBucket()
+                delta.add(assessment)
+        connection.executemany(_INSERT_TEAM, [(team_id,) for team_id in teams])
+        for (scope, survey_id, start), delta in deltas.items():
+            stored = _read_buckets(connection, scope, survey_id, start)
+            bucket = stored.get(start)
+            if bucket is None:
+                bucket = delta
+            else:
+                bucket.merge(delta)
+            _write_bucket(connection, scope, survey_id, start, bucket)
+
+    def _aggregate(
+        self, saved: List[AssessmentResultBase], new: List[AssessmentResultBase]
+    ) -> None:
+        # Already stored with the assessments, in the same transaction
+        return None
+
+    def aggregates(self, survey_id: int, team_id: Optional[str] = None) -> Aggregates:
+        with self._connection() as connection:
+            buckets = _read_buckets(connection, team_id or "", survey_id)
+        stats = SurveyStatistics()
+        rollups = self.rollups.partition()
+        for start in sorted(buckets):
+            bucket = buckets[start]
+            stats.add_period(survey_id, bucket)
+            rollups.bucket(survey_id, start).merge(bucket)
+        return Aggregates(stats, rollups)
+
+    def has_team(self, team_id: str) -> bool:
+        with self._connection() as connection:
+            return connection.execute(_SELECT_TEAM, (team_id,)).fetchone() is not None
+
+    def team_count(self) -> int:
+        with self._connection() as connection:
+            (total,) = connection.execute(_COUNT_TEAMS).fetchone()
+        return int(total)
+
+    def _lease_node(self, node_id: Optional[int]) -> int:
+        """Lease node_id, or the lowest free node if None, for this process."""
+        owner = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(_DELETE_EXPIRED_LEASES, (now,))
+                leases = dict(connection.execute(_SELECT_LEASES).fetchall())
+                if node_id is None:
+                    free = (n for n in range(MAX_NODE_ID + 1) if n not in leases)
+                    node_id = next(free, None)
+                    if node_id is None:
+                        raise RuntimeError(f"All node IDs of {self.path} are leased")
+                elif node_id in leases:
+                    raise RuntimeError(
+                        f"NODE_ID {node_id} is already leased by {leases[node_id]}; "
+                        "every process sharing the database needs its own"
+                    )
+                connection.execute(
+                    _INSERT_LEASE, (node_id, owner, now + NODE_LEASE_SECONDS)
+                )
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        self._lease = (node_id, owner)
+        self._renew_at = time.monotonic() + NODE_LEASE_SECONDS / 2
+        return node_id
+
+    def _renew_lease(self) -> None:
+        lease = self._lease
+        if lease is None or time.monotonic() < self._renew_at:
+            return
+        node_id, owner = lease
+        expires_at = time.time() + NODE_LEASE_SECONDS
+        with self._connection() as connection:
+            cursor = connection.execute(_RENEW_LEASE, (expires_at, node_id, owner))
+        if cursor.rowcount == 1:
+            self._renew_at = time.monotonic() + NODE_LEASE_SECONDS / 2
+            return
+        # Idle past expiry and possibly taken over: lease a node afresh
+        assert isinstance(self.id_allocator, SnowflakeIdAllocator)  # nosec B101
+        self.id_allocator.use_node_source(self._lease_node)
+
+    def assign_ids(self, assessments: List[AssessmentResultBase]) -> None:
+        self._renew_lease()
+        super().assign_ids(assessments)
+
+    def _insert_many(
+        self, assessments: List[AssessmentResultBase]
+    ) -> List[AssessmentResultBase]:
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(_INSERT, [_to_row(a) for a in assessments])
+                self._write_aggregates(connection, assessments)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        return assessments
+
+    def save_idempotent(
+        self,
+        assessment: AssessmentResultBase,
+        key: str,
+        fingerprint: str,
+        expires_at: float,
+    ) -> IdempotentRecord:
+        self.assign_ids([assessment])
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(_DELETE_EXPIRED_KEYS, (time.time(),))
+                cursor = connection.execute(
+                    _INSERT_KEY, (key, fingerprint, assessment.id, expires_at)
+                )
+                if cursor.rowcount == 1:
+                    connection.execute(_INSERT, _to_row(assessment))
+                    self._write_aggregates(connection, [assessment])
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        if cursor.rowcount == 1:
+            self._index([assessment], [assessment])
+            return IdempotentRecord(fingerprint, assessment, False)
+        # Another worker saved an assessment under this key first
+        existing = self.find_idempotent(key)
+        assert existing is not None  # nosec B101
+        return existing
+
+    def find_idempotent(self, key: str) -> Optional[IdempotentRecord]:
+        with self._connection() as connection:
+            row = connection.execute(_SELECT_BY_KEY, (key, time.time())).fetchone()
+        if row is None:
+            return None
+        assessment = _to_assessment(row[1:])
+        fingerprint = row[0]
+        return IdempotentRecord(fingerprint, assessment, True)
+
+    def get(self, assessment_id: int) -> Optional[AssessmentResultBase]:
+        with self._connection() as connection:
+            row = connection.execute(_SELECT_BY_ID, (assessment_id,)).fetchone()
+        return _to_assessment(row) if row else None
+
+    def get_many(
+        self, assessment_ids: Iterable[int]
+    ) -> Dict[int, AssessmentResultBase]:
+        ids = json.dumps(list(assessment_ids))
+        with self._connection() as connection:
+            rows = connection.execute(_SELECT_BY_IDS, (ids,)).fetchall()
+        return {row[0]: _to_assessment(row) for row in rows}
+
+    def list_after(self, after_id: int, limit: int) -> List[AssessmentResultBase]:
+        with self._connection() as connection:
+            rows = connection.execute(_SELECT_AFTER, (after_id, limit)).fetchall()
+        return [_to_assessment(row) for row in rows]
+
+    def list_team_after(
+        self, team_id: str, after_id: int, limit: int
+    ) -> List[AssessmentResultBase]:
+        with self._connection() as connection:
+            rows = connection.execute(
+                _SELECT_TEAM_AFTER, (team_id, after_id, limit)
+            ).fetchall()
+        return [_to_assessment(row) for row in rows]
+
+    def count(self) -> int:
+        with self._connection() as connection:
+            (total,) = connection.execute(_COUNT).fetchone()
+        return int(total)
+
+    def close(self) -> None:
+        if self._lease is not None:
+            with self._connection() as connection:
+                connection.execute(_RELEASE_LEASE, self._lease)
+            self._lease = None
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self._opened = 0
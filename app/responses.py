@@ -0,0 +1,38 @@
+# app/responses.py
+
+from types import ModuleType
+from typing import Any, Optional
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:  # orjson is optional; pydantic-core's encoder is the fallback
+    orjson = None
+
+
+def _dump_model(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response that serializes its content directly, without FastAPI's
+    response_model validation pass.
+
+    Models are serialized by their compiled pydantic-core serializer; other
+    content uses orjson when it is installed and pydantic-core's encoder
+    otherwise. Only return trusted internal models through it: the content is
+    not checked against the route's response_model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        if orjson is not None:
+            return bytes(orjson.dumps(content, default=_dump_model))
+        return to_json(content)
@@ -0,0 +1,139 @@
+# app/rollups.py
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Mapping, Optional, Tuple
+from .aggregates import RunningStats
+from .models import AssessmentResultBase, SurveyType
+from .quantiles import KLLSketch
+
+
+def period_start(timestamp: datetime, survey_type: SurveyType) -> date:
+    """
+    Return the first day of the period containing the timestamp: the Monday
+    of its ISO week for weekly surveys, the first of its month for monthly
+    surveys. Aware timestamps are bucketed in UTC.
+    """
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    day = timestamp.date()
+    if survey_type == SurveyType.MONTHLY:
+        return day.replace(day=1)
+    return day - timedelta(days=day.weekday())
+
+
+class RollupBucket:
+    """
+    Precomputed aggregates of the assessments saved for one survey period.
+
+    Attributes:
+        count (int): Number of assessments in the period.
+        sums (Dict[str, float]): Sum of each score key.
+        distributions (Dict[str, Dict[float, int]]): Occurrences of each score
+            value per key. Scores are on bounded survey scales, so the number
+            of distinct values stays small.
+        sketches (Dict[str, KLLSketch]): Quantile sketch of each score key,
+            mergeable across periods.
+        stats (Dict[str, RunningStats]): Running statistics of each score
+            key, mergeable across periods.
+    """
+
+    __slots__ = ("count", "sums", "distributions", "sketches", "stats")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sums: Dict[str, float] = {}
+        self.distributions: Dict[str, Dict[float, int]] = {}
+        self.sketches: Dict[str, KLLSketch] = {}
+        self.stats: Dict[str, RunningStats] = {}
+
+    def add(self, assessment: AssessmentResultBase) -> None:
+        self.count += 1
+        for key, value in assessment.scores.items():
+            self.sums[key] = self.sums.get(key, 0.0) + value
+            distribution = self.distributions.setdefault(key, {})
+            distribution[value] = distribution.get(value, 0) + 1
+            sketch = self.sketches.get(key)
+            if sketch is None:
+                sketch = self.sketches[key] = KLLSketch()
+                self.stats[key] = RunningStats()
+            sketch.add(value)
+            self.stats[key].add(value)
+
+    def merge(self, other: "RollupBucket") -> None:
+        """Fold in the aggregates of more assessments of the same period."""
+        self.count += other.count
+        for key, total in other.sums.items():
+            self.sums[key] = self.sums.get(key, 0.0) + total
+            distribution = self.distributions.setdefault(key, {})
+            for value, occurrences in other.distributions[key].items():
+                distribution[value] = distribution.get(value, 0) + occurrences
+            self.sketches.setdefault(key, KLLSketch()).merge(other.sketches[key])
+            self.stats.setdefault(key, RunningStats()).merge(other.stats[key])
+
+    def means(self) -> Dict[str, float]:
+        return {key: total / self.count for key, total in self.sums.items()}
+
+
+class RollupIndex:
+    """
+    Buckets saved assessments by ISO week or calendar month, following each
+    survey's cadence, so trend queries only read the buckets in range.
+
+    Cadences must be known before a survey's assessments are indexed; surveys
+    without a configured cadence are bucketed weekly.
+    """
+
+    def __init__(self, cadences: Optional[Mapping[int, SurveyType]] = None) -> None:
+        self._cadences: Dict[int, SurveyType] = dict(cadences or {})
+        self._buckets: Dict[int, Dict[date, RollupBucket]] = {}
+        self._starts: Dict[int, List[date]] = {}
+
+    def set_cadence(self, survey_id: int, survey_type: SurveyType) -> None:
+        self._cadences[survey_id] = survey_type
+
+    def cadence(self, survey_id: int) -> SurveyType:
+        return self._cadences.get(survey_id, SurveyType.WEEKLY)
+
+    def partition(self) -> "RollupIndex":
+        """An empty index sharing this index's cadences, e.g. for one team."""
+        index = RollupIndex()
+        index._cadences = self._cadences
+        return index
+
+    def add(self, assessment: AssessmentResultBase) -> None:
+        survey_id = assessment.survey_id
+        start = period_start(assessment.timestamp, self.cadence(survey_id))
+        self.bucket(survey_id, start).add(assessment)
+
+    def bucket(self, survey_id: int, start: date) -> RollupBucket:
+        """The bucket of the period starting on start, created if needed."""
+        buckets = self._buckets.setdefault(survey_id, {})
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = RollupBucket()
+            insort(self._starts.setdefault(survey_id, []), start)
+        return bucket
+
+    def buckets(
+        self,
+        survey_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[Tuple[date, RollupBucket]]:
+        """
+        Return the buckets of a survey whose period overlaps [start, end], in
+        chronological order.
+        """
+        starts = self._starts.get(survey_id, [])
+        low = 0
+        high = len(starts)
+        if start is not None:
+            aligned = period_start(
+                datetime.combine(start, datetime.min.time()), self.cadence(survey_id)
+            )
+            low = bisect_left(starts, aligned)
+        if end is not None:
+            high = bisect_right(starts, end)
+        buckets = self._buckets.get(survey_id, {})
+        return [(day, buckets[day]) for day in starts[low:high]]
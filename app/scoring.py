@@ -1,15 +1,93 @@
 # app/scoring.py
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, TYPE_CHECKING
+from typing import Dict, List, Optional
+import numpy as np
+from .models import AnswerBase, QuestionBase
+from .survey_plan import SurveyPlan
 
-if TYPE_CHECKING:
-    from .models import AnswerBase, QuestionBase
+
+def build_score_matrix(
+    answer_sets: List[List[AnswerBase]], plan: SurveyPlan
+) -> np.ndarray:
+    """
+    Arrange answers into an (n_responses x n_questions) float matrix whose
+    columns follow the plan's question order. Unanswered cells are NaN.
+    """
+    matrix = np.full((len(answer_sets), len(plan)), np.nan)
+    index = plan.index
+    for row, answers in enumerate(answer_sets):
+        for answer in answers:
+            column = index.get(answer.question_id)
+            if column is not None:
+                matrix[row, column] = answer.score
+    return matrix
 
 
 class ScoringMechanism(ABC):
+    # Set by mechanisms that implement calculate_scores_batch natively, so that
+    # calculate_scores goes through the array path instead of per-response calls.
+    vectorized: bool = False
+
     @abstractmethod
     def calculate_score(
-        self, answers: List["AnswerBase"], questions: List["QuestionBase"]
+        self,
+        answers: List[AnswerBase],
+        questions: List[QuestionBase],
+        plan: Optional[SurveyPlan] = None,
     ) -> Dict[str, float]:
         pass
+
+    def calculate_scores(
+        self,
+        answer_sets: List[List[AnswerBase]],
+        questions: List[QuestionBase],
+        plan: Optional[SurveyPlan] = None,
+    ) -> List[Dict[str, float]]:
+        """
+        Score several responses to the same survey in one call.
+
+        The default implementation scores each response in turn; mechanisms
+        can override it with a batch-aware implementation. The optional plan is
+        the survey's precompiled SurveyPlan and is passed through unchanged.
+        """
+        if not self.vectorized:
+            return [
+                self.calculate_score(answers, questions, plan)
+                for answers in answer_sets
+            ]
+        if plan is None:
+            plan = SurveyPlan.from_questions(questions)
+        batch = self.calculate_scores_batch(
+            build_score_matrix(answer_sets, plan), questions, plan
+        )
+        columns = {key: values.tolist() for key, values in batch.items()}
+        return [
+            {key: values[row] for key, values in columns.items()}
+            for row in range(len(answer_sets))
+        ]
+
+    def calculate_scores_batch(
+        self,
+        score_matrix: np.ndarray,
+        questions: List[QuestionBase],
+        plan: Optional[SurveyPlan] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score an (n_responses x n_questions) matrix of raw answer scores.
+
+        Columns follow the survey's question order. Returns one array of
+        length n_responses per score key. The default implementation falls
+        back to calculate_score row by row; vectorized mechanisms override it.
+        """
+        if plan is None:
+            plan = SurveyPlan.from_questions(questions)
+        columns: Dict[str, List[float]] = {}
+        for row in score_matrix.tolist():
+            answers = [
+                AnswerBase(question_id=question_id, score=score)
+                for question_id, score in zip(plan.question_ids, row)
+            ]
+            for key, value in self.calculate_score(answers, questions, plan).items():
+                columns.setdefault(key, []).append(value)
+        return {key: np.asarray(values) for key, values in columns.items()}
@@ -0,0 +1,200 @@
+# app/settings.py
+
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def _parse_mapping(value: str) -> Dict[str, float]:
+    """Parse "name=value,name=value" into a dict of floats."""
+    mapping: Dict[str, float] = {}
+    for item in value.split(","):
+        if item.strip():
+            name, _, number = item.partition("=")
+            mapping[name.strip()] = float(number)
+    return mapping
+
+
+def _optional(parse: Callable[[str], T], name: str) -> Optional[T]:
+    """Parse an environment variable, or return None when it is unset."""
+    value = os.environ.get(name)
+    return parse(value) if value else None
+
+
+def _flag(name: str) -> bool:
+    """Read a boolean environment variable: 1, true, yes or on enable it."""
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Runtime configuration read from environment variables.
+
+    Attributes:
+        assessment_db_path (Optional[str]): SQLite database file for assessments
+            (ASSESSMENT_DB_PATH). The in-memory store is used when unset.
+        assessment_db_pool_size (int): Maximum pooled SQLite connections
+            (ASSESSMENT_DB_POOL_SIZE).
+        assessment_store (str): In-memory store used without a database,
+            "dict" or the compact "columnar" (ASSESSMENT_STORE).
+        assessment_max_records (Optional[int]): Most assessments the dict
+            store keeps in memory (ASSESSMENT_MAX_RECORDS).
+        assessment_ttl_seconds (Optional[float]): Age, by timestamp, after
+            which the dict store evicts assessments (ASSESSMENT_TTL_SECONDS).
+        assessment_spill_dir (Optional[str]): Directory evicted assessments
+            spill to, readable from there (ASSESSMENT_SPILL_DIR). Evicted
+            assessments are dropped when unset.
+        assessment_cache_bytes (int): Size of the cache of serialized
+            assessments behind the read endpoints; 0 disables it
+            (ASSESSMENT_CACHE_BYTES).
+        fast_responses (bool): Serialize handler results directly instead of
+            re-validating them against the response model (FAST_RESPONSES).
+        idempotency_max_keys (int): Most idempotency keys cached in memory
+            (IDEMPOTENCY_MAX_KEYS).
+        idempotency_ttl_seconds (float): How long an idempotency key is
+            honoured (IDEMPOTENCY_TTL_SECONDS).
+        write_behind (bool): Save single submissions from a background queue
+            in batches instead of within the request (WRITE_BEHIND).
+        write_behind_queue_size (int): Most assessments waiting to be saved
+            (WRITE_BEHIND_QUEUE_SIZE).
+        write_behind_batch_size (int): Most assessments saved per batch
+            (WRITE_BEHIND_BATCH_SIZE).
+        write_behind_flush_interval (float): Longest wait, in seconds, to fill
+            a batch (WRITE_BEHIND_FLUSH_INTERVAL).
+        write_behind_backpressure (str): What a submission does when the queue
+            is full: "block" waits for room, "reject" fails at once with a 503
+            (WRITE_BEHIND_BACKPRESSURE).
+        write_behind_block_timeout (float): Longest wait for room, in seconds,
+            before a 503 in block mode (WRITE_BEHIND_BLOCK_TIMEOUT).
+        write_behind_spill_path (Optional[str]): File keeping batches that
+            kept failing to save until they can be (WRITE_BEHIND_SPILL_PATH).
+            Defaults to the database path with a .spill.jsonl suffix.
+        rate_limit (Optional[float]): Requests per second allowed per client,
+            by X-API-Key header or client host (RATE_LIMIT). Unlimited when
+            unset.
+        api_keys (FrozenSet[str]): Known client API keys, comma-separated
+            (API_KEYS). Only these identify a client for rate limiting;
+            requests with other keys are limited by host.
+        rate_limit_burst (Optional[int]): Requests a client may make at once
+            (RATE_LIMIT_BURST). Defaults to one second's worth.
+        max_concurrent_requests (Optional[int]): Requests processed at once
+            (MAX_CONCURRENT_REQUESTS). Unlimited when unset.
+        admission_queue_size (int): Requests of each priority that may wait
+            for a slot (ADMISSION_QUEUE_SIZE).
+        admission_queue_timeout (float): Longest wait for a slot, in seconds
+            (ADMISSION_QUEUE_TIMEOUT).
+        survey_definitions_dir (Optional[str]): Directory of JSON or YAML survey
+            definitions loaded next to the built-in surveys
+            (SURVEY_DEFINITIONS_DIR).
+        survey_reload_interval (float): Seconds between checks of the
+            definitions directory for changes; 0 disables the watcher
+            (SURVEY_RELOAD_INTERVAL).
+        admin_token (Optional[str]): Token the admin endpoints require in the
+            X-Admin-Token header (ADMIN_TOKEN). They are disabled when unset.
+        node_id (Optional[int]): Node part of the assessment IDs, 0-255
+            (NODE_ID). With a database it is leased there, so it suits one
+            process only and workers should leave it unset to lease a free
+            node each; otherwise it is derived from the host and process.
+        log_level (str): Root log level (LOG_LEVEL).
+        log_format (str): "json" or "text" (LOG_FORMAT).
+        log_sampling (Dict[str, float]): Fraction of INFO/DEBUG records kept per
+            logger (LOG_SAMPLING, e.g. "app.surveys.shs=0.01").
+        log_rate_limits (Dict[str, float]): Maximum INFO/DEBUG records per second
+            per logger (LOG_RATE_LIMITS, e.g. "app.main=100").
+    """
+
+    assessment_db_path: Optional[str] = None
+    assessment_db_pool_size: int = 4
+    assessment_store: str = "dict"
+    assessment_max_records: Optional[int] = None
+    assessment_ttl_seconds: Optional[float] = None
+    assessment_spill_dir: Optional[str] = None
+    node_id: Optional[int] = None
+    assessment_cache_bytes: int = 64 * 1024 * 1024
+    fast_responses: bool = False
+    idempotency_max_keys: int = 10_000
+    idempotency_ttl_seconds: float = 86_400
+    write_behind: bool = False
+    write_behind_queue_size: int = 10_000
+    write_behind_batch_size: int = 500
+    write_behind_flush_interval: float = 0.05
+    write_behind_backpressure: str = "block"
+    write_behind_block_timeout: float = 1.0
+    write_behind_spill_path: Optional[str] = None
+    rate_limit: Optional[float] = None
+    rate_limit_burst: Optional[int] = None
+    api_keys: FrozenSet[str] = frozenset()
+    max_concurrent_requests: Optional[int] = None
+    admission_queue_size: int = 100
+    admission_queue_timeout: float = 1.0
+    survey_definitions_dir: Optional[str] = None
+    survey_reload_interval: float = 0.0
+    admin_token: Optional[str] = None
+    log_level: str = "INFO"
+    log_format: str = "json"
+    log_sampling: Dict[str, float] = field(default_factory=dict)
+    log_rate_limits: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        db_path = os.environ.get("ASSESSMENT_DB_PATH") or None
+        return cls(
+            assessment_db_path=db_path,
+            assessment_db_pool_size=int(os.environ.get("ASSESSMENT_DB_POOL_SIZE", "4")),
+            assessment_store=os.environ.get("ASSESSMENT_STORE", "dict"),
+            assessment_max_records=_optional(int, "ASSESSMENT_MAX_RECORDS"),
+            assessment_ttl_seconds=_optional(float, "ASSESSMENT_TTL_SECONDS"),
+            assessment_spill_dir=os.environ.get("ASSESSMENT_SPILL_DIR") or None,
+            node_id=_optional(int, "NODE_ID"),
+            assessment_cache_bytes=int(
+                os.environ.get("ASSESSMENT_CACHE_BYTES", str(64 * 1024 * 1024))
+            ),
+            fast_responses=_flag("FAST_RESPONSES"),
+            idempotency_max_keys=int(os.environ.get("IDEMPOTENCY_MAX_KEYS", "10000")),
+            idempotency_ttl_seconds=float(
+                os.environ.get("IDEMPOTENCY_TTL_SECONDS", "86400")
+            ),
+            write_behind=_flag("WRITE_BEHIND"),
+            write_behind_queue_size=int(
+                os.environ.get("WRITE_BEHIND_QUEUE_SIZE", "10000")
+            ),
+            write_behind_batch_size=int(
+                os.environ.get("WRITE_BEHIND_BATCH_SIZE", "500")
+            ),
+            write_behind_flush_interval=float(
+                os.environ.get("WRITE_BEHIND_FLUSH_INTERVAL", "0.05")
+            ),
+            write_behind_backpressure=os.environ.get(
+                "WRITE_BEHIND_BACKPRESSURE", "block"
+            ),
+            write_behind_block_timeout=float(
+                os.environ.get("WRITE_BEHIND_BLOCK_TIMEOUT", "1.0")
+            ),
+            write_behind_spill_path=os.environ.get("WRITE_BEHIND_SPILL_PATH")
+            or (f"{db_path}.spill.jsonl" if db_path else None),
+            rate_limit=_optional(float, "RATE_LIMIT"),
+            rate_limit_burst=_optional(int, "RATE_LIMIT_BURST"),
+            api_keys=frozenset(
+                key.strip()
+                for key in os.environ.get("API_KEYS", "").split(",")
+                if key.strip()
+            ),
+            max_concurrent_requests=_optional(int, "MAX_CONCURRENT_REQUESTS"),
+            admission_queue_size=int(os.environ.get("ADMISSION_QUEUE_SIZE", "100")),
+            admission_queue_timeout=float(
+                os.environ.get("ADMISSION_QUEUE_TIMEOUT", "1.0")
+            ),
+            survey_definitions_dir=os.environ.get("SURVEY_DEFINITIONS_DIR") or None,
+            survey_reload_interval=float(os.environ.get("SURVEY_RELOAD_INTERVAL", "0")),
+            admin_token=os.environ.get("ADMIN_TOKEN") or None,
+            log_level=os.environ.get("LOG_LEVEL", "INFO"),
+            log_format=os.environ.get("LOG_FORMAT", "json"),
+            log_sampling=_parse_mapping(os.environ.get("LOG_SAMPLING", "")),
+            log_rate_limits=_parse_mapping(os.environ.get("LOG_RATE_LIMITS", "")),
+        )
+
+
+settings = Settings.from_env()
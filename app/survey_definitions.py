@@ -0,0 +1,184 @@
+# app/survey_definitions.py
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from starlette.concurrency import run_in_threadpool
+from .exceptions import SurveyDefinitionException
+from .models import SurveyBase
+from .survey_registry import (
+    RegistrySnapshot,
+    SurveyRegistry,
+    builtin_surveys,
+    survey_registry,
+)
+from .surveys.declarative import DeclarativeSurvey, SurveyDefinition
+
+try:
+    import yaml
+except ImportError:  # A declared dependency, but JSON definitions work without it
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+JSON_SUFFIXES = (".json",)
+YAML_SUFFIXES = (".yaml", ".yml")
+
+# Errors meaning a definition file is unreadable or invalid. Validation and
+# JSON decoding errors are ValueErrors; YAML errors are not
+_INVALID_DEFINITION: Tuple[Type[Exception], ...] = (OSError, ValueError)
+if yaml is not None:
+    _INVALID_DEFINITION += (yaml.YAMLError,)
+
+# The watcher and the admin endpoint may reload at the same time, from worker
+# threads; each reload checks the registry the previous one swapped in
+_reload_lock = threading.Lock()
+
+
+def _definition_files(directory: str) -> List[str]:
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(JSON_SUFFIXES + YAML_SUFFIXES)
+    )
+
+
+def _parse(path: str) -> Any:
+    with open(path, "rb") as file:
+        content = file.read()
+    if path.endswith(JSON_SUFFIXES):
+        return json.loads(content)
+    if yaml is None:
+        raise SurveyDefinitionException(
+            f"{path}: PyYAML is not installed; use a JSON definition instead."
+        )
+    return yaml.safe_load(content)
+
+
+def load_survey_definitions(directory: str) -> List[SurveyBase]:
+    """
+    Compile every JSON and YAML survey definition in a directory.
+
+    Raises SurveyDefinitionException, naming the file, if any definition
+    cannot be read or is invalid, or if two definitions share a survey ID.
+    """
+    surveys: List[SurveyBase] = []
+    seen: Dict[int, str] = {}
+    for path in _definition_files(directory):
+        try:
+            definition = SurveyDefinition.model_validate(_parse(path))
+            survey = DeclarativeSurvey(definition)
+        except _INVALID_DEFINITION as exc:
+            raise SurveyDefinitionException(f"{path}: {exc}") from exc
+        if survey.id in seen:
+            raise SurveyDefinitionException(
+                f"{path}: survey ID {survey.id} is also defined in {seen[survey.id]}."
+            )
+        seen[survey.id] = path
+        surveys.append(survey)
+    return surveys
+
+
+def reload_surveys(
+    directory: str, registry: SurveyRegistry = survey_registry
+) -> RegistrySnapshot:
+    """
+    Rebuild the registry from the built-in surveys and the definitions in a
+    directory, and swap it in. On any error the current registry stays.
+
+    A survey may not change its survey_type, since stored trend buckets
+    follow it, and definitions may not reuse the IDs of built-in surveys.
+    Concurrent reloads run one after the other.
+    """
+    with _reload_lock:
+        builtin = builtin_surveys()
+        builtin_ids = {survey.id for survey in builtin}
+        defined = load_survey_definitions(directory)
+        current = registry.snapshot()
+        for survey in defined:
+            if survey.id in builtin_ids:
+                raise SurveyDefinitionException(
+                    f"Survey ID {survey.id} belongs to a built-in survey."
+                )
+            existing = current.get_survey(survey.id)
+            if existing is not None and existing.survey_type != survey.survey_type:
+                raise SurveyDefinitionException(
+                    f"Survey {survey.id} cannot change its type from "
+                    f"{existing.survey_type.value} to {survey.survey_type.value}."
+                )
+        snapshot = registry.replace(builtin + defined)
+    logger.info(
+        "Loaded %s survey definitions from %s.",
+        len(defined),
+        directory,
+        extra={"surveys": len(snapshot.entries)},
+    )
+    return snapshot
+
+
+class SurveyDefinitionWatcher:
+    """
+    Polls a definitions directory and reloads the surveys, off the event
+    loop, whenever a file is added, removed or modified. A failed reload is
+    logged and keeps the current registry; it is retried on the next change.
+
+    Attributes:
+        directory (str): Directory holding the definition files.
+        interval (float): Seconds between polls.
+        reload (Callable[[], Any]): Reloads the surveys from the directory.
+    """
+
+    def __init__(
+        self, directory: str, interval: float, reload: Callable[[], Any]
+    ) -> None:
+        self.directory = directory
+        self.interval = interval
+        self.reload = reload
+        self._signature = self._read_signature()
+        self._task: "Optional[asyncio.Task[None]]" = None
+
+    def _read_signature(self) -> Tuple[Tuple[str, int, int], ...]:
+        signature = []
+        for path in _definition_files(self.directory):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    async def poll(self) -> bool:
+        """Reload if the directory changed; return whether it reloaded."""
+        signature = await run_in_threadpool(self._read_signature)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            await run_in_threadpool(self.reload)
+        except SurveyDefinitionException as exc:
+            logger.error("Survey definitions not reloaded: %s", exc.message)
+            return False
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception("Polling survey definitions failed.")
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
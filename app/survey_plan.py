@@ -0,0 +1,44 @@
+# app/survey_plan.py
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import FrozenSet, List, Mapping, Tuple
+from .models import QuestionBase
+
+
+@dataclass(frozen=True)
+class SurveyPlan:
+    """
+    Immutable, precompiled view of a survey's questions used by validation and
+    scoring, so neither has to scan the question list per answer.
+
+    Attributes:
+        question_ids (Tuple[int, ...]): Question IDs in survey order.
+        index (Mapping[int, int]): Position of each question ID in question_ids.
+        required_ids (FrozenSet[int]): Question IDs every response must answer.
+        scale_min (Tuple[int, ...]): Minimum scale value per position.
+        scale_max (Tuple[int, ...]): Maximum scale value per position.
+        reverse_mask (Tuple[bool, ...]): Whether each position is reverse-scored.
+    """
+
+    question_ids: Tuple[int, ...]
+    index: Mapping[int, int]
+    required_ids: FrozenSet[int]
+    scale_min: Tuple[int, ...]
+    scale_max: Tuple[int, ...]
+    reverse_mask: Tuple[bool, ...]
+
+    @classmethod
+    def from_questions(cls, questions: List[QuestionBase]) -> "SurveyPlan":
+        question_ids = tuple(q.id for q in questions)
+        return cls(
+            question_ids=question_ids,
+            index=MappingProxyType({qid: pos for pos, qid in enumerate(question_ids)}),
+            required_ids=frozenset(question_ids),
+            scale_min=tuple(q.scale_min for q in questions),
+            scale_max=tuple(q.scale_max for q in questions),
+            reverse_mask=tuple(q.reverse_scored for q in questions),
+        )
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
@@ -1,30 +1,185 @@
 # app/survey_registry.py
 
-from typing import Dict, List, Optional
+import hashlib
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, Optional
+from pydantic import TypeAdapter
 from .surveys.shs import SHSSurvey
 from .surveys.stress import StressSurvey
-from .models import SurveyBase
+from .models import QuestionBase, SurveyBase, SurveyModel, SurveySummary
+from .survey_plan import SurveyPlan
+
+_summaries_adapter = TypeAdapter(List[SurveySummary])
+_questions_adapter = TypeAdapter(List[QuestionBase])
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    """
+    A pre-serialized JSON response body and its strong ETag.
+
+    Attributes:
+        body (bytes): The serialized JSON.
+        etag (str): Quoted strong entity tag derived from the body.
+    """
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "CachedPayload":
+        return cls(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+@dataclass(frozen=True)
+class CompiledSurvey:
+    """
+    A survey with everything derived from it at registration: its SurveyPlan
+    and its serialized details and question list.
+    """
+
+    survey: SurveyBase
+    plan: SurveyPlan
+    details: CachedPayload
+    questions: CachedPayload
+
+    @classmethod
+    def compile(cls, survey: SurveyBase) -> "CompiledSurvey":
+        return cls(
+            survey=survey,
+            plan=SurveyPlan.from_questions(survey.questions),
+            details=CachedPayload.from_body(
+                SurveyModel(
+                    id=survey.id,
+                    name=survey.name,
+                    survey_type=survey.survey_type,
+                    questions=survey.questions,
+                )
+                .model_dump_json()
+                .encode()
+            ),
+            questions=CachedPayload.from_body(
+                _questions_adapter.dump_json(survey.questions)
+            ),
+        )
+
+
+class RegistrySnapshot:
+    """
+    Immutable set of compiled surveys and the serialized catalog listing them.
+
+    A snapshot never changes once built, so a request that takes one sees a
+    consistent survey, plan and catalog however the registry changes meanwhile.
+    """
+
+    def __init__(self, entries: Mapping[int, CompiledSurvey]) -> None:
+        self._entries: Mapping[int, CompiledSurvey] = MappingProxyType(dict(entries))
+        self._catalog = CachedPayload.from_body(
+            _summaries_adapter.dump_json(
+                [
+                    SurveySummary(id=s.id, name=s.name, survey_type=s.survey_type)
+                    for s in self.list_surveys()
+                ]
+            )
+        )
+
+    @property
+    def entries(self) -> Mapping[int, CompiledSurvey]:
+        return self._entries
+
+    def get_survey(self, survey_id: int) -> Optional[SurveyBase]:
+        entry = self._entries.get(survey_id)
+        return entry.survey if entry else None
+
+    def get_plan(self, survey_id: int) -> Optional[SurveyPlan]:
+        entry = self._entries.get(survey_id)
+        return entry.plan if entry else None
+
+    def list_surveys(self) -> List[SurveyBase]:
+        return [entry.survey for entry in self._entries.values()]
+
+    def catalog_payload(self) -> CachedPayload:
+        """Serialized list of survey summaries."""
+        return self._catalog
+
+    def details_payload(self, survey_id: int) -> Optional[CachedPayload]:
+        """Serialized SurveyModel of a survey."""
+        entry = self._entries.get(survey_id)
+        return entry.details if entry else None
+
+    def questions_payload(self, survey_id: int) -> Optional[CachedPayload]:
+        """Serialized question list of a survey."""
+        entry = self._entries.get(survey_id)
+        return entry.questions if entry else None
 
 
 class SurveyRegistry:
     """
     Registry for managing surveys.
+
+    Each registered survey is compiled into a SurveyPlan that validation and
+    scoring share, and its catalog responses are serialized once so the
+    catalog endpoints can serve them without rebuilding any models.
+
+    The registry holds one RegistrySnapshot at a time. Changes build a new
+    snapshot aside and then swap it in with a single reference assignment,
+    so reads take no lock and never see a partly built registry. Handlers
+    that read more than once per request should take snapshot() once.
     """
 
     def __init__(self) -> None:
-        self._surveys: Dict[int, SurveyBase] = {}
+        self._snapshot = RegistrySnapshot({})
+        # Serializes writers; readers never take it
+        self._write_lock = threading.Lock()
+
+    def snapshot(self) -> RegistrySnapshot:
+        return self._snapshot
 
     def register_survey(self, survey: SurveyBase) -> None:
-        self._surveys[survey.id] = survey
+        compiled = CompiledSurvey.compile(survey)
+        with self._write_lock:
+            entries = dict(self._snapshot.entries)
+            entries[survey.id] = compiled
+            self._snapshot = RegistrySnapshot(entries)
+
+    def replace(self, surveys: Iterable[SurveyBase]) -> RegistrySnapshot:
+        """Swap in a snapshot holding exactly the given surveys."""
+        snapshot = RegistrySnapshot(
+            {survey.id: CompiledSurvey.compile(survey) for survey in surveys}
+        )
+        with self._write_lock:
+            self._snapshot = snapshot
+        return snapshot
 
     def get_survey(self, survey_id: int) -> Optional[SurveyBase]:
-        return self._surveys.get(survey_id)
+        return self._snapshot.get_survey(survey_id)
+
+    def get_plan(self, survey_id: int) -> Optional[SurveyPlan]:
+        return self._snapshot.get_plan(survey_id)
 
     def list_surveys(self) -> List[SurveyBase]:
-        return list(self._surveys.values())
+        return self._snapshot.list_surveys()
+
+    def catalog_payload(self) -> CachedPayload:
+        """Serialized list of survey summaries."""
+        return self._snapshot.catalog_payload()
+
+    def details_payload(self, survey_id: int) -> Optional[CachedPayload]:
+        """Serialized SurveyModel of a survey."""
+        return self._snapshot.details_payload(survey_id)
+
+    def questions_payload(self, survey_id: int) -> Optional[CachedPayload]:
+        """Serialized question list of a survey."""
+        return self._snapshot.questions_payload(survey_id)
+
+
+def builtin_surveys() -> List[SurveyBase]:
+    """The surveys implemented in code, which every registry starts from."""
+    return [SHSSurvey(), StressSurvey()]
 
 
 # Instantiate the registry and register surveys
 survey_registry = SurveyRegistry()
-survey_registry.register_survey(SHSSurvey())
-survey_registry.register_survey(StressSurvey())
+survey_registry.replace(builtin_surveys())
@@ -0,0 +1,193 @@
+# app/surveys/declarative.py
+
+from typing import Dict, List, Literal, Optional, Tuple
+import numpy as np
+from pydantic import BaseModel, Field, model_validator
+from ..interpretation import InterpretationTable
+from ..models import AnswerBase, QuestionBase, SurveyBase, SurveyType
+from ..scoring import ScoringMechanism
+from ..survey_plan import SurveyPlan
+
+
+class QuestionDefinition(QuestionBase):
+    # Positive, so that weighted means never divide by a zero total weight
+    weight: float = Field(1.0, gt=0, description="Weight of the question in its scores")
+
+
+class ScoreDefinition(BaseModel):
+    key: str = Field(..., description="Name of the score in assessment results")
+    method: Literal["mean", "sum"] = Field(
+        "mean", description="Weighted mean or weighted sum of the answers"
+    )
+    questions: Optional[List[int]] = Field(
+        None, description="IDs of the questions scored; all questions when unset"
+    )
+    round: Optional[int] = Field(2, description="Decimal places kept, if any")
+
+
+class BandDefinition(BaseModel):
+    min: float = Field(..., description="Lowest score of the band (inclusive)")
+    label: str = Field(..., description="Interpretation of scores in the band")
+
+
+class InterpretationDefinition(BaseModel):
+    below: str = Field(..., description="Interpretation of scores below every band")
+    bands: List[BandDefinition] = Field(
+        ..., description="Bands in ascending order of their lowest score"
+    )
+
+
+class SurveyDefinition(BaseModel):
+    """
+    A survey described as data, as read from a JSON or YAML definition file.
+
+    Attributes:
+        id (int): Unique identifier for the survey.
+        name (str): Name of the survey.
+        survey_type (SurveyType): Type of the survey.
+        questions (List[QuestionDefinition]): Questions, scales, reverse
+            scoring and weights.
+        scores (List[ScoreDefinition]): Scores calculated from the answers.
+        interpretation (Optional[InterpretationDefinition]): Score bands.
+        interpretation_guide (Optional[str]): Free-text guide to the scores.
+    """
+
+    id: int
+    name: str
+    survey_type: SurveyType
+    questions: List[QuestionDefinition] = Field(..., min_length=1)
+    scores: List[ScoreDefinition] = Field(..., min_length=1)
+    interpretation: Optional[InterpretationDefinition] = None
+    interpretation_guide: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_references(self) -> "SurveyDefinition":
+        question_ids = [question.id for question in self.questions]
+        if len(set(question_ids)) != len(question_ids):
+            raise ValueError("Question IDs must be unique within a survey.")
+        for question in self.questions:
+            if question.scale_min >= question.scale_max:
+                raise ValueError(
+                    f"Question {question.id} needs scale_min below scale_max."
+                )
+        keys = [score.key for score in self.scores]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Score keys must be unique within a survey.")
+        for score in self.scores:
+            unknown = set(score.questions or ()) - set(question_ids)
+            if unknown:
+                raise ValueError(
+                    f"Score {score.key!r} refers to unknown questions "
+                    f"{sorted(unknown)}."
+                )
+        return self
+
+
+class _CompiledScore:
+    """A score definition resolved to question positions and weights."""
+
+    __slots__ = ("key", "mean", "positions", "weights", "total_weight", "digits")
+
+    def __init__(
+        self, definition: ScoreDefinition, questions: List[QuestionDefinition]
+    ) -> None:
+        selected = set(definition.questions or (q.id for q in questions))
+        positions = [i for i, q in enumerate(questions) if q.id in selected]
+        self.key = definition.key
+        self.mean = definition.method == "mean"
+        self.positions: Tuple[int, ...] = tuple(positions)
+        self.weights: Tuple[float, ...] = tuple(questions[i].weight for i in positions)
+        self.total_weight = sum(self.weights)
+        self.digits = definition.round
+
+
+class DeclarativeScoringMechanism(ScoringMechanism):
+    """
+    Scores answers as weighted means or sums of (reverse-scored) answers, as
+    given by a survey definition. Question positions and weights are resolved
+    once, when the definition is compiled.
+    """
+
+    vectorized = True
+
+    def __init__(
+        self, scores: List[ScoreDefinition], questions: List[QuestionDefinition]
+    ) -> None:
+        self.scores = tuple(_CompiledScore(score, questions) for score in scores)
+
+    def calculate_score(
+        self,
+        answers: List[AnswerBase],
+        questions: List[QuestionBase],
+        plan: Optional[SurveyPlan] = None,
+    ) -> Dict[str, float]:
+        if plan is None:
+            plan = SurveyPlan.from_questions(questions)
+        values = [0.0] * len(plan)
+        for answer in answers:
+            position = plan.index.get(answer.question_id)
+            if position is None:
+                continue
+            value = answer.score
+            if plan.reverse_mask[position]:
+                value = plan.scale_max[position] + plan.scale_min[position] - value
+            values[position] = value
+        results: Dict[str, float] = {}
+        for score in self.scores:
+            total = sum(values[i] * w for i, w in zip(score.positions, score.weights))
+            if score.mean:
+                total /= score.total_weight
+            if score.digits is not None:
+                total = round(total, score.digits)
+            results[score.key] = total
+        return results
+
+    def calculate_scores_batch(
+        self,
+        score_matrix: np.ndarray,
+        questions: List[QuestionBase],
+        plan: Optional[SurveyPlan] = None,
+    ) -> Dict[str, np.ndarray]:
+        if plan is None:
+            plan = SurveyPlan.from_questions(questions)
+        reverse_mask = np.asarray(plan.reverse_mask, dtype=bool)
+        reflection = np.asarray(plan.scale_min) + np.asarray(plan.scale_max)
+        values = np.where(reverse_mask, reflection - score_matrix, score_matrix)
+        results = {}
+        for score in self.scores:
+            totals = values[:, list(score.positions)] @ np.asarray(score.weights)
+            if score.mean:
+                totals = totals / score.total_weight
+            if score.digits is not None:
+                totals = np.round(totals, score.digits)
+            results[score.key] = totals
+        return results
+
+
+class DeclarativeSurvey(SurveyBase):
+    """A survey compiled from a SurveyDefinition."""
+
+    def __init__(self, definition: SurveyDefinition) -> None:
+        interpretation = definition.interpretation
+        super().__init__(
+            id=definition.id,
+            name=definition.name,
+            survey_type=definition.survey_type,
+            # Served as plain questions; the weights only matter to scoring
+            questions=[
+                QuestionBase.model_validate(q.model_dump(exclude={"weight"}))
+                for q in definition.questions
+            ],
+            scoring_mechanism=DeclarativeScoringMechanism(
+                definition.scores, definition.questions
+            ),
+            interpretation_table=(
+                InterpretationTable.from_bands(
+                    [(band.min, band.label) for band in interpretation.bands],
+                    below=interpretation.below,
+                )
+                if interpretation is not None
+                else None
+            ),
+        )
+        self.interpretation_guide = definition.interpretation_guide
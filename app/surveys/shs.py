@@ -1,8 +1,12 @@
 # app/surveys/shs.py
 
-from typing import List, Dict
+import math
+from typing import List, Dict, Optional
+import numpy as np
+from ..interpretation import InterpretationTable
 from ..models import SurveyBase, QuestionBase, AnswerBase, SurveyType
 from ..scoring import ScoringMechanism
+from ..survey_plan import SurveyPlan
 import logging
 
 logger = logging.getLogger(__name__)
@@ -50,41 +54,76 @@ class SHSConstants:
     """  # noqa: E501
 
 
+# 1 to <4: low, 4 to <6: moderate, 6 to 7: high; anything above 7 is off the
+# scale and reported as low
+SHS_INTERPRETATIONS = InterpretationTable.from_bands(
+    [
+        (4, SHSConstants.MODERATE),
+        (6, SHSConstants.HIGH),
+        (math.nextafter(7, math.inf), SHSConstants.LOW),
+    ],
+    below=SHSConstants.LOW,
+)
+
+
 def get_shs_interpretation(score: float) -> str:
-    if 6 <= score <= 7:
-        return SHSConstants.HIGH
-    elif 4 <= score < 6:
-        return SHSConstants.MODERATE
-    else:
-        return SHSConstants.LOW
+    return SHS_INTERPRETATIONS.resolve(score)
 
 
 class SHSScoringMechanism(ScoringMechanism):
+    vectorized = True
+
     def calculate_score(
-        self, answers: List[AnswerBase], questions: List[QuestionBase]
+        self,
+        answers: List[AnswerBase],
+        questions: List[QuestionBase],
+        plan: Optional[SurveyPlan] = None,
     ) -> Dict[str, float]:
+        if plan is None:
+            plan = SurveyPlan.from_questions(questions)
         total_score = 0.0
         for answer in answers:
-            question = next((q for q in questions if q.id == answer.question_id), None)
-            if not question:
+            position = plan.index.get(answer.question_id)
+            if position is None:
                 logger.warning(
-                    f"Question ID {answer.question_id} not found in SHS questions."
+                    "Question ID %s not found in SHS questions.", answer.question_id
                 )
                 continue
             score = answer.score
-            if question.reverse_scored:
-                score = question.scale_max + question.scale_min - score
+            if plan.reverse_mask[position]:
+                score = plan.scale_max[position] + plan.scale_min[position] - score
                 logger.debug(
-                    f"Reverse-scored question {question.id}: "
-                    f"original score {answer.score}, reversed score {score}"
+                    "Reverse-scored question %s: original score %s, reversed score %s",
+                    answer.question_id,
+                    answer.score,
+                    score,
                 )
             total_score += score
-        average_score = total_score / len(questions)
-        interpretation = get_shs_interpretation(average_score)
-        logger.info(f"Subjective Happiness Scale (SHS) Score: {average_score:.2f}")
-        logger.info(f"SHS Interpretation: {interpretation}")
+        average_score = total_score / len(plan)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Subjective Happiness Scale (SHS) Score: %.2f. SHS Interpretation: %s",
+                average_score,
+                get_shs_interpretation(average_score),
+                extra={"happiness_score": average_score},
+            )
         return {"happiness_score": round(average_score, 2)}
 
+    def calculate_scores_batch(
+        self,
+        score_matrix: np.ndarray,
+        questions: List[QuestionBase],
+        plan: Optional[SurveyPlan] = None,
+    ) -> Dict[str, np.ndarray]:
+        if plan is None:
+            plan = SurveyPlan.from_questions(questions)
+        reverse_mask = np.asarray(plan.reverse_mask, dtype=bool)
+        reflection = np.asarray(plan.scale_min) + np.asarray(plan.scale_max)
+        scores = np.where(reverse_mask, reflection - score_matrix, score_matrix)
+        average_scores = scores.mean(axis=1)
+        logger.info("Scored %s SHS responses in batch", len(average_scores))
+        return {"happiness_score": np.round(average_scores, 2)}
+
 
 class SHSSurvey(SurveyBase):
     def __init__(self) -> None:
@@ -142,8 +181,6 @@ class SHSSurvey(SurveyBase):
                 ),
             ],
             scoring_mechanism=scoring_mechanism,
+            interpretation_table=SHS_INTERPRETATIONS,
         )
         self.interpretation_guide = SHSConstants.INTERPRETATION_GUIDE
-
-    def get_interpretation(self, score: float) -> str:
-        return get_shs_interpretation(score)
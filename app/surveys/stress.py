@@ -1,8 +1,11 @@
 # app/surveys/stress.py
 
-from typing import List, Dict
+from typing import List, Dict, Optional
+import numpy as np
+from ..interpretation import InterpretationTable
 from ..models import SurveyBase, QuestionBase, AnswerBase, SurveyType
 from ..scoring import ScoringMechanism
+from ..survey_plan import SurveyPlan
 import logging
 
 logger = logging.getLogger(__name__)
@@ -71,28 +74,56 @@ class StressConstants:
     """  # noqa: E501
 
 
-def get_stress_interpretation(score: int) -> str:
-    interpretations = {
-        1: StressConstants.NOT_AT_ALL,
-        2: StressConstants.SLIGHTLY,
-        3: StressConstants.MODERATELY,
-        4: StressConstants.VERY,
-        5: StressConstants.EXTREMELY,
-    }
-    return interpretations.get(score, StressConstants.INVALID)
+# Each whole point of the 1-5 scale is its own band; fractional scores fall in
+# the band of their integer part and anything off the scale is invalid
+STRESS_INTERPRETATIONS = InterpretationTable.from_bands(
+    [
+        (1, StressConstants.NOT_AT_ALL),
+        (2, StressConstants.SLIGHTLY),
+        (3, StressConstants.MODERATELY),
+        (4, StressConstants.VERY),
+        (5, StressConstants.EXTREMELY),
+        (6, StressConstants.INVALID),
+    ],
+    below=StressConstants.INVALID,
+)
+
+
+def get_stress_interpretation(score: float) -> str:
+    return STRESS_INTERPRETATIONS.resolve(score)
 
 
 class StressScoringMechanism(ScoringMechanism):
+    vectorized = True
+
     def calculate_score(
-        self, answers: List[AnswerBase], questions: List[QuestionBase]
+        self,
+        answers: List[AnswerBase],
+        questions: List[QuestionBase],
+        plan: Optional[SurveyPlan] = None,
     ) -> Dict[str, float]:
         # Assuming only one answer for the stress question
         stress_score = answers[0].score
-        interpretation = get_stress_interpretation(int(stress_score))
-        logger.info(f"Single-Item Stress Measure Score: {stress_score}")
-        logger.info(f"Stress Interpretation: {interpretation}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Single-Item Stress Measure Score: %s. Stress Interpretation: %s",
+                stress_score,
+                get_stress_interpretation(stress_score),
+                extra={"stress_score": stress_score},
+            )
         return {"stress_score": stress_score}
 
+    def calculate_scores_batch(
+        self,
+        score_matrix: np.ndarray,
+        questions: List[QuestionBase],
+        plan: Optional[SurveyPlan] = None,
+    ) -> Dict[str, np.ndarray]:
+        # Single-item measure: the score is the only column
+        stress_scores = score_matrix[:, 0].copy()
+        logger.info("Scored %s stress responses in batch", len(stress_scores))
+        return {"stress_score": stress_scores}
+
 
 class StressSurvey(SurveyBase):
     def __init__(self) -> None:
@@ -116,8 +147,6 @@ class StressSurvey(SurveyBase):
                 ),
             ],
             scoring_mechanism=scoring_mechanism,
+            interpretation_table=STRESS_INTERPRETATIONS,
         )
         self.interpretation_guide = StressConstants.INTERPRETATION_GUIDE
-
-    def get_interpretation(self, score: float) -> str:
-        return get_stress_interpretation(int(score))
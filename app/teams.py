@@ -0,0 +1,86 @@
+# app/teams.py
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+from .aggregates import SurveyStatistics
+from .models import AssessmentResultBase
+from .rollups import RollupIndex
+
+
+class TeamPartition:
+    """
+    The share of a repository's assessments belonging to one team: their IDs
+    and their own running statistics and rollups. Team queries read only
+    their team's partition, so they cost the same however many teams there
+    are.
+
+    Attributes:
+        team_id (str): ID of the team.
+        ids (array): IDs of the team's assessments in ascending order, 8
+            bytes each.
+        stats (SurveyStatistics): Running aggregates of the team's assessments.
+        rollups (RollupIndex): Per-period aggregates of the team's assessments.
+    """
+
+    __slots__ = ("team_id", "ids", "stats", "rollups")
+
+    def __init__(self, team_id: str, rollups: RollupIndex) -> None:
+        self.team_id = team_id
+        self.ids = array("q")
+        self.stats = SurveyStatistics()
+        self.rollups = rollups
+
+    def add(self, assessment: AssessmentResultBase, counted: bool = True) -> None:
+        """
+        Add an assessment's ID and, when counted and the ID is new to the
+        partition, fold it into the statistics and rollups.
+        """
+        ids = self.ids
+        assessment_id = assessment.id
+        if not ids or assessment_id > ids[-1]:
+            ids.append(assessment_id)
+        else:
+            # IDs minted earlier but saved late are inserted in place, once
+            position = bisect_left(ids, assessment_id)
+            if position < len(ids) and ids[position] == assessment_id:
+                return
+            ids.insert(position, assessment_id)
+        if counted:
+            self.stats.add(assessment)
+            self.rollups.add(assessment)
+
+    def ids_after(self, after_id: int, limit: int) -> List[int]:
+        """Return up to limit of the team's IDs above after_id, in order."""
+        start = bisect_right(self.ids, after_id)
+        end = start + limit
+        return self.ids[start:end].tolist()
+
+
+class TeamIndex:
+    """
+    Team partitions of a repository, created as the first assessment of each
+    team is saved. Assessments without a team are not partitioned. The
+    partitions' rollups share the cadences of the repository's rollups.
+    """
+
+    def __init__(self, rollups: RollupIndex) -> None:
+        self._rollups = rollups
+        self._partitions: Dict[str, TeamPartition] = {}
+
+    def __len__(self) -> int:
+        return len(self._partitions)
+
+    def add(self, assessment: AssessmentResultBase, counted: bool = True) -> None:
+        team_id = assessment.team_id
+        if team_id is None:
+            return
+        partition = self._partitions.get(team_id)
+        if partition is None:
+            partition = self._partitions[team_id] = TeamPartition(
+                team_id, self._rollups.partition()
+            )
+        partition.add(assessment, counted)
+
+    def get(self, team_id: str) -> Optional[TeamPartition]:
+        return self._partitions.get(team_id)
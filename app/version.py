@@ -0,0 +1,66 @@
+# app/version.py
+
+import os
+from functools import lru_cache
+
+GIT_VERSION_UNAVAILABLE = "Unable to determine version from Git"
+
+
+def get_git_version() -> str:
+    """
+    Return the most recent Git tag. Development fallback only: it imports
+    GitPython and walks every tag, which is too slow for worker start-up.
+    """
+    try:
+        from git import Repo
+        from git.exc import InvalidGitRepositoryError, GitCommandError
+    except ImportError:
+        return GIT_VERSION_UNAVAILABLE
+    try:
+        repo = Repo(search_parent_directories=True)
+        tags = sorted(repo.tags, key=lambda t: t.commit.committed_datetime)
+        return str(tags[-1]) if tags else "No tags found"
+    except (InvalidGitRepositoryError, GitCommandError):
+        return GIT_VERSION_UNAVAILABLE
+
+
+def get_version() -> str:
+    """
+    Return the project version, preferring values stamped at build time:
+    the APP_VERSION environment variable, then the generated app/_version.py,
+    and only then a Git tag lookup.
+    """
+    version = os.environ.get("APP_VERSION")
+    if version:
+        return version
+    try:
+        from ._version import __version__
+
+        return str(__version__)
+    except ImportError:
+        return get_git_version()
+
+
+@lru_cache(maxsize=None)
+def project_version() -> str:
+    """
+    Return get_version's answer, resolved on the first call and cached, so
+    that importing the app never falls back to the slow Git lookup.
+    """
+    return get_version()
+
+
+def write_version_file() -> str:
+    """Stamp the current Git version into app/_version.py."""
+    version = os.environ.get("APP_VERSION") or get_git_version()
+    path = os.path.join(os.path.dirname(__file__), "_version.py")
+    with open(path, "w") as version_file:
+        version_file.write(
+            "# app/_version.py\n# Generated by `make version`; do not edit.\n\n"
+            f"__version__ = {version!r}\n"
+        )
+    return version
+
+
+if __name__ == "__main__":
+    print(write_version_file())
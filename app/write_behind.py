@@ -0,0 +1,286 @@
+# app/write_behind.py
+
+import asyncio
+import logging
+import os
+import time
+from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from .exceptions import WriteQueueFullException
+from .metrics import metrics
+from .models import AssessmentResultBase
+from .repositories import AssessmentRepositoryBase
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_FLUSHES = metrics.histogram(
+    "write_behind_flush_duration_seconds",
+    "Time taken to save one batch of queued assessments.",
+)
+WRITE_BEHIND_BATCH_SIZE = metrics.histogram(
+    "write_behind_batch_size",
+    "Number of assessments saved per write-behind flush.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+WRITE_BEHIND_RETRIES = metrics.counter(
+    "write_behind_retries_total",
+    "Batches saved again after a failed attempt.",
+)
+WRITE_BEHIND_SPILLS = metrics.counter(
+    "write_behind_spilled_assessments_total",
+    "Queued assessments written to the spill file after their batch kept failing.",
+)
+WRITE_BEHIND_FAILURES = metrics.counter(
+    "write_behind_failed_assessments_total",
+    "Queued assessments lost because saving and spilling their batch failed.",
+)
+WRITE_BEHIND_REJECTIONS = metrics.counter(
+    "write_behind_rejections_total",
+    "Submissions rejected because the write-behind queue was full.",
+)
+
+
+class WriteBehindQueue:
+    """
+    Bounded queue of scored assessments that a background task saves in
+    batches, one save_many call (a single transaction on SQLite) per batch.
+
+    Assessments get their final ID when enqueued, so callers can answer
+    immediately; they become visible to reads once their batch is saved. A
+    batch is saved once batch_size assessments are waiting or flush_interval
+    seconds after its first one arrived, whichever comes first. Stopping the
+    queue saves everything still queued.
+
+    When the queue is full, enqueue waits up to block_timeout seconds for
+    room, or fails at once in "reject" mode, then raises
+    WriteQueueFullException.
+
+    A batch that fails to save is retried up to max_retries times, waiting
+    retry_delay seconds and doubling the wait each time. If it still fails,
+    it is appended to the spill file as JSON lines and the queue moves on,
+    so that one bad batch cannot stall it; spilled assessments are saved
+    after the next successful flush, or when the queue next starts. Without
+    a spill file the batch is logged and counted as lost.
+
+    Attributes:
+        repository (AssessmentRepositoryBase): Where batches are saved.
+        max_size (int): Most assessments waiting to be saved.
+        batch_size (int): Most assessments saved per batch.
+        flush_interval (float): Longest wait, in seconds, to fill a batch.
+        backpressure (str): "block" or "reject", what enqueue does when full.
+        block_timeout (float): Longest wait for room in "block" mode.
+        max_retries (int): Further attempts to save a failed batch.
+        retry_delay (float): Wait, in seconds, before the first retry.
+        spill_path (Optional[str]): File keeping batches that kept failing.
+    """
+
+    def __init__(
+        self,
+        repository: AssessmentRepositoryBase,
+        max_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        backpressure: str = "block",
+        block_timeout: float = 1.0,
+        max_retries: int = 3,
+        retry_delay: float = 0.1,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        if backpressure not in ("block", "reject"):
+            raise ValueError(f"Unknown backpressure mode {backpressure!r}")
+        self.repository = repository
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backpressure = backpressure
+        self.block_timeout = block_timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.spill_path = spill_path
+        # None is the wake-up sentinel put by stop()
+        self._queue: "Optional[asyncio.Queue[Optional[AssessmentResultBase]]]" = None
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._task: "Optional[asyncio.Task[None]]" = None
+        self._stopping = False
+        # Assessments enqueued but not saved yet, including the batch in hand
+        self._pending = 0
+
+    def depth(self) -> int:
+        """Number of assessments waiting to be saved."""
+        return self._pending
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._stopping
+
+    def start(self) -> None:
+        """Start the flusher task; must be called from the event loop."""
+        # Created here so that they bind to the running loop
+        self._queue = asyncio.Queue(self.max_size)
+        self._batch_ready = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Save everything still queued and stop the flusher task."""
+        if self._task is None or self._queue is None or self._batch_ready is None:
+            return
+        self._stopping = True
+        self._batch_ready.set()
+        try:
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            # The flusher is busy draining and sees the flag once done
+            pass
+        await self._task
+        self._task = None
+
+    async def enqueue(self, assessment: AssessmentResultBase) -> AssessmentResultBase:
+        """
+        Assign the assessment its ID and queue it to be saved.
+
+        Raises WriteQueueFullException when there is no room for it.
+        """
+        if not self.running or self._queue is None or self._batch_ready is None:
+            raise RuntimeError("The write-behind queue is not running")
+        if self.repository.blocking:
+            # Shared stores may renew their ID node's lease while assigning
+            await run_in_threadpool(self.repository.assign_ids, [assessment])
+        else:
+            self.repository.assign_ids([assessment])
+        queue = self._queue
+        try:
+            queue.put_nowait(assessment)
+        except asyncio.QueueFull:
+            if self.backpressure == "reject":
+                self._reject()
+            try:
+                await asyncio.wait_for(queue.put(assessment), self.block_timeout)
+            except asyncio.TimeoutError:
+                self._reject()
+        self._pending += 1
+        if queue.qsize() >= self.batch_size:
+            self._batch_ready.set()
+        return assessment
+
+    def _reject(self) -> None:
+        WRITE_BEHIND_REJECTIONS.inc()
+        raise WriteQueueFullException(
+            f"Write queue is full ({self.max_size} assessments waiting)."
+        )
+
+    async def _run(self) -> None:
+        assert self._queue is not None  # nosec B101
+        assert self._batch_ready is not None  # nosec B101
+        queue, batch_ready = self._queue, self._batch_ready
+        await self._replay_spilled()
+        while True:
+            item = await queue.get()
+            batch = [] if item is None else [item]
+            self._drain(batch)
+            if len(batch) < self.batch_size and not self._stopping:
+                # Give the batch until the interval ends to fill up
+                batch_ready.clear()
+                try:
+                    await asyncio.wait_for(batch_ready.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._drain(batch)
+            if batch:
+                await self._flush(batch)
+            if self._stopping and queue.empty():
+                return
+
+    def _drain(self, batch: List[AssessmentResultBase]) -> None:
+        assert self._queue is not None  # nosec B101
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if item is not None:
+                batch.append(item)
+
+    async def _save(self, batch: List[AssessmentResultBase]) -> None:
+        if self.repository.blocking:
+            await run_in_threadpool(self.repository.save_many, batch)
+        else:
+            self.repository.save_many(batch)
+
+    async def _flush(self, batch: List[AssessmentResultBase]) -> None:
+        start = time.perf_counter()
+        try:
+            saved = await self._save_with_retries(batch)
+        finally:
+            WRITE_BEHIND_FLUSHES.observe(time.perf_counter() - start)
+            WRITE_BEHIND_BATCH_SIZE.observe(len(batch))
+            self._pending -= len(batch)
+        if not saved:
+            self._spill(batch)
+        elif self.spill_path is not None and os.path.exists(self.spill_path):
+            # The repository is back, so earlier spills can be saved too
+            await self._replay_spilled()
+
+    async def _save_with_retries(self, batch: List[AssessmentResultBase]) -> bool:
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(delay)
+                delay *= 2
+                WRITE_BEHIND_RETRIES.inc()
+            try:
+                await self._save(batch)
+                return True
+            except Exception:
+                logger.exception(
+                    "Failed to save a batch of %s assessments (attempt %s of %s).",
+                    len(batch),
+                    attempt + 1,
+                    self.max_retries + 1,
+                )
+        return False
+
+    def _spill(self, batch: List[AssessmentResultBase]) -> None:
+        if self.spill_path is not None:
+            try:
+                with open(self.spill_path, "a", encoding="utf-8") as spill:
+                    spill.writelines(a.model_dump_json() + "\n" for a in batch)
+                WRITE_BEHIND_SPILLS.inc(amount=len(batch))
+                return
+            except OSError:
+                logger.exception("Failed to spill to %s.", self.spill_path)
+        WRITE_BEHIND_FAILURES.inc(amount=len(batch))
+
+    async def _replay_spilled(self) -> None:
+        """Save the spilled assessments not stored yet, then drop the file."""
+        path = self.spill_path
+        if path is None or not os.path.exists(path):
+            return
+        try:
+            with open(path, encoding="utf-8") as spill:
+                spilled = [
+                    AssessmentResultBase.model_validate_json(line)
+                    for line in spill
+                    if line.strip()
+                ]
+            for start in range(0, len(spilled), self.batch_size):
+                end = start + self.batch_size
+                unsaved = await self._unsaved(spilled[start:end])
+                if unsaved:
+                    await self._save(unsaved)
+        except Exception:
+            logger.exception("Failed to save the assessments spilled to %s.", path)
+            return
+        os.remove(path)
+        logger.info("Saved %s assessments spilled to %s.", len(spilled), path)
+
+    async def _unsaved(
+        self, batch: List[AssessmentResultBase]
+    ) -> List[AssessmentResultBase]:
+        # A replay interrupted after saving must not save them twice
+        ids = [a.id for a in batch]
+        if self.repository.blocking:
+            stored = await run_in_threadpool(self.repository.get_many, ids)
+        else:
+            stored = self.repository.get_many(ids)
+        return [a for a in batch if a.id not in stored]
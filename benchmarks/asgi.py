@@ -0,0 +1,49 @@
+# benchmarks/asgi.py
+"""Drive an ASGI app directly, without an HTTP client in the measurement."""
+
+from typing import Any, Dict, List, MutableMapping, Optional, Tuple
+from starlette.types import ASGIApp
+
+
+async def asgi_request(
+    target: ASGIApp,
+    method: str,
+    path: str,
+    body: bytes = b"",
+    headers: Optional[Dict[str, str]] = None,
+    query_string: bytes = b"",
+    client: Tuple[str, int] = ("127.0.0.1", 50000),
+) -> Tuple[int, Dict[str, str], bytes]:
+    """Send one HTTP request through the ASGI interface and collect the reply."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string,
+        "root_path": "",
+        "headers": [
+            (name.lower().encode(), value.encode())
+            for name, value in (headers or {}).items()
+        ],
+        "client": client,
+        "server": ("bench", 80),
+    }
+    messages: List[MutableMapping[str, Any]] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: MutableMapping[str, Any]) -> None:
+        messages.append(message)
+
+    await target(scope, receive, send)
+    start = messages[0]
+    return (
+        start["status"],
+        {k.decode(): v.decode() for k, v in start["headers"]},
+        b"".join(m.get("body", b"") for m in messages[1:]),
+    )
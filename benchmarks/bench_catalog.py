@@ -0,0 +1,99 @@
+# benchmarks/bench_catalog.py
+"""
+Measure requests per second of the survey catalog endpoints, comparing the
+pre-serialized ETag responses with per-request model building and a 304 reply.
+
+Usage: python -m benchmarks.bench_catalog [--requests N]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+from fastapi import FastAPI, HTTPException
+from benchmarks.asgi import asgi_request
+from app.main import get_survey_details, get_survey_questions, list_surveys
+from app.models import QuestionBase, SurveyModel, SurveySummary
+from app.survey_registry import survey_registry
+
+# The previous handlers, which rebuilt models and re-validated them per call
+legacy_app = FastAPI()
+
+
+@legacy_app.get("/v1/surveys/", response_model=List[SurveySummary])
+async def legacy_list_surveys() -> List[SurveySummary]:
+    return [
+        SurveySummary(id=survey.id, name=survey.name, survey_type=survey.survey_type)
+        for survey in survey_registry.list_surveys()
+    ]
+
+
+@legacy_app.get("/v1/surveys/{survey_id}", response_model=SurveyModel)
+async def legacy_get_survey_details(survey_id: int) -> SurveyModel:
+    survey = survey_registry.get_survey(survey_id)
+    if not survey:
+        raise HTTPException(status_code=404, detail="Survey not found")
+    return SurveyModel(
+        id=survey.id,
+        name=survey.name,
+        survey_type=survey.survey_type,
+        questions=survey.questions,
+    )
+
+
+@legacy_app.get("/v1/surveys/{survey_id}/questions", response_model=List[QuestionBase])
+async def legacy_get_survey_questions(survey_id: int) -> List[QuestionBase]:
+    survey = survey_registry.get_survey(survey_id)
+    if not survey:
+        raise HTTPException(status_code=404, detail="Survey not found")
+    return survey.questions
+
+
+# The current handlers mounted on an equally bare app, so that both sides pay
+# the same routing and middleware cost
+cached_app = FastAPI()
+cached_app.get("/v1/surveys/", response_model=List[SurveySummary])(list_surveys)
+cached_app.get("/v1/surveys/{survey_id}", response_model=SurveyModel)(
+    get_survey_details
+)
+cached_app.get("/v1/surveys/{survey_id}/questions", response_model=List[QuestionBase])(
+    get_survey_questions
+)
+
+PATHS = ["/v1/surveys/", "/v1/surveys/1", "/v1/surveys/1/questions"]
+
+
+async def requests_per_second(
+    target: FastAPI, path: str, count: int, headers: Optional[Dict[str, str]] = None
+) -> float:
+    await asgi_request(target, "GET", path, headers=headers)  # warm up
+    start = time.perf_counter()
+    for _ in range(count):
+        await asgi_request(target, "GET", path, headers=headers)
+    return count / (time.perf_counter() - start)
+
+
+async def run(count: int) -> None:
+    print(f"{'path':<28}{'rebuilt':>12}{'cached':>12}{'304':>12}")
+    for path in PATHS:
+        rebuilt = await requests_per_second(legacy_app, path, count)
+        cached = await requests_per_second(cached_app, path, count)
+        _, response_headers, _ = await asgi_request(cached_app, "GET", path)
+        etag = response_headers["etag"]
+        not_modified = await requests_per_second(
+            cached_app, path, count, {"If-None-Match": etag}
+        )
+        print(f"{path:<28}{rebuilt:>12,.0f}{cached:>12,.0f}{not_modified:>12,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_logging.py
+"""
+Measure submission latency (p50/p99) with logging off, with synchronous
+stream logging, and with the queue-based logging, with and without sampling
+of the scoring logs.
+
+Usage: python -m benchmarks.bench_logging [--requests N]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import tempfile
+import time
+from typing import Callable, List, Tuple
+from benchmarks.asgi import asgi_request
+from app.logging_config import TEXT_FORMAT, configure_logging, stop_logging
+from app.main import app
+
+BODY = json.dumps(
+    {
+        "survey_id": 1,
+        "answers": [{"question_id": i, "score": 4} for i in range(1, 5)],
+        "timestamp": "2024-01-01T12:00:00Z",
+    }
+).encode()
+HEADERS = {"content-type": "application/json"}
+
+
+async def latencies(count: int) -> List[float]:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        status, _, _ = await asgi_request(
+            app, "POST", "/v1/surveys/1/responses", BODY, HEADERS
+        )
+        samples.append((time.perf_counter() - start) * 1e6)
+        assert status == 200  # nosec B101
+    return samples
+
+
+def synchronous_logging(path: str) -> None:
+    """The previous setup: a stream handler formatting on the calling thread."""
+    stop_logging()
+    handler = logging.StreamHandler(open(path, "a"))
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    logging.getLogger().addHandler(handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = f"{directory}/bench.log"
+        scenarios: List[Tuple[str, Callable[[], object]]] = [
+            ("off", lambda: logging.disable(logging.CRITICAL)),
+            ("sync stream", lambda: synchronous_logging(log_path)),
+            ("queue json", lambda: configure_logging(stream=open(log_path, "a"))),
+            (
+                "queue json, 1% scoring",
+                lambda: configure_logging(
+                    stream=open(log_path, "a"),
+                    sampling={"app.surveys.shs": 0.01, "app.surveys.stress": 0.01},
+                ),
+            ),
+        ]
+        for name, setup in scenarios:
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            logging.disable(logging.NOTSET)
+            setup()
+            asyncio.run(latencies(200))  # warm up
+            samples = asyncio.run(latencies(args.requests))
+            p99 = statistics.quantiles(samples, n=100)[98]
+            print(
+                f"{name:<24} p50 {statistics.median(samples):8.0f} us   "
+                f"p99 {p99:8.0f} us"
+            )
+            stop_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/bench_memory.py
+"""
+Compare the memory held by the dict-backed and columnar in-memory stores
+after loading 1M and 10M assessments.
+
+Each load runs in a fresh process and is measured as the growth of its
+resident set size, which includes NumPy buffers and allocator overhead. The
+dict store is only loaded up to --dict-limit assessments, since 10M models
+take more memory than most machines have; above that, its figure is
+extrapolated from the bytes per assessment measured at the limit.
+
+Usage: python -m benchmarks.bench_memory [--sizes 1000000,10000000]
+           [--dict-limit N]
+"""
+
+import argparse
+import gc
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+from app.models import AssessmentResultBase, SurveyType
+from app.repositories import (
+    AssessmentRepository,
+    AssessmentRepositoryBase,
+    ColumnarAssessmentRepository,
+)
+
+BATCH_SIZE = 10_000
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+CADENCES = {1: SurveyType.WEEKLY, 2: SurveyType.WEEKLY}
+STORES: Dict[
+    str, Callable[[Optional[Mapping[int, SurveyType]]], AssessmentRepositoryBase]
+] = {
+    "dict": AssessmentRepository,
+    "columnar": ColumnarAssessmentRepository,
+}
+
+
+def batches(total: int) -> Iterator[List[AssessmentResultBase]]:
+    """Alternate SHS-like and stress-like assessments, one minute apart."""
+    for first in range(0, total, BATCH_SIZE):
+        batch = []
+        for index in range(first, min(first + BATCH_SIZE, total)):
+            survey_id = 1 + index % 2
+            key = "happiness_score" if survey_id == 1 else "stress_score"
+            batch.append(
+                AssessmentResultBase(
+                    id=0,
+                    survey_id=survey_id,
+                    scores={key: 1 + index % 25 / 4},
+                    timestamp=START + timedelta(minutes=index),
+                )
+            )
+        yield batch
+
+
+def resident_bytes() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure(store: str, total: int) -> Tuple[int, float]:
+    """Load total assessments into a new store; return bytes held and seconds."""
+    logging.disable(logging.INFO)
+    factory = STORES[store]
+    gc.collect()
+    before = resident_bytes()
+    started = time.perf_counter()
+    repository = factory(CADENCES)
+    for batch in batches(total):
+        repository.save_many(batch)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    held = resident_bytes() - before
+    assert repository.count() == total  # nosec B101
+    return held, elapsed
+
+
+def measure_in_child(store: str, total: int) -> Tuple[int, float]:
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(measure, store, total).result()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000000,10000000")
+    parser.add_argument("--dict-limit", type=int, default=1_000_000)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    print(f"{'store':<10} {'assessments':>12} {'MiB':>10} {'B/each':>8} {'load s':>8}")
+    dict_bytes_each = 0.0
+    for total in sizes:
+        if total <= args.dict_limit or not dict_bytes_each:
+            held, elapsed = measure_in_child("dict", min(total, args.dict_limit))
+            dict_bytes_each = held / min(total, args.dict_limit)
+            note = f"{elapsed:8.1f}"
+        if total > args.dict_limit:
+            held = int(dict_bytes_each * total)
+            note = "   (extrapolated)"
+        print(
+            f"{'dict':<10} {total:>12,} {held / 2**20:10.1f} "
+            f"{held / total:8.0f} {note}"
+        )
+        held, elapsed = measure_in_child("columnar", total)
+        print(
+            f"{'columnar':<10} {total:>12,} {held / 2**20:10.1f} "
+            f"{held / total:8.0f} {elapsed:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
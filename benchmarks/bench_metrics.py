@@ -0,0 +1,56 @@
+# benchmarks/bench_metrics.py
+"""
+Measure the cost of recording a metric: a counter increment, a histogram
+observation and a timed block. Exits non-zero when an increment or an
+observation exceeds the per-call budget, so that metrics stay cheap enough
+for the hot path. The timed block also pays for two clock reads and the
+context manager protocol, and is reported for information only.
+
+Usage: python -m benchmarks.bench_metrics [--iterations N] [--budget-ns NS]
+"""
+
+import argparse
+import sys
+import timeit
+from typing import Callable, Dict
+from app.metrics import MetricsRegistry
+
+
+def per_call_ns(func: Callable[[], None], iterations: int) -> float:
+    # Best of several runs, to keep scheduler noise out of the comparison
+    runs = timeit.repeat(func, number=iterations, repeat=5)
+    return min(runs) / iterations * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--budget-ns", type=float, default=1000.0)
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "Benchmark counter.", ("type",))
+    histogram = registry.histogram("bench_seconds", "Benchmark histogram.", ("stage",))
+
+    def timed_block() -> None:
+        with histogram.time("timed"):
+            pass
+
+    budgeted: Dict[str, Callable[[], None]] = {
+        "counter.inc": lambda: counter.inc("error"),
+        "histogram.observe": lambda: histogram.observe(0.0042, "score"),
+    }
+    over_budget = False
+    for name, func in budgeted.items():
+        cost = per_call_ns(func, args.iterations)
+        over_budget = over_budget or cost > args.budget_ns
+        print(f"{name:<20} {cost:8.0f} ns/call")
+    cost = per_call_ns(timed_block, args.iterations)
+    print(f"{'histogram.time':<20} {cost:8.0f} ns/call (not budgeted)")
+    if over_budget:
+        print(f"Metric recording exceeds the {args.budget_ns:.0f} ns budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_repository.py
+"""
+Compare insert and lookup throughput of the in-memory and SQLite repositories.
+
+Usage: python -m benchmarks.bench_repository [--records N] [--batch-size N]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List
+from app.models import AssessmentResultBase
+from app.repositories import (
+    AssessmentRepository,
+    AssessmentRepositoryBase,
+    SQLiteAssessmentRepository,
+)
+
+
+def make_assessments(count: int) -> List[AssessmentResultBase]:
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        AssessmentResultBase(
+            id=0,
+            survey_id=1 + i % 2,
+            scores={"happiness_score": round(random.uniform(1, 7), 2)},
+            timestamp=timestamp,
+        )
+        for i in range(count)
+    ]
+
+
+def rate(count: int, func: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def run(
+    name: str, factory: Callable[[], AssessmentRepositoryBase], records: int, batch: int
+) -> None:
+    single_repo = factory()
+    single = make_assessments(records)
+
+    def insert_one_by_one() -> None:
+        for assessment in single:
+            single_repo.save(assessment)
+
+    batch_repo = factory()
+    batched = make_assessments(records)
+
+    def insert_in_batches() -> None:
+        for start in range(0, records, batch):
+            end = start + batch
+            batch_repo.save_many(batched[start:end])
+
+    ids: List[int] = []
+
+    def lookup() -> None:
+        for assessment_id in ids:
+            batch_repo.get(assessment_id)
+
+    single_rate = rate(records, insert_one_by_one)
+    batch_rate = rate(records, insert_in_batches)
+    ids = [a.id for a in batched]
+    random.shuffle(ids)
+    lookup_rate = rate(records, lookup)
+
+    print(
+        f"{name:<8} insert {single_rate:>12,.0f}/s   "
+        f"batched insert {batch_rate:>12,.0f}/s   lookup {lookup_rate:>12,.0f}/s"
+    )
+    single_repo.close()
+    batch_repo.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    run("dict", AssessmentRepository, args.records, args.batch_size)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = iter(Path(directory) / f"bench-{i}.db" for i in range(2))
+        run(
+            "sqlite",
+            lambda: SQLiteAssessmentRepository(str(next(paths))),
+            args.records,
+            args.batch_size,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_responses.py
+"""
+Compare handler latency with FastAPI's response_model validation and with
+the fast response mode, which serializes the handler's models directly.
+
+Usage: python -m benchmarks.bench_responses [--requests N]
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import logging
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+import app.main
+from app.main import app as api, assessment_repository
+from app.models import AssessmentResultBase
+from app.settings import settings
+from benchmarks.asgi import asgi_request
+
+HEADERS = {"content-type": "application/json"}
+SUBMISSION = json.dumps(
+    {
+        "survey_id": 1,
+        "answers": [{"question_id": i, "score": 4} for i in range(1, 5)],
+        "timestamp": "2024-01-01T12:00:00Z",
+    }
+).encode()
+CASES: Dict[str, Tuple[str, str, bytes]] = {
+    "submit_response": ("POST", "/v1/surveys/1/responses", SUBMISSION),
+    "stats": ("GET", "/v1/surveys/1/stats", b""),
+    "trend (2 years)": ("GET", "/v1/surveys/1/trend", b""),
+    "interpretations x1000": (
+        "POST",
+        "/v1/surveys/2/interpretations",
+        json.dumps({"scores": [i % 6 for i in range(1000)]}).encode(),
+    ),
+}
+
+
+def seed_history() -> None:
+    """Two years of daily assessments, so the trend has ~100 weekly buckets."""
+    start = datetime(2022, 1, 1, tzinfo=timezone.utc)
+    assessment_repository.save_many(
+        [
+            AssessmentResultBase(
+                id=0,
+                survey_id=1,
+                scores={"happiness_score": 1 + day % 25 / 4},
+                timestamp=start + timedelta(days=day),
+            )
+            for day in range(730)
+        ]
+    )
+
+
+async def latencies(method: str, path: str, body: bytes, count: int) -> List[float]:
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        status, _, _ = await asgi_request(api, method, path, body, HEADERS)
+        samples.append((time.perf_counter() - started) * 1e6)
+        assert status == 200  # nosec B101
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    seed_history()
+
+    print(f"{'endpoint':<24} {'validated p50':>14} {'fast p50':>10} {'speedup':>8}")
+    for name, (method, path, body) in CASES.items():
+        medians = []
+        for fast in (False, True):
+            vars(app.main)["settings"] = dataclasses.replace(
+                settings, fast_responses=fast
+            )
+            samples = asyncio.run(latencies(method, path, body, args.requests))
+            medians.append(statistics.median(samples))
+        validated, fast_median = medians
+        print(
+            f"{name:<24} {validated:11.0f} us {fast_median:7.0f} us "
+            f"{validated / fast_median:7.2f}x"
+        )
+    vars(app.main)["settings"] = settings
+
+
+if __name__ == "__main__":
+    main()
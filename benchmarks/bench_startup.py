@@ -0,0 +1,63 @@
+# benchmarks/bench_startup.py
+"""
+Measure cold-start latency: interpreter start to app import, and app import
+to the first served request, each in a fresh process.
+
+Usage: python -m benchmarks.bench_startup [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess  # nosec B404
+import sys
+from typing import Dict, List
+
+# Runs inside each child process and prints its timings as JSON
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from benchmarks.asgi import asgi_request
+status, _, _ = asyncio.run(asgi_request(app, "GET", "/v1/surveys/"))
+served = time.perf_counter()
+assert status == 200
+print(json.dumps({"import": imported - start, "first_request": served - imported}))
+"""
+
+
+def measure(runs: int, env: Dict[str, str]) -> Dict[str, List[float]]:
+    timings: Dict[str, List[float]] = {"import": [], "first_request": []}
+    for _ in range(runs):
+        output = subprocess.run(  # nosec B603
+            [sys.executable, "-c", CHILD],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        for key in timings:
+            timings[key].append(result[key] * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    stamped = dict(os.environ, APP_VERSION="bench")
+    git_fallback = {k: v for k, v in os.environ.items() if k != "APP_VERSION"}
+    for name, env in (("stamped", stamped), ("git fallback", git_fallback)):
+        timings = measure(args.runs, env)
+        print(
+            f"{name:<14} import {statistics.median(timings['import']):8.1f} ms   "
+            f"first request {statistics.median(timings['first_request']):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
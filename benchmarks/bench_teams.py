@@ -0,0 +1,110 @@
+# benchmarks/bench_teams.py
+"""
+Measure per-team query latency as the number of teams grows: listing a
+team's assessments, reading its statistics and estimating its percentiles
+from its partition, against filtering a full scan of the repository.
+
+Usage: python -m benchmarks.bench_teams [--per-team N] [--teams N ...] [--sqlite]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, List
+from app.models import AssessmentResultBase
+from app.repositories import (
+    AssessmentRepository,
+    AssessmentRepositoryBase,
+    SQLiteAssessmentRepository,
+)
+
+QUERIES = 1000
+# Full scans are slow; fewer of them keep the run short
+SCANS = 5
+
+
+def make_assessments(teams: int, per_team: int) -> List[AssessmentResultBase]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        AssessmentResultBase(
+            id=0,
+            survey_id=2,
+            scores={"stress_score": float(random.randint(1, 5))},
+            timestamp=start + timedelta(hours=i),
+            team_id=f"team-{i % teams}",
+        )
+        for i in range(teams * per_team)
+    ]
+
+
+def microseconds_per_call(
+    calls: int, func: Callable[[str], object], teams: int
+) -> float:
+    team_ids = [f"team-{random.randrange(teams)}" for _ in range(calls)]
+    start = time.perf_counter()
+    for team_id in team_ids:
+        func(team_id)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def run(repository: AssessmentRepositoryBase, teams: int, per_team: int) -> None:
+    assessments = make_assessments(teams, per_team)
+    for start in range(0, len(assessments), 1000):
+        end = start + 1000
+        repository.save_many(assessments[start:end])
+
+    def list_team(team_id: str) -> object:
+        return repository.list_team_after(team_id, 0, 100)
+
+    def team_stats(team_id: str) -> object:
+        stats = repository.aggregates(2, team_id).stats
+        return {key: score.mean for key, score in stats.scores(2).items()}
+
+    def team_percentiles(team_id: str) -> object:
+        stats = repository.aggregates(2, team_id).stats
+        return [
+            sketch.quantiles([0.5, 0.9, 0.99]) for sketch in stats.sketches(2).values()
+        ]
+
+    def full_scan(team_id: str) -> object:
+        return [
+            assessment
+            for page in repository.iter_assessments()
+            for assessment in page
+            if assessment.team_id == team_id
+        ][:100]
+
+    print(
+        f"{teams:>8,} teams {len(assessments):>10,} assessments   "
+        f"list {microseconds_per_call(QUERIES, list_team, teams):>8.1f}µs   "
+        f"stats {microseconds_per_call(QUERIES, team_stats, teams):>6.1f}µs   "
+        f"p50/p90/p99 {microseconds_per_call(QUERIES, team_percentiles, teams):>6.1f}µs"
+        f"   full scan {microseconds_per_call(SCANS, full_scan, teams) / 1000:>9.1f}ms"
+    )
+    repository.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--per-team", type=int, default=5)
+    parser.add_argument(
+        "--teams", type=int, nargs="+", default=[10, 100, 1_000, 10_000, 50_000]
+    )
+    parser.add_argument("--sqlite", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for teams in args.teams:
+            repository: AssessmentRepositoryBase = (
+                SQLiteAssessmentRepository(str(Path(directory) / f"teams-{teams}.db"))
+                if args.sqlite
+                else AssessmentRepository()
+            )
+            run(repository, teams, args.per_team)
+
+
+if __name__ == "__main__":
+    main()
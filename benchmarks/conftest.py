@@ -0,0 +1,13 @@
+# benchmarks/conftest.py
+
+import logging
+from typing import Iterator
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging() -> Iterator[None]:
+    """Keep log formatting and I/O out of the measured functions."""
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
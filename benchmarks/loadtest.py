@@ -0,0 +1,276 @@
+# benchmarks/loadtest.py
+"""
+Load test the API with a realistic mix of catalog reads, survey details,
+response submissions and interpretation lookups, and compare the results
+against a stored baseline.
+
+The app is driven in-process through httpx's ASGI transport by default, or
+over HTTP with --base-url (e.g. against a local uvicorn). Each run records
+requests per second and p50/p95/p99 latency per endpoint, as the median of
+--runs repeated runs, since a single run's tail latency varies widely. The
+check fails if any endpoint's RPS dropped or its p50 grew by more than the
+threshold, or its p99 grew by more than the looser p99 threshold, and
+without a baseline file, rather than passing against nothing; record one
+with --update-baseline.
+
+Usage: python -m benchmarks.loadtest [--requests N] [--concurrency C]
+           [--runs N] [--base-url URL] [--baseline PATH]
+           [--threshold FRACTION] [--p99-threshold FRACTION]
+           [--update-baseline] [--output PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import httpx
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+METRICS = ["rps", "mean_ms", "p50_ms", "p95_ms", "p99_ms"]
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    weight: int
+    method: str
+    path: str
+    body: Optional[Dict[str, Any]] = None
+
+
+def _submission(survey_id: int, question_ids: List[int]) -> Dict[str, Any]:
+    return {
+        "survey_id": survey_id,
+        "answers": [{"question_id": qid, "score": 3} for qid in question_ids],
+        "timestamp": "2024-01-01T12:00:00Z",
+    }
+
+
+# Weights approximate production traffic: mostly reads, one in five a write
+MIX = [
+    Endpoint("list_surveys", 30, "GET", "/v1/surveys/"),
+    Endpoint("get_survey", 25, "GET", "/v1/surveys/1"),
+    Endpoint(
+        "submit_response",
+        20,
+        "POST",
+        "/v1/surveys/1/responses",
+        _submission(1, [1, 2, 3, 4]),
+    ),
+    Endpoint("get_interpretation", 25, "GET", "/v1/surveys/2/interpretation/3"),
+]
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_load(
+    client: httpx.AsyncClient, total: int, concurrency: int, seed: int
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    weights = [endpoint.weight for endpoint in MIX]
+    schedule = rng.choices(MIX, weights=weights, k=total)
+    latencies: Dict[str, List[float]] = {endpoint.name: [] for endpoint in MIX}
+    failures: Dict[str, int] = {endpoint.name: 0 for endpoint in MIX}
+    position = 0
+
+    async def worker() -> None:
+        nonlocal position
+        while position < len(schedule):
+            endpoint = schedule[position]
+            position += 1
+            start = time.perf_counter()
+            response = await client.request(
+                endpoint.method, endpoint.path, json=endpoint.body
+            )
+            elapsed = time.perf_counter() - start
+            latencies[endpoint.name].append(elapsed)
+            if response.status_code >= 400:
+                failures[endpoint.name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    endpoints = {}
+    for name, samples in latencies.items():
+        if not samples:
+            continue
+        endpoints[name] = {
+            "requests": len(samples),
+            "failures": failures[name],
+            "rps": len(samples) / duration,
+            "mean_ms": statistics.fmean(samples) * 1e3,
+            "p50_ms": percentile(samples, 0.50) * 1e3,
+            "p95_ms": percentile(samples, 0.95) * 1e3,
+            "p99_ms": percentile(samples, 0.99) * 1e3,
+        }
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "rps": total / duration,
+        "endpoints": endpoints,
+    }
+
+
+def median_result(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine repeated runs into one result holding each metric's median."""
+    endpoints = {}
+    for name in runs[0]["endpoints"]:
+        samples = [run["endpoints"][name] for run in runs if name in run["endpoints"]]
+        endpoint = {
+            "requests": sum(sample["requests"] for sample in samples),
+            "failures": sum(sample["failures"] for sample in samples),
+        }
+        for metric in METRICS:
+            endpoint[metric] = statistics.median(sample[metric] for sample in samples)
+        endpoints[name] = endpoint
+    return {
+        "requests": runs[0]["requests"],
+        "concurrency": runs[0]["concurrency"],
+        "runs": len(runs),
+        "duration_s": statistics.median(run["duration_s"] for run in runs),
+        "rps": statistics.median(run["rps"] for run in runs),
+        "endpoints": endpoints,
+    }
+
+
+def find_regressions(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    p99_threshold: float,
+) -> List[str]:
+    """
+    List the endpoints whose throughput fell, or whose p50 latency rose, by
+    more than the threshold fraction relative to the baseline, or whose p99
+    latency rose by more than p99_threshold.
+    """
+    regressions = []
+    for name, before in baseline["endpoints"].items():
+        after = current["endpoints"].get(name)
+        if after is None:
+            continue
+        if after["rps"] < before["rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: {after['rps']:.0f} rps, baseline {before['rps']:.0f} rps"
+            )
+        for metric, allowed in (("p50_ms", threshold), ("p99_ms", p99_threshold)):
+            if after[metric] > before[metric] * (1 + allowed):
+                regressions.append(
+                    f"{name}: {metric[:3]} {after[metric]:.2f} ms, "
+                    f"baseline {before[metric]:.2f} ms"
+                )
+    return regressions
+
+
+def make_client(base_url: Optional[str]) -> httpx.AsyncClient:
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url)
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://loadtest")
+
+
+async def load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    async with make_client(args.base_url) as client:
+        # Warm up caches and connection pools outside the measurement
+        await run_load(client, min(200, args.requests), args.concurrency, args.seed)
+        runs = [
+            await run_load(client, args.requests, args.concurrency, args.seed)
+            for _ in range(args.runs)
+        ]
+    return median_result(runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Repeated runs to take medians over"
+    )
+    parser.add_argument("--base-url", help="Target a running server instead")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed RPS drop or p50 growth, as a fraction of the baseline",
+    )
+    parser.add_argument(
+        "--p99-threshold",
+        type=float,
+        default=0.5,
+        help="Allowed p99 growth, as a fraction of the baseline",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="Also write this run's results here")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--with-logs", action="store_true", help="Keep the app's INFO logs on"
+    )
+    args = parser.parse_args()
+
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        print(
+            f"No baseline at {args.baseline}; record one with --update-baseline "
+            "(make bench-baseline) on this machine first",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    if not args.with_logs:
+        logging.disable(logging.INFO)
+    result = asyncio.run(load_test(args))
+
+    print(f"{'endpoint':<20} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, stats in result["endpoints"].items():
+        print(
+            f"{name:<20} {stats['rps']:8.0f} {stats['p50_ms']:8.2f} "
+            f"{stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f}"
+        )
+    print(f"{'total':<20} {result['rps']:8.0f}  (medians of {result['runs']} runs)")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(result, file, indent=2)
+
+    failed = sum(stats["failures"] for stats in result["endpoints"].values())
+    if failed:
+        print(f"{failed} requests failed")
+        sys.exit(1)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(result, file, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = find_regressions(baseline, result, args.threshold, args.p99_threshold)
+    limits = (
+        f"{args.threshold:.0%} (RPS, p50) or {args.p99_threshold:.0%} (p99) "
+        "of the baseline"
+    )
+    if regressions:
+        print(f"Regressions beyond {limits}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"No regressions beyond {limits}")
+
+
+if __name__ == "__main__":
+    main()
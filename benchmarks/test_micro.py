@@ -0,0 +1,126 @@
+# benchmarks/test_micro.py
+"""
+Microbenchmarks for the hot functions of a submission, each at several input
+sizes including synthetic 50-question surveys, so that per-item costs and
+accidental superlinear growth show up when runs are compared.
+
+Usage: python -m pytest benchmarks --benchmark-json=micro.json
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import List
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from app.main import _validate_response
+from app.models import AnswerBase, AssessmentResultBase, QuestionBase, ResponseBase
+from app.repositories import AssessmentRepository
+from app.survey_plan import SurveyPlan
+from app.surveys.shs import SHSScoringMechanism
+from app.surveys.stress import StressScoringMechanism
+
+QUESTION_COUNTS = [1, 4, 10, 50]
+REPOSITORY_SIZES = [0, 1_000, 100_000]
+TIMESTAMP = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def synthetic_questions(count: int) -> List[QuestionBase]:
+    """A survey of `count` 7-point questions, every third one reverse-scored."""
+    return [
+        QuestionBase(
+            id=qid,
+            text=f"Question {qid}",
+            scale_min=1,
+            scale_max=7,
+            scale_min_label="low",
+            scale_max_label="high",
+            reverse_scored=qid % 3 == 0,
+        )
+        for qid in range(1, count + 1)
+    ]
+
+
+def synthetic_answers(questions: List[QuestionBase]) -> List[AnswerBase]:
+    return [
+        AnswerBase(question_id=question.id, score=(question.id % 7) + 1)
+        for question in questions
+    ]
+
+
+@pytest.mark.parametrize("count", QUESTION_COUNTS)
+def test_shs_calculate_score(benchmark: BenchmarkFixture, count: int) -> None:
+    questions = synthetic_questions(count)
+    answers = synthetic_answers(questions)
+    plan = SurveyPlan.from_questions(questions)
+    mechanism = SHSScoringMechanism()
+    benchmark(mechanism.calculate_score, answers, questions, plan)
+
+
+@pytest.mark.parametrize("count", QUESTION_COUNTS)
+def test_stress_calculate_score(benchmark: BenchmarkFixture, count: int) -> None:
+    questions = synthetic_questions(count)
+    answers = synthetic_answers(questions)
+    plan = SurveyPlan.from_questions(questions)
+    mechanism = StressScoringMechanism()
+    benchmark(mechanism.calculate_score, answers, questions, plan)
+
+
+@pytest.mark.parametrize("count", QUESTION_COUNTS)
+def test_validate_response(benchmark: BenchmarkFixture, count: int) -> None:
+    questions = synthetic_questions(count)
+    plan = SurveyPlan.from_questions(questions)
+    response = ResponseBase(
+        survey_id=1, answers=synthetic_answers(questions), timestamp=TIMESTAMP
+    )
+    benchmark(_validate_response, plan, response)
+
+
+@pytest.mark.parametrize("count", QUESTION_COUNTS)
+def test_response_parsing(benchmark: BenchmarkFixture, count: int) -> None:
+    body = json.dumps(
+        {
+            "survey_id": 1,
+            "answers": [
+                {"question_id": qid, "score": 4} for qid in range(1, count + 1)
+            ],
+            "timestamp": TIMESTAMP.isoformat(),
+        }
+    )
+    benchmark(ResponseBase.model_validate_json, body)
+
+
+@pytest.mark.parametrize("count", QUESTION_COUNTS)
+def test_assessment_serialization(benchmark: BenchmarkFixture, count: int) -> None:
+    assessment = AssessmentResultBase(
+        id=1,
+        survey_id=1,
+        scores={f"score_{i}": i / 7 for i in range(count)},
+        timestamp=TIMESTAMP,
+    )
+    benchmark(assessment.model_dump_json)
+
+
+@pytest.mark.parametrize("size", REPOSITORY_SIZES)
+def test_repository_save(benchmark: BenchmarkFixture, size: int) -> None:
+    repository = AssessmentRepository()
+    repository.save_many(
+        [
+            AssessmentResultBase(
+                id=0,
+                survey_id=1,
+                scores={"happiness_score": 4.0},
+                timestamp=TIMESTAMP,
+            )
+            for _ in range(size)
+        ]
+    )
+    assessment = AssessmentResultBase(
+        id=0, survey_id=1, scores={"happiness_score": 4.0}, timestamp=TIMESTAMP
+    )
+
+    def save_new() -> None:
+        # Clear the ID so every round stores a new assessment
+        assessment.id = 0
+        repository.save(assessment)
+
+    benchmark(save_new)
@@ -0,0 +1,30 @@
+# tests/helpers.py
+
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from app.models import AssessmentResultBase
+
+TIMESTAMP = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_assessment(
+    score: float = 3.0,
+    survey_id: int = 2,
+    *,
+    key: str = "stress_score",
+    scores: Optional[Dict[str, float]] = None,
+    timestamp: datetime = TIMESTAMP,
+    team_id: Optional[str] = None,
+    assessment_id: int = 0,
+) -> AssessmentResultBase:
+    """
+    An assessment with a single score under key, or the given scores. Its ID
+    is 0, so saving assigns one, unless assessment_id is given.
+    """
+    return AssessmentResultBase(
+        id=assessment_id,
+        survey_id=survey_id,
+        scores={key: score} if scores is None else scores,
+        timestamp=timestamp,
+        team_id=team_id,
+    )
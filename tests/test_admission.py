@@ -0,0 +1,186 @@
+# tests/test_admission.py
+
+import asyncio
+import time
+from typing import List, Optional, Tuple
+import httpx
+import pytest
+from pytest_assume.plugin import assume
+from starlette.types import Receive, Scope, Send
+from app.admission import (
+    HIGH,
+    LOW,
+    AdmissionMiddleware,
+    AdmissionRejected,
+    ConcurrencyLimiter,
+    RateLimiter,
+    _client_key,
+    _priority,
+)
+
+# Time each request holds the shared resource of the app below
+WORK_SECONDS = 0.005
+
+
+def make_app() -> AdmissionMiddleware:
+    """An app whose requests take turns on one resource, like a busy CPU."""
+    resource = asyncio.Lock()
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        async with resource:
+            await asyncio.sleep(WORK_SECONDS)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return AdmissionMiddleware(app)
+
+
+async def run_wave(
+    app: AdmissionMiddleware, requests: int
+) -> List[Tuple[int, float, Optional[str]]]:
+    """Fire all requests at once; return status, latency and Retry-After."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+
+        async def one() -> Tuple[int, float, Optional[str]]:
+            start = time.perf_counter()
+            response = await c.post("/v1/surveys/2/responses")
+            elapsed = time.perf_counter() - start
+            return response.status_code, elapsed, response.headers.get("retry-after")
+
+        return await asyncio.gather(*(one() for _ in range(requests)))
+
+
+def p99(latencies: List[float]) -> float:
+    ordered = sorted(latencies)
+    return ordered[int(len(ordered) * 0.99) - 1]
+
+
+def test_rate_limiter_refills_per_client() -> None:
+    limiter = RateLimiter(rate=2, burst=2)
+    limiter.acquire("a", now=0)
+    limiter.acquire("a", now=0)
+    with pytest.raises(AdmissionRejected) as rejected:
+        limiter.acquire("a", now=0)
+    assume(rejected.value.status_code == 429)
+    assume(rejected.value.retry_after == pytest.approx(0.5))
+    # Other clients have their own bucket, and tokens come back over time
+    limiter.acquire("b", now=0)
+    limiter.acquire("a", now=0.5)
+
+
+def test_rate_limiter_forgets_least_recent_clients() -> None:
+    limiter = RateLimiter(rate=1, burst=1, max_clients=2)
+    for client in ("a", "b", "c"):
+        limiter.acquire(client, now=0)
+    # "a" was dropped, so it starts again with a full bucket
+    limiter.acquire("a", now=0)
+    with pytest.raises(AdmissionRejected):
+        limiter.acquire("c", now=0)
+
+
+def test_only_known_api_keys_identify_clients() -> None:
+    def scope(api_key: str) -> Scope:
+        return {
+            "headers": [(b"x-api-key", api_key.encode())],
+            "client": ("10.0.0.1", 1234),
+        }
+
+    known = frozenset({"team-key"})
+    assume(_client_key(scope("team-key"), known) == "key:team-key")
+    # Made-up keys share the bucket of their host instead of a fresh one
+    assume(_client_key(scope("random-1"), known) == "host:10.0.0.1")
+    assume(_client_key(scope("random-2"), known) == "host:10.0.0.1")
+
+
+@pytest.mark.parametrize(
+    "method, path, priority",
+    [
+        ("GET", "/v1/surveys", HIGH),
+        ("GET", "/v1/surveys/", HIGH),
+        ("GET", "/v1/surveys/2", HIGH),
+        ("HEAD", "/v1/surveys/2/questions", HIGH),
+        ("GET", "/v1/surveys/2/stats", LOW),
+        ("GET", "/v1/surveys/2/trend", LOW),
+        ("GET", "/v1/surveys/2/percentiles", LOW),
+        ("POST", "/v1/surveys/2/responses", LOW),
+    ],
+)
+def test_only_catalog_reads_are_high_priority(
+    method: str, path: str, priority: int
+) -> None:
+    assume(_priority({"method": method, "path": path}) == priority)
+
+
+def test_freed_slots_go_to_high_priority_first() -> None:
+    async def scenario() -> List[str]:
+        limiter = ConcurrencyLimiter(1, queue_size=10, queue_timeout=5)
+        order: List[str] = []
+        await limiter.acquire(LOW)
+
+        async def wait(name: str, priority: int) -> None:
+            await limiter.acquire(priority)
+            order.append(name)
+            limiter.release()
+
+        tasks = [
+            asyncio.ensure_future(wait("submission", LOW)),
+            asyncio.ensure_future(wait("catalog", HIGH)),
+        ]
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.gather(*tasks)
+        assume(limiter.active == 0)
+        return order
+
+    assume(asyncio.run(scenario()) == ["catalog", "submission"])
+
+
+def test_full_queue_and_queue_timeout_are_rejected() -> None:
+    async def scenario() -> None:
+        limiter = ConcurrencyLimiter(1, queue_size=1, queue_timeout=0.01)
+        await limiter.acquire(LOW)
+        waiter = asyncio.ensure_future(limiter.acquire(LOW))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            await limiter.acquire(LOW)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await waiter
+        assume(rejected.value.status_code == 503)
+        # The abandoned waiter does not take the slot when it is freed
+        limiter.release()
+        assume(limiter.active == 0)
+        assume(limiter.waiting(LOW) == 0)
+
+    asyncio.run(scenario())
+
+
+def test_rate_limited_requests_get_429_with_retry_after() -> None:
+    app = make_app()
+    app.rate_limiter = RateLimiter(rate=1, burst=3)
+    results = asyncio.run(run_wave(app, 5))
+    statuses = sorted(status for status, _, _ in results)
+    assume(statuses == [200, 200, 200, 429, 429])
+    assume(all(retry == "1" for status, _, retry in results if status == 429))
+
+
+def test_p99_latency_stays_bounded_under_overload() -> None:
+    requests = 200
+    # Unlimited, the last requests wait for every request before them
+    unlimited = asyncio.run(run_wave(make_app(), requests))
+    assume(all(status == 200 for status, _, _ in unlimited))
+    unlimited_p99 = p99([latency for _, latency, _ in unlimited])
+
+    app = make_app()
+    app.concurrency_limiter = ConcurrencyLimiter(4, queue_size=8, queue_timeout=0.05)
+    limited = asyncio.run(run_wave(app, requests))
+    statuses = [status for status, _, _ in limited]
+    limited_p99 = p99([latency for _, latency, _ in limited])
+
+    assume(statuses.count(200) >= 4)
+    assume(statuses.count(503) > 0)
+    assume(all(retry is not None for status, _, retry in limited if status == 503))
+    # Requests are served after at most the queue ahead of them, or turned
+    # away within the queue timeout
+    assume(limited_p99 < 0.25)
+    assume(limited_p99 < unlimited_p99 / 2)
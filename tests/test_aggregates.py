@@ -0,0 +1,59 @@
+# tests/test_aggregates.py
+
+import random
+import statistics
+from datetime import datetime, timezone
+from pytest_assume.plugin import assume
+from app.aggregates import RunningStats
+from app.models import AssessmentResultBase
+from app.repositories import AssessmentRepository
+
+
+def test_running_stats_match_full_recompute() -> None:
+    rng = random.Random(7)
+    values = [rng.uniform(1, 7) for _ in range(10_000)]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assume(stats.count == len(values))
+    assume(abs(stats.mean - statistics.fmean(values)) < 1e-9)
+    assume(abs(stats.variance - statistics.variance(values)) < 1e-9)
+    assume(stats.minimum == min(values))
+    assume(stats.maximum == max(values))
+
+
+def test_running_stats_merge() -> None:
+    rng = random.Random(11)
+    values = [rng.gauss(3, 1) for _ in range(1_000)]
+    left, right = RunningStats(), RunningStats()
+    for value in values[:300]:
+        left.add(value)
+    for value in values[300:]:
+        right.add(value)
+    left.merge(right)
+    assume(left.count == len(values))
+    assume(abs(left.mean - statistics.fmean(values)) < 1e-9)
+    assume(abs(left.variance - statistics.variance(values)) < 1e-9)
+
+
+def test_repository_updates_stats_on_save() -> None:
+    repository = AssessmentRepository()
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    scores = [1.0, 2.5, 4.0, 6.75]
+    repository.save_many(
+        [
+            AssessmentResultBase(
+                id=0,
+                survey_id=1,
+                scores={"happiness_score": score},
+                timestamp=timestamp,
+            )
+            for score in scores
+        ]
+    )
+    stats = repository.stats.get(1, "happiness_score")
+    if stats is None:
+        raise AssertionError("happiness_score statistics should exist")
+    assume(repository.stats.count(1) == len(scores))
+    assume(abs(stats.variance - statistics.variance(scores)) < 1e-12)
+    assume(repository.stats.count(2) == 0)
@@ -1,11 +1,15 @@
 # tests/test_api.py
+import json
+import statistics
 import pytest
 from pytest_assume.plugin import assume
 from fastapi.testclient import TestClient
-from app.main import app
-from app.survey_registry import survey_registry
-from app.surveys.shs import SHSConstants
-from app.surveys.stress import StressConstants
+from app.main import app, assessment_repository
+from app.models import MAX_BATCH_SIZE
+from app.repositories import AssessmentRepository
+from app.survey_registry import SurveyRegistry, survey_registry
+from app.surveys.shs import SHSConstants, SHSSurvey
+from app.surveys.stress import StressConstants, StressSurvey
 
 client = TestClient(app)
 
@@ -184,3 +188,238 @@ def test_get_interpretation_invalid_score() -> None:
     assume("interpretation" in data)
     assume(data["interpretation"] == StressConstants.INVALID)
     assume(data["interpretation"] == StressConstants.INVALID)
+
+
+def test_submit_survey_responses_batch() -> None:
+    expected_survey = survey_registry.get_survey(1)
+
+    if expected_survey is None:
+        pytest.fail("Survey with ID 1 should not be None")
+
+    survey_id = expected_survey.id
+    valid_answers = [
+        {"question_id": question.id, "score": question.scale_min}
+        for question in expected_survey.questions
+    ]
+    invalid_answers = [
+        {"question_id": question.id, "score": question.scale_max + 1}
+        for question in expected_survey.questions
+    ]
+    responses = [
+        {
+            "survey_id": survey_id,
+            "answers": answers,
+            "timestamp": "2023-10-14T12:00:00Z",
+        }
+        for answers in (valid_answers, invalid_answers, valid_answers[:-1])
+    ]
+    response = client.post(f"/v1/surveys/{survey_id}/responses:batch", json=responses)
+    assume(response.status_code == 200)
+    data = response.json()
+    assume(data["accepted"] == 1)
+    assume(data["rejected"] == 2)
+    assume([item["index"] for item in data["results"]] == [0, 1, 2])
+    assume(data["results"][0]["assessment"]["scores"]["happiness_score"] == 2.5)
+    assume(data["results"][0]["error"] is None)
+    assume("must be between" in data["results"][1]["error"])
+    assume("Incomplete set of answers" in data["results"][2]["error"])
+
+
+def test_submit_survey_responses_batch_invalid_survey() -> None:
+    response = client.post("/v1/surveys/999/responses:batch", json=[])
+    assume(response.status_code == 404)
+
+
+def test_get_survey_stats_matches_full_recompute() -> None:
+    for score in (1, 2, 5):
+        client.post(
+            "/v1/surveys/2/responses",
+            json={
+                "survey_id": 2,
+                "answers": [{"question_id": 5, "score": score}],
+                "timestamp": "2023-10-14T12:00:00Z",
+            },
+        )
+    response = client.get("/v1/surveys/2/stats")
+    assume(response.status_code == 200)
+    data = response.json()
+
+    if not isinstance(assessment_repository, AssessmentRepository):
+        pytest.skip("Full recompute needs the in-memory repository")
+    stored = [
+        a.scores["stress_score"]
+        for a in assessment_repository.assessments.values()
+        if a.survey_id == 2
+    ]
+    stress = data["scores"]["stress_score"]
+    assume(data["count"] == len(stored))
+    assume(stress["count"] == len(stored))
+    assume(abs(stress["mean"] - statistics.fmean(stored)) < 1e-9)
+    assume(abs(stress["variance"] - statistics.variance(stored)) < 1e-9)
+    assume(stress["min"] == min(stored))
+    assume(stress["max"] == max(stored))
+
+
+def test_get_survey_stats_invalid_survey() -> None:
+    response = client.get("/v1/surveys/999/stats")
+    assume(response.status_code == 404)
+
+
+def test_get_survey_trend() -> None:
+    for timestamp, score in (
+        ("2021-03-01T09:00:00Z", 2),
+        ("2021-03-03T09:00:00Z", 4),
+        ("2021-03-10T09:00:00Z", 5),
+    ):
+        client.post(
+            "/v1/surveys/2/responses",
+            json={
+                "survey_id": 2,
+                "answers": [{"question_id": 5, "score": score}],
+                "timestamp": timestamp,
+            },
+        )
+    response = client.get("/v1/surveys/2/trend?from=2021-03-02&to=2021-03-14")
+    assume(response.status_code == 200)
+    data = response.json()
+    assume(data["survey_type"] == "weekly")
+    assume([b["period_start"] for b in data["buckets"]] == ["2021-03-01", "2021-03-08"])
+    first = data["buckets"][0]
+    assume(first["count"] == 2)
+    assume(first["means"]["stress_score"] == 3.0)
+    assume(first["distributions"]["stress_score"] == {"2.0": 1, "4.0": 1})
+
+
+def test_get_survey_trend_invalid_range() -> None:
+    response = client.get("/v1/surveys/2/trend?from=2021-03-14&to=2021-03-01")
+    assume(response.status_code == 400)
+
+
+def test_get_survey_percentiles() -> None:
+    for timestamp, scores in (
+        ("2019-06-03T09:00:00Z", [1, 2, 2, 3, 5]),
+        ("2019-06-10T09:00:00Z", [4, 4, 5]),
+    ):
+        for score in scores:
+            client.post(
+                "/v1/surveys/2/responses",
+                json={
+                    "survey_id": 2,
+                    "answers": [{"question_id": 5, "score": score}],
+                    "timestamp": timestamp,
+                },
+            )
+    response = client.get(
+        "/v1/surveys/2/percentiles?q=0.5&q=0.999&from=2019-06-03&to=2019-06-16"
+    )
+    assume(response.status_code == 200)
+    data = response.json()
+    assume(data["rank_error"] == 0.0165)
+    # Exact below 200 scores: 1 2 2 3 4 4 5 5 over the range
+    stress = data["scores"]["stress_score"]
+    assume(stress == {"count": 8, "percentiles": {"p50": 3.0, "p99.9": 5.0}})
+    periods = data["periods"]
+    assume([p["period_start"] for p in periods] == ["2019-06-03", "2019-06-10"])
+    assume(periods[1]["scores"]["stress_score"]["percentiles"]["p50"] == 4.0)
+
+    overall = client.get("/v1/surveys/2/percentiles").json()
+    assume(
+        set(overall["scores"]["stress_score"]["percentiles"]) == {"p50", "p90", "p99"}
+    )
+    assume(overall["scores"]["stress_score"]["count"] >= 8)
+
+
+def test_get_survey_percentiles_invalid_requests() -> None:
+    assume(client.get("/v1/surveys/999/percentiles").status_code == 404)
+    assume(client.get("/v1/surveys/2/percentiles?q=1.5").status_code == 400)
+    response = client.get("/v1/surveys/2/percentiles?from=2021-03-14&to=2021-03-01")
+    assume(response.status_code == 400)
+
+
+def test_export_assessments_resumes_from_cursor() -> None:
+    for score in (1, 2, 3):
+        client.post(
+            "/v1/surveys/2/responses",
+            json={
+                "survey_id": 2,
+                "answers": [{"question_id": 5, "score": score}],
+                "timestamp": "2023-10-14T12:00:00Z",
+            },
+        )
+    response = client.get("/v1/assessments/export")
+    assume(response.status_code == 200)
+    assume(response.headers["content-type"].startswith("application/x-ndjson"))
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    ids = [row["id"] for row in rows]
+    assume(len(ids) >= 3)
+    assume(ids == sorted(ids))
+
+    resumed = client.get(f"/v1/assessments/export?since_id={ids[-3]}")
+    resumed_ids = [json.loads(line)["id"] for line in resumed.text.splitlines()]
+    assume(resumed_ids == ids[-2:])
+
+
+def test_export_assessments_csv() -> None:
+    response = client.get("/v1/assessments/export?format=csv")
+    assume(response.status_code == 200)
+    assume(response.headers["content-type"].startswith("text/csv"))
+    lines = response.text.splitlines()
+    assume(lines[0] == "id,survey_id,team_id,timestamp,score_name,score_value")
+
+    empty = client.get("/v1/assessments/export?format=csv&since_id=9223372036854775807")
+    assume(empty.text.splitlines() == [lines[0]])
+
+
+def test_catalog_etag_and_not_modified() -> None:
+    for path in ("/v1/surveys/", "/v1/surveys/1", "/v1/surveys/1/questions"):
+        response = client.get(path)
+        assume(response.status_code == 200)
+        etag = response.headers.get("etag")
+        assume(etag is not None and etag.startswith('"'))
+
+        cached = client.get(path, headers={"If-None-Match": str(etag)})
+        assume(cached.status_code == 304)
+        assume(cached.content == b"")
+        assume(cached.headers.get("etag") == etag)
+
+        stale = client.get(path, headers={"If-None-Match": '"stale"'})
+        assume(stale.status_code == 200)
+        assume(stale.json() == response.json())
+
+
+def test_catalog_etag_changes_with_registry() -> None:
+    registry = SurveyRegistry()
+    registry.register_survey(SHSSurvey())
+    before = registry.catalog_payload()
+    registry.register_survey(StressSurvey())
+    after = registry.catalog_payload()
+    assume(before.etag != after.etag)
+    assume(len(json.loads(after.body)) == 2)
+
+
+def test_get_interpretations_batch() -> None:
+    response = client.post(
+        "/v1/surveys/2/interpretations", json={"scores": [1, 3.5, 5, 0, 6]}
+    )
+    assume(response.status_code == 200)
+    assume(
+        response.json()["interpretations"]
+        == [
+            StressConstants.NOT_AT_ALL,
+            StressConstants.MODERATELY,
+            StressConstants.EXTREMELY,
+            StressConstants.INVALID,
+            StressConstants.INVALID,
+        ]
+    )
+
+
+def test_get_interpretations_batch_too_large() -> None:
+    scores = [3] * (MAX_BATCH_SIZE + 1)
+    response = client.post("/v1/surveys/2/interpretations", json={"scores": scores})
+    assume(response.status_code == 422)
+
+
+def test_get_interpretations_batch_invalid_survey() -> None:
+    response = client.post("/v1/surveys/999/interpretations", json={"scores": [1]})
+    assume(response.status_code == 404)
@@ -0,0 +1,106 @@
+# tests/test_assessment_cache.py
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict
+from fastapi.testclient import TestClient
+from pytest_assume.plugin import assume
+from app.assessment_cache import ASSESSMENT_CACHE_LOOKUPS, AssessmentCache
+from app.main import app, assessment_cache
+from app.models import AssessmentResultBase
+from app.repositories import AssessmentRepository, RetentionPolicy
+
+client = TestClient(app)
+
+
+def submission(score: int) -> Dict[str, Any]:
+    return {
+        "survey_id": 2,
+        "answers": [{"question_id": 5, "score": score}],
+        "timestamp": "2024-01-01T12:00:00Z",
+    }
+
+
+def test_cache_is_bounded_by_bytes_in_lru_order() -> None:
+    cache = AssessmentCache(max_bytes=10)
+    cache.put(1, b"aaaa")
+    cache.put(2, b"bbbb")
+    assume(cache.get(1) == b"aaaa")
+    # 1 was used more recently, so 2 goes to make room
+    cache.put(3, b"cccc")
+    assume(cache.get(2) is None)
+    assume(cache.size == 8)
+    # Replacing a body adjusts the size; bodies over the limit are skipped
+    cache.put(1, b"a")
+    cache.put(4, b"x" * 11)
+    assume(cache.size == 5)
+    assume(cache.get(4) is None)
+    assume(cache.hit_rate() == 1 / 3)
+
+
+def test_submitted_assessment_is_served_from_the_cache() -> None:
+    submitted = client.post("/v1/surveys/2/responses", json=submission(3)).json()
+    hits = ASSESSMENT_CACHE_LOOKUPS.value("hit")
+    response = client.get(f"/v1/assessments/{submitted['id']}")
+    assume(response.status_code == 200)
+    assume(response.json() == submitted)
+    assume(ASSESSMENT_CACHE_LOOKUPS.value("hit") == hits + 1)
+
+
+def test_cache_miss_reads_through_the_repository() -> None:
+    submitted = client.post("/v1/surveys/2/responses", json=submission(4)).json()
+    assessment_cache.invalidate(submitted["id"])
+    misses = ASSESSMENT_CACHE_LOOKUPS.value("miss")
+    assume(client.get(f"/v1/assessments/{submitted['id']}").json() == submitted)
+    assume(ASSESSMENT_CACHE_LOOKUPS.value("miss") == misses + 1)
+    # The body read from the repository is now cached
+    assume(assessment_cache.get(submitted["id"]) is not None)
+
+
+def test_get_unknown_assessment() -> None:
+    assume(client.get("/v1/assessments/1").status_code == 404)
+
+
+def test_get_assessments_in_bulk() -> None:
+    first, second = (
+        client.post("/v1/surveys/2/responses", json=submission(s)).json()
+        for s in (1, 5)
+    )
+    assessment_cache.invalidate(second["id"])
+    response = client.get(
+        "/v1/assessments",
+        params=[("ids", f"{second['id']},1"), ("ids", str(first["id"]))],
+    )
+    assume(response.status_code == 200)
+    assume(response.json() == {"assessments": [second, first], "missing": [1]})
+
+
+def test_get_assessments_rejects_bad_ids() -> None:
+    assume(client.get("/v1/assessments", params={"ids": "1,x"}).status_code == 400)
+    too_many = ",".join(str(i) for i in range(1001))
+    assume(client.get("/v1/assessments", params={"ids": too_many}).status_code == 413)
+    assume(client.get("/v1/assessments").status_code == 422)
+
+
+def test_evicted_assessments_leave_the_cache(tmp_path: Path) -> None:
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for spill_dir in (None, str(tmp_path)):
+        repository = AssessmentRepository(
+            retention=RetentionPolicy(max_records=2, spill_dir=spill_dir)
+        )
+        cache = AssessmentCache(max_bytes=10_000)
+        repository.add_save_listener(cache.put_assessments)
+        repository.add_removal_listener(cache.invalidate_many)
+        saved = [
+            repository.save(
+                AssessmentResultBase(
+                    id=0, survey_id=2, scores={"stress_score": 3}, timestamp=timestamp
+                )
+            )
+            for _ in range(3)
+        ]
+        # Dropped assessments are no longer served; spilled ones still are
+        evicted = cache.get(saved[0].id)
+        assume((evicted is None) == (spill_dir is None))
+        assume(cache.get(saved[2].id) is not None)
+        repository.close()
@@ -0,0 +1,147 @@
+# tests/test_columnar_repository.py
+
+from datetime import datetime, timedelta, timezone
+import threading
+from typing import List, Optional
+import pytest
+from pytest_assume.plugin import assume
+from app.models import AssessmentResultBase
+from app.repositories import (
+    AssessmentRepository,
+    ColumnarAssessmentRepository,
+    SequentialIdAllocator,
+)
+from app.repositories import columnar_repository
+from tests.helpers import make_assessment
+
+START = datetime(2024, 3, 1, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def test_round_trip_matches_dict_store() -> None:
+    columnar = ColumnarAssessmentRepository(id_allocator=SequentialIdAllocator())
+    reference = AssessmentRepository(id_allocator=SequentialIdAllocator())
+    for index in range(200):
+        survey_id = 1 + index % 2
+        key = "happiness_score" if survey_id == 1 else "stress_score"
+        scores = {key: index / 7}
+        columnar.save(
+            make_assessment(survey_id=survey_id, scores=scores, timestamp=START)
+        )
+        reference.save(
+            make_assessment(survey_id=survey_id, scores=scores, timestamp=START)
+        )
+
+    assume(columnar.count() == reference.count() == 200)
+    for assessment_id in (1, 2, 57, 200):
+        assume(columnar.get(assessment_id) == reference.get(assessment_id))
+    assume(columnar.get(201) is None)
+    assume(columnar.list_after(10, 25) == reference.list_after(10, 25))
+    columnar_stats = columnar.stats.get(1, "happiness_score")
+    reference_stats = reference.stats.get(1, "happiness_score")
+    assume(columnar_stats is not None and reference_stats is not None)
+    if columnar_stats and reference_stats:
+        assume(columnar_stats.count == reference_stats.count == 100)
+        assume(columnar_stats.mean == reference_stats.mean)
+
+
+def test_grows_across_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(columnar_repository, "CHUNK_SIZE", 8)
+    repository = ColumnarAssessmentRepository(id_allocator=SequentialIdAllocator())
+    repository.save_many(
+        [make_assessment(i, 1, key="score", timestamp=START) for i in range(30)]
+    )
+    assume(len(repository._chunks) == 4)
+    pages = list(repository.iter_assessments(after_id=5, page_size=7))
+    ids = [a.id for page in pages for a in page]
+    assume(ids == list(range(6, 31)))
+    fetched = repository.get(17)
+    assume(fetched is not None and fetched.scores == {"score": 16.0})
+
+
+def test_late_and_repeated_ids() -> None:
+    repository = ColumnarAssessmentRepository(
+        id_allocator=SequentialIdAllocator(start=100)
+    )
+    repository.save_many(
+        [make_assessment(1.0, 1, key="score", timestamp=START) for _ in range(3)]
+    )
+    repository.save(
+        make_assessment(
+            5.0,
+            1,
+            key="score",
+            timestamp=START + timedelta(minutes=50),
+            assessment_id=50,
+        )
+    )
+    repository.save(
+        make_assessment(
+            2.0,
+            key="other",
+            timestamp=START + timedelta(minutes=101),
+            assessment_id=101,
+        )
+    )
+
+    assume(repository.count() == 4)
+    assume([a.id for a in repository.list_after(0, 10)] == [50, 100, 101, 102])
+    assume([a.id for a in repository.list_after(50, 2)] == [100, 101])
+    replaced = repository.get(101)
+    assume(replaced is not None and replaced.scores == {"other": 2.0})
+    late = repository.get(50)
+    assume(late is not None and late.scores == {"score": 5.0})
+
+
+def test_rows_are_visible_only_once_written(monkeypatch: pytest.MonkeyPatch) -> None:
+    repository = ColumnarAssessmentRepository(id_allocator=SequentialIdAllocator())
+    repository.save(make_assessment(1.0, key="score", timestamp=START))
+    seen: List[AssessmentResultBase] = []
+    team_code = repository._team_code
+
+    def read_mid_write(team_id: Optional[str]) -> int:
+        # An export reads while the row is half written
+        seen.extend(repository.list_after(0, 10))
+        return team_code(team_id)
+
+    monkeypatch.setattr(repository, "_team_code", read_mid_write)
+    repository.save(make_assessment(2.0, key="score", timestamp=START, team_id="a"))
+
+    assume([a.id for a in seen] == [1])
+    assume([a.id for a in repository.list_after(0, 10)] == [1, 2])
+
+
+def test_export_interleaved_with_saves() -> None:
+    repository = ColumnarAssessmentRepository(id_allocator=SequentialIdAllocator())
+    done = threading.Event()
+    torn: List[AssessmentResultBase] = []
+    exports = 0
+
+    def export() -> None:
+        nonlocal exports
+        while not done.is_set():
+            page = repository.list_after(0, 500)
+            exports += 1
+            torn.extend(
+                a
+                for index, a in enumerate(page, 1)
+                if a.id != index
+                or a.scores != {"score": a.id - 1.0}
+                or a.team_id != "team"
+                or a.timestamp != START
+            )
+
+    reader = threading.Thread(target=export)
+    reader.start()
+    try:
+        for index in range(500):
+            repository.save(
+                make_assessment(
+                    float(index), key="score", timestamp=START, team_id="team"
+                )
+            )
+    finally:
+        done.set()
+        reader.join()
+
+    assume(exports > 0)
+    assume(torn == [])
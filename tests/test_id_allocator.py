@@ -0,0 +1,110 @@
+# tests/test_id_allocator.py
+
+import multiprocessing
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List
+import pytest
+from pytest_assume.plugin import assume
+from app.models import AssessmentResultBase
+from app.repositories import (
+    AssessmentRepository,
+    SequentialIdAllocator,
+    SnowflakeIdAllocator,
+)
+from app.repositories.id_allocator import MAX_NODE_ID, MAX_SEQUENCE
+
+
+def _mint_ids(node_id: int) -> List[int]:
+    allocator = SnowflakeIdAllocator(node_id)
+    ids = []
+    for _ in range(200):
+        ids.extend(allocator.allocate(50))
+    return ids
+
+
+def test_sequential_allocator() -> None:
+    allocator = SequentialIdAllocator(start=10)
+    assume(allocator.allocate(3) == [10, 11, 12])
+    assume(allocator.allocate() == [13])
+
+
+def test_snowflake_ids_increase_and_decode() -> None:
+    allocator = SnowflakeIdAllocator(node_id=201)
+    before_ms = int(time.time() * 1000)
+    ids = allocator.allocate(MAX_SEQUENCE * 3)
+    ids += allocator.allocate(10)
+    assume(ids == sorted(set(ids)))
+    # Exact as JavaScript numbers
+    assume(ids[-1] < 2**53)
+    timestamp_ms, node_id, _ = SnowflakeIdAllocator.decode(ids[0])
+    assume(node_id == 201)
+    assume(abs(timestamp_ms - before_ms) < 1000)
+
+
+def test_snowflake_rejects_out_of_range_node_id() -> None:
+    with pytest.raises(ValueError):
+        SnowflakeIdAllocator(node_id=MAX_NODE_ID + 1)
+
+
+def test_derived_node_warns_with_several_workers(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    SnowflakeIdAllocator(node_id=3)
+    SnowflakeIdAllocator()
+    assume("may collide" not in caplog.text)
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    SnowflakeIdAllocator(node_id=3)
+    assume("may collide" not in caplog.text)
+    SnowflakeIdAllocator()
+    assume("may collide" in caplog.text)
+
+
+def test_snowflake_is_unique_across_threads() -> None:
+    allocator = SnowflakeIdAllocator(node_id=1)
+    minted: List[List[int]] = [[] for _ in range(8)]
+
+    def mint(slot: int) -> None:
+        for _ in range(500):
+            minted[slot].extend(allocator.allocate(4))
+
+    threads = [threading.Thread(target=mint, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    all_ids = [i for ids in minted for i in ids]
+    assume(len(set(all_ids)) == len(all_ids) == 8 * 500 * 4)
+    assume(all(ids == sorted(ids) for ids in minted))
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_snowflake_is_unique_across_processes() -> None:
+    context = multiprocessing.get_context("fork")
+    with context.Pool(processes=8) as pool:
+        results = pool.map(_mint_ids, range(32))
+    all_ids = [i for ids in results for i in ids]
+    assume(len(set(all_ids)) == len(all_ids) == 32 * 200 * 50)
+    node_ids = {SnowflakeIdAllocator.decode(i)[1] for i in all_ids}
+    assume(node_ids == set(range(32)))
+
+
+def test_repository_keeps_preassigned_ids_in_cursor_order() -> None:
+    repository = AssessmentRepository(id_allocator=SequentialIdAllocator(start=100))
+
+    def assessment(assessment_id: int) -> AssessmentResultBase:
+        return AssessmentResultBase(
+            id=assessment_id,
+            survey_id=1,
+            scores={"happiness_score": 4.0},
+            timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+
+    saved = repository.save_many([assessment(0), assessment(50), assessment(0)])
+    assume([a.id for a in saved] == [100, 50, 101])
+    assume([a.id for a in repository.list_after(0, 10)] == [50, 100, 101])
+    assume([a.id for a in repository.list_after(50, 10)] == [100, 101])
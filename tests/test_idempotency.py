@@ -0,0 +1,157 @@
+# tests/test_idempotency.py
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+import pytest
+from fastapi.testclient import TestClient
+from pytest_assume.plugin import assume
+from app.exceptions import IdempotencyKeyReusedException
+from app.idempotency import IdempotencyCache
+from app.main import app, assessment_repository
+from app.models import AssessmentResultBase
+from app.repositories import IdempotentRecord, SQLiteAssessmentRepository
+
+client = TestClient(app)
+
+
+def submission(score: int) -> Dict[str, Any]:
+    return {
+        "survey_id": 2,
+        "answers": [{"question_id": 5, "score": score}],
+        "timestamp": "2024-01-01T12:00:00Z",
+    }
+
+
+def make_record(assessment_id: int, fingerprint: str = "a") -> IdempotentRecord:
+    assessment = AssessmentResultBase(
+        id=assessment_id,
+        survey_id=2,
+        scores={"stress_score": 3.0},
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    return IdempotentRecord(fingerprint, assessment, False)
+
+
+def test_replayed_submission_is_not_saved_again() -> None:
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    count = assessment_repository.count()
+    first = client.post("/v1/surveys/2/responses", json=submission(3), headers=headers)
+    second = client.post("/v1/surveys/2/responses", json=submission(3), headers=headers)
+    assume(first.status_code == second.status_code == 200)
+    assume(first.json() == second.json())
+    assume("idempotent-replayed" not in first.headers)
+    assume(second.headers["idempotent-replayed"] == "true")
+    assume(assessment_repository.count() == count + 1)
+
+    unkeyed = client.post("/v1/surveys/2/responses", json=submission(3))
+    assume(unkeyed.json()["id"] != first.json()["id"])
+
+
+def test_reused_key_with_other_payload_is_rejected() -> None:
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    client.post("/v1/surveys/2/responses", json=submission(3), headers=headers)
+    response = client.post(
+        "/v1/surveys/2/responses", json=submission(4), headers=headers
+    )
+    assume(response.status_code == 422)
+    assume("Idempotency-Key" in response.json()["detail"])
+
+
+def test_invalid_submission_is_not_cached() -> None:
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    for _ in range(2):
+        response = client.post(
+            "/v1/surveys/2/responses", json=submission(9), headers=headers
+        )
+        assume(response.status_code == 400)
+
+
+def test_concurrent_duplicates_are_coalesced() -> None:
+    cache = IdempotencyCache()
+    calls: List[int] = []
+
+    async def execute() -> IdempotentRecord:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return make_record(len(calls))
+
+    async def submit_all() -> List[IdempotentRecord]:
+        return await asyncio.gather(
+            *(cache.run("key", "a", execute) for _ in range(10))
+        )
+
+    records = asyncio.run(submit_all())
+    assume(len(calls) == 1)
+    assume({record.assessment.id for record in records} == {1})
+    assume(sum(not record.replayed for record in records) == 1)
+
+
+def test_failures_propagate_to_waiters_and_are_not_cached() -> None:
+    cache = IdempotencyCache()
+    calls: List[int] = []
+
+    async def failing() -> IdempotentRecord:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def submit_all() -> List[Any]:
+        return await asyncio.gather(
+            *(cache.run("key", "a", failing) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(submit_all())
+    assume(len(calls) == 1)
+    assume(all(isinstance(result, ValueError) for result in results))
+    assume(len(cache) == 0)
+
+
+def test_cache_is_bounded_and_expires() -> None:
+    cache = IdempotencyCache(max_entries=2)
+
+    async def run(key: str, fingerprint: str = "a") -> IdempotentRecord:
+        async def execute() -> IdempotentRecord:
+            return make_record(int(key), "a")
+
+        return await cache.run(key, fingerprint, execute)
+
+    for key in ("1", "2", "3"):
+        asyncio.run(run(key))
+    assume(len(cache) == 2)
+    assume(asyncio.run(run("3")).replayed)
+    assume(not asyncio.run(run("1")).replayed)
+    with pytest.raises(IdempotencyKeyReusedException):
+        asyncio.run(run("1", fingerprint="b"))
+
+    expired = IdempotencyCache(ttl_seconds=0)
+
+    async def execute() -> IdempotentRecord:
+        return make_record(1)
+
+    assume(not asyncio.run(expired.run("1", "a", execute)).replayed)
+    assume(not asyncio.run(expired.run("1", "a", execute)).replayed)
+
+
+def test_sqlite_keeps_keys_across_instances(tmp_path: Path) -> None:
+    path = str(tmp_path / "assessments.db")
+    first = SQLiteAssessmentRepository(path)
+    second = SQLiteAssessmentRepository(path)
+    expires_at = datetime.now(timezone.utc).timestamp() + 60
+    saved = first.save_idempotent(make_record(0).assessment, "key", "a", expires_at)
+    assume(not saved.replayed)
+
+    found = second.find_idempotent("key")
+    assume(found is not None and found.assessment == saved.assessment)
+    # A second worker racing on the same key gets the first one's record
+    raced = second.save_idempotent(make_record(0).assessment, "key", "a", expires_at)
+    assume(raced.replayed and raced.assessment.id == saved.assessment.id)
+    assume(second.count() == 1)
+
+    second.save_idempotent(make_record(0).assessment, "old", "a", expires_at - 120)
+    assume(second.find_idempotent("old") is None)
+    first.close()
+    second.close()
@@ -0,0 +1,37 @@
+# tests/test_interpretation.py
+
+import pytest
+from pytest_assume.plugin import assume
+from app.interpretation import InterpretationTable
+from app.surveys.shs import SHSConstants, get_shs_interpretation
+from app.surveys.stress import StressConstants, get_stress_interpretation
+
+
+def test_table_resolves_band_edges() -> None:
+    table = InterpretationTable.from_bands([(2, "mid"), (5, "high")], below="low")
+    assume(table.resolve(1.99) == "low")
+    assume(table.resolve(2) == "mid")
+    assume(table.resolve(4.99) == "mid")
+    assume(table.resolve(5) == "high")
+    assume(table.resolve_many([0, 2, 5, 9]) == ["low", "mid", "high", "high"])
+
+
+def test_table_rejects_unsorted_bands() -> None:
+    with pytest.raises(ValueError):
+        InterpretationTable.from_bands([(5, "high"), (2, "mid")], below="low")
+
+
+def test_shs_table_matches_guide() -> None:
+    assume(get_shs_interpretation(7) == SHSConstants.HIGH)
+    assume(get_shs_interpretation(6) == SHSConstants.HIGH)
+    assume(get_shs_interpretation(5.99) == SHSConstants.MODERATE)
+    assume(get_shs_interpretation(4) == SHSConstants.MODERATE)
+    assume(get_shs_interpretation(3.99) == SHSConstants.LOW)
+    assume(get_shs_interpretation(7.5) == SHSConstants.LOW)
+
+
+def test_stress_table_truncates_like_integer_scores() -> None:
+    assume(get_stress_interpretation(0.5) == StressConstants.INVALID)
+    assume(get_stress_interpretation(1.9) == StressConstants.NOT_AT_ALL)
+    assume(get_stress_interpretation(5.5) == StressConstants.EXTREMELY)
+    assume(get_stress_interpretation(6) == StressConstants.INVALID)
@@ -0,0 +1,73 @@
+# tests/test_metrics.py
+
+from fastapi.testclient import TestClient
+from pytest_assume.plugin import assume
+from app.main import app
+from app.metrics import ERRORS, SUBMISSION_STAGES, MetricsRegistry
+
+client = TestClient(app)
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency", "Latency.", ("stage",), (0.1, 1.0))
+    histogram.observe(0.05, "score")
+    histogram.observe(0.5, "score")
+    histogram.observe(5.0, "score")
+    lines = registry.render().splitlines()
+    assume("# TYPE latency histogram" in lines)
+    assume('latency_bucket{stage="score",le="0.1"} 1' in lines)
+    assume('latency_bucket{stage="score",le="1.0"} 2' in lines)
+    assume('latency_bucket{stage="score",le="+Inf"} 3' in lines)
+    assume('latency_count{stage="score"} 3' in lines)
+    assume(histogram.count("score") == 3)
+
+
+def test_counter_and_gauge_render() -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events.", ("type",))
+    counter.inc('say "hi"')
+    counter.inc('say "hi"', amount=2)
+    registry.gauge("size", "Size.", lambda: 42)
+    lines = registry.render().splitlines()
+    assume('events_total{type="say \\"hi\\""} 3' in lines)
+    assume("size 42" in lines)
+    assume(counter.value("missing") == 0)
+
+
+def test_metrics_endpoint_reports_requests_stages_and_errors() -> None:
+    invalid_before = ERRORS.value("InvalidAnswerException")
+    saves_before = SUBMISSION_STAGES.count("save")
+    valid = client.post(
+        "/v1/surveys/2/responses",
+        json={
+            "survey_id": 2,
+            "answers": [{"question_id": 5, "score": 3}],
+            "timestamp": "2024-01-01T12:00:00Z",
+        },
+    )
+    invalid = client.post(
+        "/v1/surveys/2/responses",
+        json={
+            "survey_id": 2,
+            "answers": [{"question_id": 5, "score": 9}],
+            "timestamp": "2024-01-01T12:00:00Z",
+        },
+    )
+    assume(valid.status_code == 200)
+    assume(invalid.status_code == 400)
+    assume(ERRORS.value("InvalidAnswerException") == invalid_before + 1)
+    assume(SUBMISSION_STAGES.count("save") == saves_before + 1)
+
+    response = client.get("/metrics")
+    assume(response.status_code == 200)
+    assume(response.headers["content-type"].startswith("text/plain"))
+    body = response.text
+    assume(
+        'http_requests_total{method="POST",route="/v1/surveys/{survey_id}/responses"'
+        ',status="400"}' in body
+    )
+    for stage in ("parse", "validate", "score", "save"):
+        assume(f'submission_stage_duration_seconds_count{{stage="{stage}"}}' in body)
+    assume('errors_total{type="InvalidAnswerException"}' in body)
+    assume("assessment_repository_size " in body)
@@ -0,0 +1,126 @@
+# tests/test_quantiles.py
+
+import random
+from bisect import bisect_left, bisect_right
+from typing import List
+import numpy as np
+import pytest
+from pytest_assume.plugin import assume
+from app.quantiles import KLLSketch
+
+QUANTILES = [i / 100 for i in range(1, 100)] + [0.995, 0.999]
+
+
+@pytest.fixture(autouse=True)
+def seeded() -> None:
+    # Compaction flips coins; seed them so the checks are reproducible
+    random.seed(1234)
+
+
+def rank_errors(sketch: KLLSketch, values: List[float]) -> List[float]:
+    """Distance of each estimate's true rank range from the requested rank."""
+    ordered = sorted(values)
+    errors = []
+    for q, estimate in zip(QUANTILES, sketch.quantiles(QUANTILES)):
+        assert estimate is not None  # nosec B101
+        low = bisect_left(ordered, estimate) / len(ordered)
+        high = bisect_right(ordered, estimate) / len(ordered)
+        errors.append(max(0.0, low - q, q - high))
+    return errors
+
+
+def test_small_streams_are_exact() -> None:
+    rng = random.Random(3)
+    values = [rng.uniform(1, 7) for _ in range(150)]
+    sketch = KLLSketch()
+    for value in values:
+        sketch.add(value)
+    ordered = sorted(values)
+    for q, estimate in zip(QUANTILES, sketch.quantiles(QUANTILES)):
+        # The smallest value with at least q of the values at or below it
+        expected = ordered[max(0, int(np.ceil(q * len(values))) - 1)]
+        assume(estimate == expected)
+    assume(sketch.quantile(0) == min(values))
+    assume(sketch.quantile(1) == max(values))
+    assume(KLLSketch().quantile(0.5) is None)
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "lognormal", "discrete"])
+def test_rank_error_within_documented_bound(distribution: str) -> None:
+    rng = np.random.default_rng(5)
+    if distribution == "uniform":
+        values = rng.uniform(0, 40, 100_000)
+    elif distribution == "lognormal":
+        values = rng.lognormal(2, 1, 100_000)
+    else:
+        # Stress scores: a handful of distinct values with heavy ties
+        values = rng.integers(1, 6, 100_000).astype(float)
+    sketch = KLLSketch()
+    for value in values.tolist():
+        sketch.add(value)
+    assume(sketch.count == len(values))
+    assume(max(rank_errors(sketch, values.tolist())) <= sketch.rank_error)
+    # Few values lie between each estimate and the exact percentile
+    ordered = np.sort(values)
+    for q in (0.5, 0.9, 0.99):
+        exact = np.quantile(values, q, method="inverted_cdf")
+        estimate = sketch.quantile(q)
+        assert estimate is not None  # nosec B101
+        low, high = sorted((exact, estimate))
+        between = np.searchsorted(ordered, high) - np.searchsorted(
+            ordered, low, side="right"
+        )
+        assume(between <= sketch.rank_error * len(values))
+
+
+def test_memory_stays_bounded() -> None:
+    sketch = KLLSketch()
+    rng = random.Random(9)
+    sizes = []
+    for n in range(1, 1_000_001):
+        sketch.add(rng.random())
+        if n % 100_000 == 0:
+            sizes.append(len(sketch))
+    # About 3 * k values plus two per level, whatever the stream length
+    assume(max(sizes) <= 3 * sketch.k + 2 * 20)
+
+
+def test_merged_sketches_keep_the_bound() -> None:
+    rng = random.Random(13)
+    parts = [[rng.gauss(3, 1) for _ in range(25_000)] for _ in range(4)]
+    sketches = []
+    for part in parts:
+        sketch = KLLSketch()
+        for value in part:
+            sketch.add(value)
+        sketches.append(sketch)
+    merged = KLLSketch.merged(sketches)
+    values = [value for part in parts for value in part]
+    assume(merged.count == len(values))
+    assume(merged.minimum == min(values) and merged.maximum == max(values))
+    assume(max(rank_errors(merged, values)) <= merged.rank_error)
+    assume(len(merged) <= 3 * merged.k + 2 * 20)
+
+
+def test_serialized_sketches_round_trip_and_merge() -> None:
+    rng = random.Random(17)
+    parts = [[rng.gauss(3, 1) for _ in range(25_000)] for _ in range(4)]
+    # Each worker serializes its sketch; another merges what it reads back
+    payloads = []
+    for part in parts:
+        sketch = KLLSketch()
+        for value in part:
+            sketch.add(value)
+        payload = sketch.to_bytes()
+        restored = KLLSketch.from_bytes(payload)
+        assume(restored.count == sketch.count and len(restored) == len(sketch))
+        assume(restored.quantiles(QUANTILES) == sketch.quantiles(QUANTILES))
+        payloads.append(payload)
+    merged = KLLSketch.merged(KLLSketch.from_bytes(p) for p in payloads)
+    values = [value for part in parts for value in part]
+    assume(merged.count == len(values))
+    assume(max(rank_errors(merged, values)) <= merged.rank_error)
+    empty = KLLSketch.from_bytes(KLLSketch().to_bytes())
+    assume(empty.count == 0 and empty.quantile(0.5) is None)
+    with pytest.raises(ValueError):
+        KLLSketch.from_bytes(payloads[0][:20])
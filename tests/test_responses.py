@@ -0,0 +1,90 @@
+# tests/test_responses.py
+
+import dataclasses
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+import pytest
+from fastapi.testclient import TestClient
+from pytest_assume.plugin import assume
+import app.main
+from app.settings import settings
+import app.responses
+from app.main import app as api
+from app.models import AssessmentResultBase
+from app.responses import FastJSONResponse
+
+client = TestClient(api)
+
+SUBMISSION: Dict[str, Any] = {
+    "survey_id": 1,
+    "answers": [{"question_id": i, "score": 5} for i in range(1, 5)],
+    "timestamp": "2024-01-01T12:00:00Z",
+}
+REQUESTS: List[Tuple[str, str, Any]] = [
+    ("GET", "/v1/surveys/2/trend", None),
+    ("GET", "/v1/surveys/2/interpretation/3", None),
+    ("POST", "/v1/surveys/2/interpretations", {"scores": [1, 2.5, 6]}),
+]
+
+
+def fetch_all() -> List[Tuple[int, Any]]:
+    return [
+        (response.status_code, response.json())
+        for response in (
+            client.request(method, path, json=body) for method, path, body in REQUESTS
+        )
+    ]
+
+
+def test_fast_responses_match_validated_responses(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    schema = json.dumps(api.openapi(), sort_keys=True)
+    client.post(
+        "/v1/surveys/2/responses",
+        json={
+            "survey_id": 2,
+            "answers": [{"question_id": 5, "score": 2}],
+            "timestamp": "2024-01-01T12:00:00Z",
+        },
+    )
+    validated = fetch_all()
+    validated_stats = client.get("/v1/surveys/1/stats").json()
+    monkeypatch.setattr(
+        app.main,
+        "settings",
+        dataclasses.replace(settings, fast_responses=True),
+    )
+    assume(fetch_all() == validated)
+    assume(client.get("/v1/surveys/1/stats").json() == validated_stats)
+
+    submitted = client.post("/v1/surveys/1/responses", json=SUBMISSION)
+    assume(submitted.status_code == 200)
+    assume(submitted.json()["scores"] == {"happiness_score": 4.5})
+    assume(submitted.json()["timestamp"] == "2024-01-01T12:00:00Z")
+    batch = client.post("/v1/surveys/1/responses:batch", json=[SUBMISSION, {}])
+    assume(batch.status_code == 422)
+    batch = client.post(
+        "/v1/surveys/1/responses:batch",
+        json=[SUBMISSION, {**SUBMISSION, "answers": SUBMISSION["answers"][:2]}],
+    )
+    assume(batch.json()["accepted"] == 1)
+    assume(batch.json()["results"][1]["assessment"] is None)
+    assume(json.dumps(api.openapi(), sort_keys=True) == schema)
+
+
+def test_fast_json_response_without_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    assessment = AssessmentResultBase(
+        id=7,
+        survey_id=1,
+        scores={"happiness_score": 4.25},
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+    expected = assessment.model_dump(mode="json")
+    for encoder in (app.responses.orjson, None):
+        monkeypatch.setattr(app.responses, "orjson", encoder)
+        assume(json.loads(bytes(FastJSONResponse(assessment).body)) == expected)
+        assume(json.loads(bytes(FastJSONResponse([assessment]).body)) == [expected])
+        body = bytes(FastJSONResponse({"nested": {"assessment": assessment}}).body)
+        assume(json.loads(body) == {"nested": {"assessment": expected}})
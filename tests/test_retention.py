@@ -0,0 +1,101 @@
+# tests/test_retention.py
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from pytest_assume.plugin import assume
+from app.metrics import ASSESSMENT_EVICTIONS, ASSESSMENT_LOOKUPS
+from app.repositories import (
+    AssessmentRepository,
+    RetentionPolicy,
+    SequentialIdAllocator,
+)
+from tests.helpers import make_assessment
+
+
+def hours_ago(hours: float) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(hours=hours)
+
+
+def test_capacity_eviction_spills_to_disk(tmp_path: Path) -> None:
+    repository = AssessmentRepository(
+        id_allocator=SequentialIdAllocator(),
+        retention=RetentionPolicy(max_records=10, spill_dir=str(tmp_path)),
+    )
+    hot_before = ASSESSMENT_LOOKUPS.value("hot")
+    cold_before = ASSESSMENT_LOOKUPS.value("cold")
+    evicted_before = ASSESSMENT_EVICTIONS.value("capacity")
+    for score in range(25):
+        repository.save(make_assessment(score))
+
+    assume(len(repository.assessments) <= 10)
+    assume(repository.count() == 25)
+    assume(repository.blocking)
+    assume(ASSESSMENT_EVICTIONS.value("capacity") - evicted_before == 25 - 9)
+
+    cold = repository.get(1)
+    hot = repository.get(25)
+    assume(cold is not None and cold.scores == {"stress_score": 0.0})
+    assume(hot is not None and hot.scores == {"stress_score": 24.0})
+    assume(repository.get(26) is None)
+    assume(ASSESSMENT_LOOKUPS.value("hot") == hot_before + 1)
+    assume(ASSESSMENT_LOOKUPS.value("cold") == cold_before + 1)
+
+    pages = list(repository.iter_assessments(page_size=4))
+    assume([a.id for page in pages for a in page] == list(range(1, 26)))
+    assume(repository.stats.get(2, "stress_score") is not None)
+
+    repository.close()
+    assume(list(tmp_path.iterdir()) == [])
+
+
+def test_ttl_eviction(tmp_path: Path) -> None:
+    repository = AssessmentRepository(
+        id_allocator=SequentialIdAllocator(),
+        retention=RetentionPolicy(ttl_seconds=3600, spill_dir=str(tmp_path)),
+    )
+    repository.save_many(
+        [
+            make_assessment(1, timestamp=hours_ago(2)),
+            make_assessment(2, timestamp=hours_ago(0)),
+            make_assessment(3, timestamp=hours_ago(24)),
+        ]
+    )
+    assume(sorted(repository.assessments) == [2])
+    assume(repository.count() == 3)
+    expired = repository.get(3)
+    assume(expired is not None and expired.scores == {"stress_score": 3.0})
+    assume([a.id for a in repository.list_after(1, 10)] == [2, 3])
+    repository.close()
+
+
+def test_eviction_without_spill_dir_drops_records() -> None:
+    repository = AssessmentRepository(
+        id_allocator=SequentialIdAllocator(),
+        retention=RetentionPolicy(max_records=5),
+    )
+    for score in range(8):
+        repository.save(make_assessment(score))
+    assume(not repository.blocking)
+    assume(repository.count() == len(repository.assessments) <= 5)
+    assume(repository.get(1) is None)
+
+
+def test_assessments_saved_again_after_eviction_count_once(tmp_path: Path) -> None:
+    repository = AssessmentRepository(
+        id_allocator=SequentialIdAllocator(),
+        retention=RetentionPolicy(max_records=10, spill_dir=str(tmp_path)),
+    )
+    repository.save_many([make_assessment(score) for score in range(20)])
+    assert repository.cold is not None  # nosec B101
+    assume(1 in repository.cold and 11 in repository.cold)
+    assume(12 not in repository.cold and 99 not in repository.cold)
+    resaved = make_assessment(99)
+    resaved.id = 1
+    repository.save(resaved)
+    # Held in memory and spilled at once, then spilled a second time
+    assume(repository.count() == 20)
+    repository.save_many([make_assessment(score) for score in range(20)])
+    assume(repository.count() == 40)
+    fetched = repository.get(1)
+    assume(fetched is not None and fetched.scores == {"stress_score": 99.0})
+    repository.close()
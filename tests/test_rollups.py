@@ -0,0 +1,49 @@
+# tests/test_rollups.py
+
+from datetime import date, datetime, timedelta, timezone
+from pytest_assume.plugin import assume
+from app.models import SurveyType
+from app.rollups import RollupIndex, period_start
+from tests.helpers import make_assessment
+
+
+def test_period_start() -> None:
+    # 2024-01-10 is a Wednesday in ISO week 2
+    timestamp = datetime(2024, 1, 10, 15, tzinfo=timezone.utc)
+    assume(period_start(timestamp, SurveyType.WEEKLY) == date(2024, 1, 8))
+    assume(period_start(timestamp, SurveyType.MONTHLY) == date(2024, 1, 1))
+    # Aware timestamps are bucketed in UTC
+    late_sunday = datetime(2024, 1, 14, 23, tzinfo=timezone(timedelta(hours=-3)))
+    assume(period_start(late_sunday, SurveyType.WEEKLY) == date(2024, 1, 15))
+
+
+def test_rollup_buckets_follow_cadence() -> None:
+    index = RollupIndex({1: SurveyType.WEEKLY, 2: SurveyType.MONTHLY})
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for day in range(60):
+        timestamp = start + timedelta(days=day)
+        index.add(make_assessment(day % 5 + 1, 1, timestamp=timestamp))
+        index.add(make_assessment(day % 5 + 1, 2, timestamp=timestamp))
+
+    weekly = index.buckets(1)
+    assume(len(weekly) == 9)
+    assume(sum(bucket.count for _, bucket in weekly) == 60)
+    assume(weekly[0][1].sums["stress_score"] == 1 + 2 + 3 + 4 + 5 + 1 + 2)
+    assume(weekly[0][1].distributions["stress_score"] == {1: 2, 2: 2, 3: 1, 4: 1, 5: 1})
+
+    monthly = index.buckets(2)
+    assume([day for day, _ in monthly] == [date(2024, 1, 1), date(2024, 2, 1)])
+    assume(monthly[0][1].count == 31)
+
+
+def test_rollup_range_reads_only_buckets_in_range() -> None:
+    index = RollupIndex()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for week in range(52):
+        index.add(make_assessment(3, 1, timestamp=start + timedelta(weeks=week)))
+
+    # A 'from' in the middle of a week includes that week
+    buckets = index.buckets(1, date(2024, 1, 10), date(2024, 1, 31))
+    assume([day for day, _ in buckets] == [date(2024, 1, d) for d in (8, 15, 22, 29)])
+    assume(index.buckets(1, date(2025, 1, 1)) == [])
+    assume(index.buckets(99) == [])
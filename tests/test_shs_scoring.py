@@ -1,9 +1,13 @@
 # tests/test_shs_scoring.py
 
+from typing import Dict, List, Optional
+import numpy as np
 import pytest
 from pytest_assume.plugin import assume
 from app.surveys.shs import SHSSurvey, get_shs_interpretation, SHSConstants
-from app.models import AnswerBase
+from app.models import AnswerBase, QuestionBase
+from app.scoring import ScoringMechanism
+from app.survey_plan import SurveyPlan
 
 
 @pytest.fixture
@@ -51,3 +55,57 @@ def test_shs_survey_interpretation_guide(shs_survey: SHSSurvey) -> None:
         "Interpreting the Subjective Happiness Scale (SHS)"
         in shs_survey.interpretation_guide
     )
+
+
+def test_shs_scoring_with_plan(shs_survey: SHSSurvey) -> None:
+    plan = SurveyPlan.from_questions(shs_survey.questions)
+    assume(plan.required_ids == frozenset({1, 2, 3, 4}))
+    assume(plan.reverse_mask == (False, False, False, True))
+    assume(plan.index[4] == 3)
+    answers = [
+        AnswerBase(question_id=1, score=5),
+        AnswerBase(question_id=2, score=6),
+        AnswerBase(question_id=3, score=4),
+        AnswerBase(question_id=4, score=2),
+    ]
+    scores = shs_survey.scoring_mechanism.calculate_score(
+        answers, shs_survey.questions, plan
+    )
+    assume(scores["happiness_score"] == 5.25)
+
+
+def test_shs_batch_scoring_matches_single(shs_survey: SHSSurvey) -> None:
+    rng = np.random.default_rng(42)
+    matrix = rng.integers(1, 8, size=(200, 4)).astype(float)
+    batch = shs_survey.scoring_mechanism.calculate_scores_batch(
+        matrix, shs_survey.questions
+    )
+    for row, happiness_score in zip(matrix.tolist(), batch["happiness_score"]):
+        answers = [
+            AnswerBase(question_id=question.id, score=score)
+            for question, score in zip(shs_survey.questions, row)
+        ]
+        expected = shs_survey.scoring_mechanism.calculate_score(
+            answers, shs_survey.questions
+        )
+        assume(expected["happiness_score"] == happiness_score)
+
+
+def test_default_batch_scoring_falls_back_to_single() -> None:
+    class SumScoringMechanism(ScoringMechanism):
+        def calculate_score(
+            self,
+            answers: List[AnswerBase],
+            questions: List[QuestionBase],
+            plan: Optional[SurveyPlan] = None,
+        ) -> Dict[str, float]:
+            return {"total": sum(answer.score for answer in answers)}
+
+    questions = SHSSurvey().questions
+    mechanism = SumScoringMechanism()
+    batch = mechanism.calculate_scores_batch(np.array([[1.0, 2, 3, 4]]), questions)
+    assume(batch["total"].tolist() == [10.0])
+    scores = mechanism.calculate_scores(
+        [[AnswerBase(question_id=1, score=2)]], questions
+    )
+    assume(scores == [{"total": 2.0}])
@@ -0,0 +1,189 @@
+# tests/test_sqlite_repository.py
+
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+import pytest
+from pytest_assume.plugin import assume
+from app.models import AssessmentResultBase, SurveyType
+from app.repositories import (
+    AssessmentRepository,
+    SequentialIdAllocator,
+    SnowflakeIdAllocator,
+    SQLiteAssessmentRepository,
+)
+from tests.helpers import make_assessment
+
+
+@pytest.fixture
+def repository(tmp_path: Path) -> Iterator[SQLiteAssessmentRepository]:
+    repo = SQLiteAssessmentRepository(
+        str(tmp_path / "assessments.db"), id_allocator=SequentialIdAllocator()
+    )
+    yield repo
+    repo.close()
+
+
+def test_save_and_get(repository: SQLiteAssessmentRepository) -> None:
+    saved = repository.save(make_assessment())
+    assume(saved.id == 1)
+    fetched = repository.get(saved.id)
+    assume(fetched == saved)
+    assume(repository.get(999) is None)
+
+
+def test_get_many_returns_stored_ids(
+    repository: SQLiteAssessmentRepository,
+) -> None:
+    saved = repository.save_many([make_assessment(score=s) for s in (1, 2, 3)])
+    found = repository.get_many([3, 999, 1])
+    assume(found == {1: saved[0], 3: saved[2]})
+    assume(repository.get_many([]) == {})
+
+
+def test_save_many_is_one_transaction(repository: SQLiteAssessmentRepository) -> None:
+    saved = repository.save_many([make_assessment(score=s) for s in (1, 2, 3)])
+    assume([a.id for a in saved] == [1, 2, 3])
+    assume(repository.count() == 3)
+
+    # A failing row rolls back the rows inserted before it
+    broken = make_assessment()
+    broken.survey_id = None  # type: ignore[assignment]
+    with pytest.raises(sqlite3.IntegrityError):
+        repository.save_many([make_assessment(), broken])
+    assume(repository.count() == 3)
+
+
+def test_data_survives_reopen(tmp_path: Path) -> None:
+    path = str(tmp_path / "assessments.db")
+    first = SQLiteAssessmentRepository(path)
+    saved = first.save(make_assessment())
+    first.close()
+
+    second = SQLiteAssessmentRepository(path)
+    assume(second.get(saved.id) == saved)
+    journal_mode = sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()
+    assume(journal_mode[0] == "wal")
+    second.close()
+
+
+def test_iter_assessments_pages_in_id_order(
+    repository: SQLiteAssessmentRepository,
+) -> None:
+    repository.save_many([make_assessment(score=s) for s in range(1, 8)])
+    pages = list(repository.iter_assessments(after_id=2, page_size=2))
+    assume([[a.id for a in page] for page in pages] == [[3, 4], [5, 6], [7]])
+
+
+def test_processes_lease_distinct_nodes(tmp_path: Path) -> None:
+    path = str(tmp_path / "assessments.db")
+    first = SQLiteAssessmentRepository(path)
+    second = SQLiteAssessmentRepository(path)
+    assert isinstance(first.id_allocator, SnowflakeIdAllocator)  # nosec B101
+    assert isinstance(second.id_allocator, SnowflakeIdAllocator)  # nosec B101
+    assume(first.id_allocator.node_id != second.id_allocator.node_id)
+    # A fixed node already leased refuses to start, and is free once closed
+    taken = first.id_allocator.node_id
+    with pytest.raises(RuntimeError, match="already leased"):
+        SQLiteAssessmentRepository(path, id_allocator=SnowflakeIdAllocator(taken))
+    first.close()
+    allocator = SnowflakeIdAllocator(taken)
+    fixed = SQLiteAssessmentRepository(path, id_allocator=allocator)
+    assume(allocator.node_id == taken)
+    fixed.close()
+    second.close()
+
+
+def test_expired_node_lease_is_leased_again(tmp_path: Path) -> None:
+    path = str(tmp_path / "assessments.db")
+    idle = SQLiteAssessmentRepository(path)
+    assert isinstance(idle.id_allocator, SnowflakeIdAllocator)  # nosec B101
+    node_id = idle.id_allocator.node_id
+    connection = sqlite3.connect(path)
+    connection.execute("UPDATE node_leases SET expires_at = 0")
+    connection.commit()
+    connection.close()
+    # Another process takes the node over once the idle one's lease expired
+    other = SQLiteAssessmentRepository(path)
+    assert isinstance(other.id_allocator, SnowflakeIdAllocator)  # nosec B101
+    assume(other.id_allocator.node_id == node_id)
+
+    idle._renew_at = 0.0
+    saved = idle.save(make_assessment())
+    decoded_node = SnowflakeIdAllocator.decode(saved.id)[1]
+    assume(decoded_node != node_id)
+    assume(idle.id_allocator.node_id == decoded_node)
+    idle.close()
+    other.close()
+
+
+def test_workers_share_aggregates(tmp_path: Path) -> None:
+    path = str(tmp_path / "assessments.db")
+    cadences = {1: SurveyType.MONTHLY}
+    writer = SQLiteAssessmentRepository(path, cadences=cadences)
+    reader = SQLiteAssessmentRepository(path, cadences=cadences)
+    reference = AssessmentRepository(cadences=cadences)
+    assessments = [
+        AssessmentResultBase(
+            id=0,
+            survey_id=1,
+            scores={"happiness_score": float(i % 7), "energy": i / 10},
+            timestamp=datetime(2024, 1 + i % 3, 1 + i % 28, tzinfo=timezone.utc),
+            team_id=("red", "blue", None)[i % 3],
+        )
+        for i in range(60)
+    ]
+    # Saved one by one and in batches, by the writer only
+    writer.save(assessments[0])
+    writer.save_many(assessments[1:])
+    reference.save_many([a.model_copy() for a in assessments])
+
+    for team_id in (None, "red"):
+        shared = reader.aggregates(1, team_id)
+        local = reference.aggregates(1, team_id)
+        assume(shared.stats.count(1) == local.stats.count(1))
+        for key, stats in local.stats.scores(1).items():
+            got = shared.stats.get(1, key)
+            assert got is not None  # nosec B101
+            assume(got.count == stats.count and got.minimum == stats.minimum)
+            assume(got.mean == pytest.approx(stats.mean))
+            assume(got.variance == pytest.approx(stats.variance))
+        shared_buckets = shared.rollups.buckets(1)
+        local_buckets = local.rollups.buckets(1)
+        assume([start for start, _ in shared_buckets] == [s for s, _ in local_buckets])
+        for (_, got_bucket), (_, bucket) in zip(shared_buckets, local_buckets):
+            assume(got_bucket.count == bucket.count)
+            assume(got_bucket.distributions == bucket.distributions)
+            assume(got_bucket.sums == pytest.approx(bucket.sums))
+        # Up to k values the sketches are exact on both sides
+        shared_sketch = shared.stats.sketches(1)["energy"]
+        local_sketch = local.stats.sketches(1)["energy"]
+        assume(
+            shared_sketch.quantiles([0.5, 0.9]) == local_sketch.quantiles([0.5, 0.9])
+        )
+    assume(reader.has_team("blue") and not reader.has_team("green"))
+    assume(reader.team_count() == 2)
+    writer.close()
+    reader.close()
+
+
+def test_aggregates_are_built_once_for_older_databases(tmp_path: Path) -> None:
+    path = str(tmp_path / "assessments.db")
+    repository = SQLiteAssessmentRepository(path)
+    repository.save_many([make_assessment(score=s) for s in (1, 2, 3)])
+    repository.close()
+    connection = sqlite3.connect(path)
+    for table in ("teams", "period_rollups", "score_rollups"):
+        connection.execute(f"DROP TABLE {table}")  # nosec B608
+    connection.commit()
+    connection.close()
+
+    reopened = SQLiteAssessmentRepository(path)
+    stats = reopened.aggregates(2).stats.get(2, "stress_score")
+    assume(stats is not None and stats.count == 3 and stats.mean == 2)
+    reopened.save(make_assessment(score=6))
+    assume(reopened.aggregates(2).stats.count(2) == 4)
+    # Opening an up-to-date database reads none of its rows
+    assume(reopened.stats.count(2) == 0)
+    reopened.close()
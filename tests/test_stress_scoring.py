@@ -1,5 +1,6 @@
 # tests/test_stress_scoring.py
 
+import numpy as np
 import pytest
 from pytest_assume.plugin import assume
 from app.surveys.stress import StressSurvey, get_stress_interpretation, StressConstants
@@ -40,3 +41,15 @@ def test_stress_survey_interpretation_guide(stress_survey: StressSurvey) -> None
         "Interpreting the Single-Item Stress Measure"
         in stress_survey.interpretation_guide
     )
+
+
+def test_stress_batch_scoring(stress_survey: StressSurvey) -> None:
+    matrix = np.array([[1.0], [3.0], [5.0]])
+    batch = stress_survey.scoring_mechanism.calculate_scores_batch(
+        matrix, stress_survey.questions
+    )
+    assume(batch["stress_score"].tolist() == [1.0, 3.0, 5.0])
+    scores = stress_survey.scoring_mechanism.calculate_scores(
+        [[AnswerBase(question_id=5, score=4)]], stress_survey.questions
+    )
+    assume(scores == [{"stress_score": 4.0}])
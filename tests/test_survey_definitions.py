@@ -0,0 +1,285 @@
+# tests/test_survey_definitions.py
+
+import asyncio
+import dataclasses
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+import pytest
+from fastapi.testclient import TestClient
+from pytest_assume.plugin import assume
+import app.main
+from app import survey_definitions
+from app.exceptions import SurveyDefinitionException
+from app.main import app as api
+from app.models import AnswerBase, SurveyBase, SurveyType
+from app.settings import settings
+from app.survey_definitions import (
+    SurveyDefinitionWatcher,
+    load_survey_definitions,
+    reload_surveys,
+)
+from app.survey_registry import SurveyRegistry, builtin_surveys, survey_registry
+from app.surveys.shs import SHSSurvey
+
+# The Subjective Happiness Scale, as a definition instead of a class
+SHS_YAML = """
+id: 100
+name: Declarative Happiness Scale
+survey_type: weekly
+questions:
+  - {id: 1, text: Q1, scale_min: 1, scale_max: 7,
+     scale_min_label: low, scale_max_label: high}
+  - {id: 2, text: Q2, scale_min: 1, scale_max: 7,
+     scale_min_label: low, scale_max_label: high}
+  - {id: 3, text: Q3, scale_min: 1, scale_max: 7,
+     scale_min_label: low, scale_max_label: high}
+  - {id: 4, text: Q4, scale_min: 1, scale_max: 7,
+     scale_min_label: high, scale_max_label: low, reverse_scored: true}
+scores:
+  - key: happiness_score
+interpretation:
+  below: Low
+  bands:
+    - {min: 4, label: Moderate}
+    - {min: 6, label: High}
+"""
+
+
+def definition(
+    survey_id: int = 101, questions: int = 2, survey_type: str = "monthly"
+) -> Dict[str, Any]:
+    return {
+        "id": survey_id,
+        "name": f"Survey {survey_id}",
+        "survey_type": survey_type,
+        "questions": [
+            {
+                "id": i,
+                "text": f"Q{i}",
+                "scale_min": 1,
+                "scale_max": 5,
+                "scale_min_label": "low",
+                "scale_max_label": "high",
+                "weight": i,
+            }
+            for i in range(1, questions + 1)
+        ],
+        "scores": [
+            {"key": "weighted_mean"},
+            {"key": "first_total", "method": "sum", "questions": [1], "round": None},
+        ],
+    }
+
+
+def write_json(directory: Path, name: str, content: Dict[str, Any]) -> None:
+    (directory / name).write_text(json.dumps(content))
+
+
+@pytest.fixture
+def restore_registry() -> Iterator[None]:
+    yield
+    survey_registry.replace(builtin_surveys())
+
+
+def test_yaml_definition_scores_like_the_coded_survey(tmp_path: Path) -> None:
+    (tmp_path / "shs.yaml").write_text(SHS_YAML)
+    [survey] = load_survey_definitions(str(tmp_path))
+    coded = SHSSurvey()
+    answer_sets = [
+        [AnswerBase(question_id=i + 1, score=s) for i, s in enumerate(scores)]
+        for scores in ([7, 6, 5, 2], [1, 2, 3, 7], [4, 4, 4, 4])
+    ]
+    expected = coded.scoring_mechanism.calculate_scores(answer_sets, coded.questions)
+    assume(
+        [
+            survey.scoring_mechanism.calculate_score(a, survey.questions)
+            for a in answer_sets
+        ]
+        == expected
+    )
+    assume(
+        survey.scoring_mechanism.calculate_scores(answer_sets, survey.questions)
+        == expected
+    )
+    assume(survey.get_interpretation(6.5) == "High")
+    assume(survey.get_interpretation(2) == "Low")
+
+
+def test_weights_sums_and_question_subsets(tmp_path: Path) -> None:
+    write_json(tmp_path, "weighted.json", definition())
+    [survey] = load_survey_definitions(str(tmp_path))
+    answers = [
+        AnswerBase(question_id=1, score=2),
+        AnswerBase(question_id=2, score=5),
+    ]
+    scores = survey.scoring_mechanism.calculate_score(answers, survey.questions)
+    # (2 * 1 + 5 * 2) / (1 + 2)
+    assume(scores == {"weighted_mean": 4.0, "first_total": 2.0})
+    batch = survey.scoring_mechanism.calculate_scores([answers], survey.questions)
+    assume(batch == [scores])
+    # Weights are a scoring detail and are not served with the questions
+    assume("weight" not in survey.questions[0].model_dump())
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        ({"scores": [{"key": "s", "questions": [9]}]}, "unknown questions"),
+        ({"survey_type": "daily"}, "survey_type"),
+        ({"questions": []}, "questions"),
+        (
+            {"questions": [{**definition()["questions"][0], "weight": 0}]},
+            "weight",
+        ),
+    ],
+)
+def test_invalid_definitions_name_the_file(
+    tmp_path: Path, change: Dict[str, Any], message: str
+) -> None:
+    write_json(tmp_path, "broken.json", {**definition(), **change})
+    with pytest.raises(SurveyDefinitionException) as raised:
+        load_survey_definitions(str(tmp_path))
+    assume("broken.json" in raised.value.message)
+    assume(message in raised.value.message)
+
+
+def test_failed_reload_keeps_the_registry(tmp_path: Path) -> None:
+    registry = SurveyRegistry()
+    write_json(tmp_path, "a.json", definition(101))
+    before = reload_surveys(str(tmp_path), registry)
+    assume(before.get_survey(101) is not None)
+
+    write_json(tmp_path, "a.json", definition(101, survey_type="weekly"))
+    with pytest.raises(SurveyDefinitionException, match="cannot change its type"):
+        reload_surveys(str(tmp_path), registry)
+    write_json(tmp_path, "a.json", definition(1))
+    with pytest.raises(SurveyDefinitionException, match="built-in"):
+        reload_surveys(str(tmp_path), registry)
+    assume(registry.snapshot() is before)
+
+
+def test_snapshots_are_never_seen_half_built(tmp_path: Path) -> None:
+    registry = SurveyRegistry()
+    versions = [definition(101, questions=2), definition(101, questions=5)]
+    write_json(tmp_path, "a.json", versions[0])
+    reload_surveys(str(tmp_path), registry)
+    held = registry.snapshot()
+    stop = threading.Event()
+    mismatches: List[int] = []
+
+    def read() -> None:
+        while not stop.is_set():
+            snapshot = registry.snapshot()
+            survey = snapshot.get_survey(101)
+            plan = snapshot.get_plan(101)
+            assert survey is not None and plan is not None  # nosec B101
+            if len(plan) != len(survey.questions):
+                mismatches.append(len(plan))
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for round_number in range(50):
+        write_json(tmp_path, "a.json", versions[round_number % 2])
+        reload_surveys(str(tmp_path), registry)
+    stop.set()
+    for reader in readers:
+        reader.join()
+    assume(mismatches == [])
+    # A snapshot taken earlier is unaffected by the reloads
+    held_survey = held.get_survey(101)
+    assume(held_survey is not None and len(held_survey.questions) == 2)
+
+
+def test_concurrent_reloads_run_one_at_a_time(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    registry = SurveyRegistry()
+    write_json(tmp_path, "a.json", definition(101))
+    load = survey_definitions.load_survey_definitions
+    running: List[int] = []
+    overlaps: List[int] = []
+
+    def slow_load(directory: str) -> List[SurveyBase]:
+        running.append(1)
+        overlaps.append(len(running))
+        time.sleep(0.02)
+        running.pop()
+        return load(directory)
+
+    monkeypatch.setattr(survey_definitions, "load_survey_definitions", slow_load)
+    reloads = [
+        threading.Thread(target=reload_surveys, args=(str(tmp_path), registry))
+        for _ in range(4)
+    ]
+    for reload in reloads:
+        reload.start()
+    for reload in reloads:
+        reload.join()
+    assume(overlaps == [1, 1, 1, 1])
+    assume(registry.get_survey(101) is not None)
+
+
+def test_watcher_reloads_on_change(tmp_path: Path) -> None:
+    registry = SurveyRegistry()
+    watcher = SurveyDefinitionWatcher(
+        str(tmp_path), 60, lambda: reload_surveys(str(tmp_path), registry)
+    )
+    assume(asyncio.run(watcher.poll()) is False)
+    write_json(tmp_path, "a.json", definition(101))
+    assume(asyncio.run(watcher.poll()) is True)
+    assume(registry.get_survey(101) is not None)
+    # A broken file is reported and the registry kept
+    (tmp_path / "b.yaml").write_text("id: [")
+    assume(asyncio.run(watcher.poll()) is False)
+    assume(registry.get_survey(101) is not None)
+
+
+def test_admin_reload_endpoint(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, restore_registry: None
+) -> None:
+    client = TestClient(api)
+    assume(client.post("/admin/surveys:reload").status_code == 403)
+
+    monkeypatch.setattr(
+        app.main,
+        "settings",
+        dataclasses.replace(
+            settings, admin_token="secret", survey_definitions_dir=str(tmp_path)
+        ),
+    )
+    headers = {"X-Admin-Token": "secret"}
+    assume(
+        client.post(
+            "/admin/surveys:reload", headers={"X-Admin-Token": "wrong"}
+        ).status_code
+        == 403
+    )
+
+    write_json(tmp_path, "a.json", definition(101))
+    response = client.post("/admin/surveys:reload", headers=headers)
+    assume(response.status_code == 200)
+    assume(101 in {survey["id"] for survey in response.json()})
+    assume(app.main.assessment_repository.rollups.cadence(101) == SurveyType.MONTHLY)
+
+    submitted = client.post(
+        "/v1/surveys/101/responses",
+        json={
+            "survey_id": 101,
+            "answers": [
+                {"question_id": 1, "score": 2},
+                {"question_id": 2, "score": 5},
+            ],
+            "timestamp": "2024-01-01T12:00:00Z",
+        },
+    )
+    assume(submitted.status_code == 200)
+    assume(submitted.json()["scores"] == {"weighted_mean": 4.0, "first_total": 2.0})
+
+    write_json(tmp_path, "a.json", {**definition(101), "scores": []})
+    failed = client.post("/admin/surveys:reload", headers=headers)
+    assume(failed.status_code == 422)
+    assume(client.get("/v1/surveys/101").status_code == 200)
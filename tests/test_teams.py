@@ -0,0 +1,216 @@
+# tests/test_teams.py
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, List, Tuple
+import pytest
+from fastapi.testclient import TestClient
+from pytest_assume.plugin import assume
+from app.main import app
+from app.repositories import (
+    Aggregates,
+    AssessmentRepository,
+    AssessmentRepositoryBase,
+    ColumnarAssessmentRepository,
+    RetentionPolicy,
+    SequentialIdAllocator,
+    SQLiteAssessmentRepository,
+)
+from tests.helpers import make_assessment
+
+START = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+
+client = TestClient(app)
+
+
+def in_memory(tmp_path: Path) -> AssessmentRepositoryBase:
+    return AssessmentRepository(id_allocator=SequentialIdAllocator())
+
+
+def columnar(tmp_path: Path) -> AssessmentRepositoryBase:
+    return ColumnarAssessmentRepository(id_allocator=SequentialIdAllocator())
+
+
+def sqlite(tmp_path: Path) -> AssessmentRepositoryBase:
+    return SQLiteAssessmentRepository(
+        str(tmp_path / "assessments.db"), id_allocator=SequentialIdAllocator()
+    )
+
+
+@pytest.mark.parametrize("factory", [in_memory, columnar, sqlite])
+def test_team_partitions(
+    tmp_path: Path, factory: Callable[[Path], AssessmentRepositoryBase]
+) -> None:
+    repository = factory(tmp_path)
+    teams = ["red", "blue", None]
+    repository.save_many(
+        [
+            make_assessment(
+                i % 5 + 1, team_id=teams[i % 3], timestamp=START + timedelta(days=i)
+            )
+            for i in range(30)
+        ]
+    )
+    red = repository.list_team_after("red", 0, 4)
+    assume([a.id for a in red] == [1, 4, 7, 10])
+    assume(all(a.team_id == "red" for a in red))
+    rest = repository.list_team_after("red", red[-1].id, 100)
+    assume(len(rest) == 6)
+    assume(repository.list_team_after("green", 0, 10) == [])
+    # Stored teams round-trip, and unassigned assessments have none
+    fetched = repository.get(3)
+    assume(fetched is not None and fetched.team_id is None)
+
+    stats = repository.aggregates(2, "blue").stats.get(2, "stress_score")
+    assert stats is not None  # nosec B101
+    blue = [i % 5 + 1 for i in range(30) if i % 3 == 1]
+    assume(stats.count == len(blue))
+    assume(stats.mean == pytest.approx(sum(blue) / len(blue)))
+    assume(repository.has_team("blue") and not repository.has_team("green"))
+    assume(repository.aggregates(2, "green").stats.count(2) == 0)
+    assume(repository.team_count() == 2)
+    assume(repository.aggregates(2).stats.count(2) == 30)
+    repository.close()
+
+
+def summarize(aggregates: Aggregates) -> Tuple[object, ...]:
+    stats = aggregates.stats.get(2, "stress_score")
+    assert stats is not None  # nosec B101
+    sketch = aggregates.stats.sketches(2)["stress_score"]
+    trend = [(day, b.count, b.means()) for day, b in aggregates.rollups.buckets(2)]
+    return (
+        aggregates.stats.count(2),
+        stats.count,
+        pytest.approx(stats.mean),
+        sketch.quantiles([0.5, 0.9]),
+        trend,
+    )
+
+
+@pytest.mark.parametrize("factory", [in_memory, columnar])
+def test_saving_an_id_again_counts_it_once(
+    tmp_path: Path, factory: Callable[[Path], AssessmentRepositoryBase]
+) -> None:
+    repository = factory(tmp_path)
+    saved = repository.save_many(
+        [
+            make_assessment(
+                i % 5 + 1, team_id="red", timestamp=START + timedelta(days=i)
+            )
+            for i in range(20)
+        ]
+    )
+    # Saved again: in order, and out of order (a late ID)
+    repository.save_many([a.model_copy() for a in saved[:5]])
+    late = make_assessment(4.0, team_id="red", timestamp=START, assessment_id=100)
+    repository.save(late)
+    repository.save(late.model_copy())
+    repository.save(make_assessment(3.0, team_id="red", assessment_id=50))
+    repository.save(make_assessment(3.0, team_id="red", assessment_id=50))
+
+    recomputed = factory(tmp_path)
+    recomputed.save_many(
+        [a.model_copy() for page in repository.iter_assessments() for a in page]
+    )
+    assume(repository.count() == 22)
+    assume(summarize(repository.aggregates(2)) == summarize(recomputed.aggregates(2)))
+    assume(
+        summarize(repository.aggregates(2, "red"))
+        == summarize(recomputed.aggregates(2, "red"))
+    )
+    assume(len(repository.list_team_after("red", 0, 100)) == 22)
+
+
+def test_late_ids_and_evictions_keep_team_pages_in_order() -> None:
+    repository = AssessmentRepository(
+        id_allocator=SequentialIdAllocator(),
+        retention=RetentionPolicy(max_records=10),
+    )
+    late = make_assessment(3, team_id="red")
+    late.id = 5
+    repository.save_many([make_assessment(1, team_id="red") for _ in range(3)])
+    repository.save_many([make_assessment(2, team_id="red") for _ in range(20)])
+    repository.save(late)
+    page = repository.list_team_after("red", 0, 5)
+    ids: List[int] = [a.id for a in page]
+    # Evicted assessments are skipped without shortening the page
+    assume(len(page) == 5)
+    assume(ids == sorted(ids))
+    partition = repository.teams.get("red")
+    assume(partition is not None and list(partition.ids) == sorted(set(partition.ids)))
+
+
+def test_sqlite_adds_the_team_column_to_old_databases(tmp_path: Path) -> None:
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.execute(
+        "CREATE TABLE assessments (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "survey_id INTEGER NOT NULL, timestamp TEXT NOT NULL, scores TEXT NOT NULL)"
+    )
+    connection.execute(
+        "INSERT INTO assessments VALUES "
+        "(1, 2, '2024-01-01T09:00:00+00:00', '{\"stress_score\": 3}')"
+    )
+    connection.commit()
+    connection.close()
+
+    repository = SQLiteAssessmentRepository(path, id_allocator=SequentialIdAllocator())
+    old = repository.get(1)
+    assume(old is not None and old.team_id is None)
+    new = make_assessment(4, team_id="red")
+    new.id = 2
+    repository.save(new)
+    assume([a.id for a in repository.list_team_after("red", 0, 10)] == [2])
+    repository.close()
+
+
+def test_team_routes() -> None:
+    for day, score in ((0, 1), (1, 2), (8, 5)):
+        response = client.post(
+            "/v1/surveys/2/responses",
+            json={
+                "survey_id": 2,
+                "answers": [{"question_id": 5, "score": score}],
+                "timestamp": (START + timedelta(days=day)).isoformat(),
+                "team_id": "team-routes",
+            },
+        )
+        assume(response.status_code == 200)
+        assume(response.json()["team_id"] == "team-routes")
+
+    listed = client.get("/v1/teams/team-routes/assessments?limit=2")
+    assume(listed.status_code == 200)
+    first_page = listed.json()
+    assume([a["scores"]["stress_score"] for a in first_page] == [1.0, 2.0])
+    next_page = client.get(
+        f"/v1/teams/team-routes/assessments?since_id={first_page[-1]['id']}"
+    ).json()
+    assume([a["scores"]["stress_score"] for a in next_page] == [5.0])
+
+    stats = client.get("/v1/teams/team-routes/surveys/2/stats").json()
+    assume(stats["count"] == 3)
+    assume(stats["scores"]["stress_score"]["mean"] == pytest.approx(8 / 3))
+    trend = client.get("/v1/teams/team-routes/surveys/2/trend").json()
+    assume([b["count"] for b in trend["buckets"]] == [2, 1])
+    percentiles = client.get("/v1/teams/team-routes/surveys/2/percentiles?q=0.5").json()
+    assume(percentiles["scores"]["stress_score"]["percentiles"] == {"p50": 2.0})
+
+
+def test_team_route_errors() -> None:
+    assume(client.get("/v1/teams/nobody/surveys/2/stats").status_code == 404)
+    assume(client.get("/v1/teams/nobody/surveys/2/trend").status_code == 404)
+    assume(client.get("/v1/teams/nobody/surveys/999/percentiles").status_code == 404)
+    unknown = client.get("/v1/teams/nobody/assessments")
+    assume(unknown.status_code == 404)
+    assume(unknown.json()["detail"] == "Team not found")
+    response = client.post(
+        "/v1/surveys/2/responses",
+        json={
+            "survey_id": 2,
+            "answers": [{"question_id": 5, "score": 3}],
+            "timestamp": START.isoformat(),
+            "team_id": "no spaces/or slashes",
+        },
+    )
+    assume(response.status_code == 422)
@@ -0,0 +1,299 @@
+# tests/test_write_behind.py
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+from typing import List
+import pytest
+from fastapi.testclient import TestClient
+from pytest_assume.plugin import assume
+import app.main
+from app.exceptions import WriteQueueFullException
+from app.main import app as api, assessment_repository
+from app.models import AssessmentResultBase
+from app.repositories import AssessmentRepository, SequentialIdAllocator
+from app.write_behind import (
+    WRITE_BEHIND_FAILURES,
+    WRITE_BEHIND_RETRIES,
+    WriteBehindQueue,
+)
+from tests.helpers import make_assessment
+
+
+def make_repository() -> AssessmentRepository:
+    return AssessmentRepository(id_allocator=SequentialIdAllocator())
+
+
+class GatedRepository(AssessmentRepository):
+    """Repository whose saves wait until the gate opens."""
+
+    blocking = True
+
+    def __init__(self) -> None:
+        super().__init__(id_allocator=SequentialIdAllocator())
+        self.gate = threading.Event()
+
+    def save_many(
+        self, assessments: List[AssessmentResultBase]
+    ) -> List[AssessmentResultBase]:
+        self.gate.wait(5)
+        return super().save_many(assessments)
+
+
+class FailingRepository(AssessmentRepository):
+    """Repository failing the first failures saves it is asked for."""
+
+    def __init__(self, failures: int = 1) -> None:
+        super().__init__(id_allocator=SequentialIdAllocator())
+        self.failures = failures
+
+    def save_many(
+        self, assessments: List[AssessmentResultBase]
+    ) -> List[AssessmentResultBase]:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("disk full")
+        return super().save_many(assessments)
+
+
+def test_blocking_repositories_assign_ids_off_the_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repository = GatedRepository()
+    repository.gate.set()
+    threads: List[threading.Thread] = []
+    assign_ids = repository.assign_ids
+
+    def record_thread(assessments: List[AssessmentResultBase]) -> None:
+        threads.append(threading.current_thread())
+        assign_ids(assessments)
+
+    monkeypatch.setattr(repository, "assign_ids", record_thread)
+
+    async def scenario() -> None:
+        queue = WriteBehindQueue(repository, flush_interval=0.01)
+        queue.start()
+        queued = await queue.enqueue(make_assessment())
+        await queue.stop()
+        assume(queued.id == 1)
+
+    asyncio.run(scenario())
+    assume(threads != [] and threading.main_thread() not in threads)
+    assume(repository.get(1) is not None)
+
+
+def test_full_batches_are_saved_without_waiting_for_the_interval() -> None:
+    repository = make_repository()
+
+    async def scenario() -> None:
+        queue = WriteBehindQueue(repository, batch_size=10, flush_interval=60)
+        queue.start()
+        queued = [await queue.enqueue(make_assessment()) for _ in range(25)]
+        for _ in range(100):
+            if repository.count() >= 20:
+                break
+            await asyncio.sleep(0.01)
+        # Two full batches are saved; the remaining five wait for the interval
+        assume(repository.count() == 20)
+        assume(queue.depth() == 5)
+        await queue.stop()
+        assume(repository.count() == 25)
+        assume([a.id for a in queued] == list(range(1, 26)))
+
+    asyncio.run(scenario())
+    assume(repository.get(25) is not None)
+
+
+def test_partial_batch_is_saved_after_the_flush_interval() -> None:
+    repository = make_repository()
+
+    async def scenario() -> None:
+        queue = WriteBehindQueue(repository, batch_size=100, flush_interval=0.01)
+        queue.start()
+        assessment = await queue.enqueue(make_assessment())
+        assume(repository.get(assessment.id) is None)
+        await asyncio.sleep(0.2)
+        assume(repository.get(assessment.id) is not None)
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+
+def test_reject_mode_fails_at_once_when_full() -> None:
+    repository = make_repository()
+
+    async def scenario() -> None:
+        queue = WriteBehindQueue(repository, max_size=2, backpressure="reject")
+        queue.start()
+        # Enqueueing without room to spare never yields, so nothing drains
+        await queue.enqueue(make_assessment())
+        await queue.enqueue(make_assessment())
+        with pytest.raises(WriteQueueFullException):
+            await queue.enqueue(make_assessment())
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assume(repository.count() == 2)
+
+
+def test_block_mode_waits_for_room_then_times_out() -> None:
+    repository = GatedRepository()
+
+    async def scenario() -> None:
+        queue = WriteBehindQueue(
+            repository, max_size=1, batch_size=1, block_timeout=0.05
+        )
+        queue.start()
+        await queue.enqueue(make_assessment())
+        # Waits until the flusher takes the first assessment off the queue
+        await queue.enqueue(make_assessment())
+        # The flusher is stuck saving, so the queue stays full
+        with pytest.raises(WriteQueueFullException):
+            await queue.enqueue(make_assessment())
+        repository.gate.set()
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assume(repository.count() == 2)
+
+
+def test_batch_failing_once_is_saved_on_retry() -> None:
+    repository = FailingRepository(failures=1)
+    retries = WRITE_BEHIND_RETRIES.value()
+    failures = WRITE_BEHIND_FAILURES.value()
+
+    async def scenario() -> None:
+        queue = WriteBehindQueue(
+            repository, batch_size=1, flush_interval=0, retry_delay=0.001
+        )
+        queue.start()
+        await queue.enqueue(make_assessment())
+        await queue.enqueue(make_assessment())
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assume(repository.count() == 2)
+    assume(WRITE_BEHIND_RETRIES.value() == retries + 1)
+    assume(WRITE_BEHIND_FAILURES.value() == failures)
+
+
+def test_batch_that_keeps_failing_is_spilled_and_saved_later(
+    tmp_path: Path,
+) -> None:
+    spill_path = str(tmp_path / "spill.jsonl")
+    # Every attempt at the first batch fails, then the repository recovers
+    repository = FailingRepository(failures=3)
+
+    async def scenario() -> None:
+        queue = WriteBehindQueue(
+            repository,
+            batch_size=1,
+            flush_interval=0,
+            max_retries=2,
+            retry_delay=0.001,
+            spill_path=spill_path,
+        )
+        queue.start()
+        spilled = await queue.enqueue(make_assessment())
+        for _ in range(100):
+            if os.path.exists(spill_path):
+                break
+            await asyncio.sleep(0.01)
+        assume(os.path.exists(spill_path))
+        assume(repository.get(spilled.id) is None)
+        # The next successful flush saves the spilled batch too
+        await queue.enqueue(make_assessment())
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assume(repository.count() == 2)
+    assume(not os.path.exists(spill_path))
+
+
+def test_spilled_assessments_are_saved_once_on_start(tmp_path: Path) -> None:
+    spill_path = tmp_path / "spill.jsonl"
+    repository = make_repository()
+    stored, spilled = make_assessment(), make_assessment()
+    repository.save_many([stored, spilled])
+    pending = make_assessment()
+    pending.id = 3
+    # The last replay saved the first two before stopping
+    spill_path.write_text(
+        "".join(a.model_dump_json() + "\n" for a in (stored, spilled, pending))
+    )
+
+    async def scenario() -> None:
+        queue = WriteBehindQueue(repository, spill_path=str(spill_path))
+        queue.start()
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assume(repository.count() == 3)
+    assume(repository.get(3) == pending)
+    assume(not spill_path.exists())
+
+
+def test_failed_batch_without_spill_file_is_counted_and_does_not_stall() -> None:
+    repository = FailingRepository(failures=2)
+    failures = WRITE_BEHIND_FAILURES.value()
+
+    async def scenario() -> None:
+        queue = WriteBehindQueue(
+            repository, batch_size=1, flush_interval=0, max_retries=1, retry_delay=0
+        )
+        queue.start()
+        await queue.enqueue(make_assessment())
+        await asyncio.sleep(0.05)
+        await queue.enqueue(make_assessment())
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assume(WRITE_BEHIND_FAILURES.value() == failures + 1)
+    assume(repository.count() == 1)
+
+
+def test_submission_is_queued_and_saved_on_shutdown(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    queue = WriteBehindQueue(assessment_repository, flush_interval=60)
+    monkeypatch.setattr(app.main, "write_behind", queue)
+    # Keep logging running for the tests that follow
+    monkeypatch.setattr(app.main, "stop_logging", lambda: None)
+    submission = {
+        "survey_id": 2,
+        "answers": [{"question_id": 5, "score": 3}],
+        "timestamp": "2024-01-01T12:00:00Z",
+    }
+    with TestClient(api) as client:
+        response = client.post("/v1/surveys/2/responses", json=submission)
+        assessment_id = response.json()["id"]
+        assume(response.status_code == 200)
+        assume(assessment_id > 0)
+        assume(assessment_repository.get(assessment_id) is None)
+        metrics = client.get("/metrics").text
+        assume("write_behind_queue_depth 1" in metrics)
+    saved = assessment_repository.get(assessment_id)
+    assume(saved is not None and saved.scores == response.json()["scores"])
+
+
+def test_full_queue_answers_503_with_retry_after(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    queue = WriteBehindQueue(assessment_repository, max_size=1, backpressure="reject")
+    monkeypatch.setattr(app.main, "write_behind", queue)
+    monkeypatch.setattr(app.main, "stop_logging", lambda: None)
+
+    async def full(assessment: AssessmentResultBase) -> AssessmentResultBase:
+        raise WriteQueueFullException("Write queue is full.")
+
+    monkeypatch.setattr(queue, "enqueue", full)
+    submission = {
+        "survey_id": 2,
+        "answers": [{"question_id": 5, "score": 3}],
+        "timestamp": "2024-01-01T12:00:00Z",
+    }
+    with TestClient(api) as client:
+        response = client.post("/v1/surveys/2/responses", json=submission)
+    assume(response.status_code == 503)
+    assume(response.headers["Retry-After"] == "1")